@@ -0,0 +1,348 @@
+import argparse
+import csv
+import heapq
+import json
+import math
+import multiprocessing
+import random
+import statistics
+import time
+import tracemalloc
+
+from FUERZA_BRUTA import tsp_fuerza_bruta, tsp_fuerza_bruta_incremental
+from HELD_KARP import np, tsp_held_karp, tsp_held_karp_vectorizado
+from HEURISTICAS import tsp_heuristico
+from MEMOIZACION import tsp_top_down_memo, tsp_top_down_memo_podado
+from RAMIFICACION_Y_PODA import tsp_ramificacion_y_poda
+from RECURSION import tsp_recursivo_sin_memo
+
+# Lado del cuadrado (km) donde se ubican las ciudades generadas
+LADO_KM = 2000
+
+
+# ==========================
+# GENERADORES DE INSTANCIAS (REPRODUCIBLES CON 'semilla')
+# ==========================
+
+def _matriz_euclidiana(puntos):
+    n = len(puntos)
+    return [[round(math.dist(puntos[a], puntos[b])) for b in range(n)] for a in range(n)]
+
+
+def instancia_euclidiana(n, semilla=0):
+    """
+    n ciudades uniformes en un cuadrado de LADO_KM x LADO_KM; distancia en línea recta.
+    """
+    rng = random.Random(semilla)
+    puntos = [(rng.uniform(0, LADO_KM), rng.uniform(0, LADO_KM)) for _ in range(n)]
+    return _matriz_euclidiana(puntos)
+
+
+def instancia_agrupada(n, semilla=0, num_grupos=None):
+    """
+    Ciudades concentradas alrededor de unos pocos centros (como zonas urbanas).
+    """
+    rng = random.Random(semilla)
+    if num_grupos is None:
+        num_grupos = max(1, round(math.sqrt(n) / 2))
+    centros = [(rng.uniform(0, LADO_KM), rng.uniform(0, LADO_KM)) for _ in range(num_grupos)]
+    radio = LADO_KM / (4 * num_grupos)
+    puntos = []
+    for _ in range(n):
+        cx, cy = rng.choice(centros)
+        puntos.append((rng.gauss(cx, radio), rng.gauss(cy, radio)))
+    return _matriz_euclidiana(puntos)
+
+
+def instancia_asimetrica(n, semilla=0):
+    """
+    Distancias euclidianas con un recargo distinto en cada sentido (calles de
+    un solo sentido, subidas y bajadas): d[a][b] != d[b][a].
+    """
+    rng = random.Random(semilla)
+    base = instancia_euclidiana(n, semilla)
+    return [
+        [0 if a == b else round(base[a][b] * rng.uniform(1.0, 1.4)) for b in range(n)]
+        for a in range(n)
+    ]
+
+
+def instancia_vial(n, semilla=0, vecinos_por_ciudad=5):
+    """
+    Parecida a una red de carreteras: cada ciudad solo tiene tramos directos
+    a sus ciudades más cercanas (con un factor de desvío por curvas), y la
+    distancia entre dos ciudades es el camino más corto por esa red.
+    """
+    rng = random.Random(semilla)
+    puntos = [(rng.uniform(0, LADO_KM), rng.uniform(0, LADO_KM)) for _ in range(n)]
+    recta = [[math.dist(puntos[a], puntos[b]) for b in range(n)] for a in range(n)]
+
+    # Tramos directos: k vecinos más cercanos + un camino que une a todas
+    # (para que la red quede conectada)
+    tramos = [dict() for _ in range(n)]
+
+    def agregar_tramo(a, b):
+        if a != b and b not in tramos[a]:
+            largo = recta[a][b] * rng.uniform(1.1, 1.5)
+            tramos[a][b] = largo
+            tramos[b][a] = largo
+
+    for a in range(n):
+        for b in sorted(range(n), key=recta[a].__getitem__)[1:vecinos_por_ciudad + 1]:
+            agregar_tramo(a, b)
+    for a in range(n - 1):
+        agregar_tramo(a, a + 1)
+
+    # Dijkstra desde cada ciudad
+    matriz = []
+    for origen in range(n):
+        dist = [math.inf] * n
+        dist[origen] = 0.0
+        cola = [(0.0, origen)]
+        while cola:
+            d, a = heapq.heappop(cola)
+            if d > dist[a]:
+                continue
+            for b, largo in tramos[a].items():
+                if d + largo < dist[b]:
+                    dist[b] = d + largo
+                    heapq.heappush(cola, (d + largo, b))
+        matriz.append([round(x) for x in dist])
+    return matriz
+
+
+GENERADORES = {
+    "euclidiana": instancia_euclidiana,
+    "agrupada": instancia_agrupada,
+    "asimetrica": instancia_asimetrica,
+    "vial": instancia_vial,
+}
+
+
+# ==========================
+# MÉTODOS A COMPARAR
+# ==========================
+
+METODOS = {
+    "fuerza_bruta": tsp_fuerza_bruta,
+    "fuerza_bruta_incremental": tsp_fuerza_bruta_incremental,
+    "recursivo_sin_memo": tsp_recursivo_sin_memo,
+    "top_down_memo": tsp_top_down_memo,
+    "top_down_memo_podado": tsp_top_down_memo_podado,
+    "held_karp": tsp_held_karp,
+    "ramificacion_y_poda": tsp_ramificacion_y_poda,
+    "heuristico": tsp_heuristico,
+}
+if np is not None:
+    METODOS["held_karp_vectorizado"] = tsp_held_karp_vectorizado
+
+
+# ==========================
+# MEDICIÓN
+# ==========================
+
+def _medir(metodo, generador, n, semilla, repeticiones, calentamiento):
+    """
+    Corre dentro de un proceso hijo: genera la instancia, hace las corridas
+    de calentamiento, mide 'repeticiones' corridas con time.perf_counter y
+    una corrida extra con tracemalloc para el pico de memoria (tracemalloc
+    frena la ejecución, por eso no se mezcla con las mediciones de tiempo).
+    """
+    solver = METODOS[metodo]
+    distancias = GENERADORES[generador](n, semilla)
+
+    for _ in range(calentamiento):
+        solver(distancias)
+
+    tiempos = []
+    costo = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = solver(distancias)
+        tiempos.append(time.perf_counter() - inicio)
+        costo = resultado[2]
+
+    tracemalloc.start()
+    try:
+        solver(distancias)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"tiempos": tiempos, "costo": costo, "memoria_pico_kb": pico / 1024}
+
+
+def _medir_en_hijo(conexion, *argumentos):
+    try:
+        conexion.send(("ok", _medir(*argumentos)))
+    except Exception as error:
+        conexion.send(("error", repr(error)))
+    finally:
+        conexion.close()
+
+
+def _percentil(valores, p):
+    """
+    Percentil p (0-100) con interpolación lineal.
+    """
+    ordenados = sorted(valores)
+    if len(ordenados) == 1:
+        return ordenados[0]
+    posicion = (len(ordenados) - 1) * p / 100
+    abajo = math.floor(posicion)
+    arriba = min(abajo + 1, len(ordenados) - 1)
+    return ordenados[abajo] + (ordenados[arriba] - ordenados[abajo]) * (posicion - abajo)
+
+
+def medir_celda(metodo, generador, n, semilla=0, repeticiones=5, calentamiento=1, presupuesto_s=10.0):
+    """
+    Mide un método en una instancia, en un proceso aparte. Si no termina en
+    presupuesto_s segundos se detiene el proceso y el estado queda como
+    "tiempo_excedido" (así la suite nunca se cuelga en, por ejemplo,
+    fuerza bruta con n = 14).
+    """
+    fila = {"metodo": metodo, "generador": generador, "n": n, "semilla": semilla}
+
+    receptor, emisor = multiprocessing.Pipe(duplex=False)
+    hijo = multiprocessing.Process(
+        target=_medir_en_hijo,
+        args=(emisor, metodo, generador, n, semilla, repeticiones, calentamiento),
+        daemon=True,
+    )
+    hijo.start()
+    emisor.close()
+
+    if receptor.poll(presupuesto_s):
+        try:
+            estado, datos = receptor.recv()
+        except EOFError:
+            estado, datos = "error", "el proceso terminó sin responder"
+    else:
+        estado, datos = "tiempo_excedido", None
+        hijo.terminate()
+    hijo.join()
+    receptor.close()
+
+    fila["estado"] = estado
+    if estado == "ok":
+        tiempos = datos["tiempos"]
+        fila.update({
+            "repeticiones": len(tiempos),
+            "mediana_s": statistics.median(tiempos),
+            "p10_s": _percentil(tiempos, 10),
+            "p90_s": _percentil(tiempos, 90),
+            "min_s": min(tiempos),
+            "max_s": max(tiempos),
+            "memoria_pico_kb": datos["memoria_pico_kb"],
+            "costo": datos["costo"],
+        })
+    elif estado == "error":
+        fila["error"] = datos
+    return fila
+
+
+def ejecutar_suite(metodos=None, generadores=None, tamanos=range(4, 15), repeticiones=5,
+                   calentamiento=1, presupuesto_s=10.0, semilla=0, al_medir=None):
+    """
+    Recorre métodos x generadores x tamaños. Cuando un método se pasa del
+    presupuesto en un tamaño, ya no se prueba con tamaños mayores de ese
+    generador. 'al_medir' (opcional) se llama con cada fila apenas se mide.
+    Devuelve la lista de filas (diccionarios).
+    """
+    metodos = list(metodos or METODOS)
+    generadores = list(generadores or GENERADORES)
+    resultados = []
+
+    for generador in generadores:
+        for metodo in metodos:
+            for n in tamanos:
+                fila = medir_celda(metodo, generador, n, semilla + n, repeticiones,
+                                   calentamiento, presupuesto_s)
+                resultados.append(fila)
+                if al_medir is not None:
+                    al_medir(fila)
+                if fila["estado"] != "ok":
+                    break
+
+    return resultados
+
+
+# ==========================
+# SALIDA
+# ==========================
+
+COLUMNAS = [
+    "metodo", "generador", "n", "semilla", "estado", "repeticiones",
+    "mediana_s", "p10_s", "p90_s", "min_s", "max_s", "memoria_pico_kb", "costo", "error",
+]
+
+
+def guardar_json(resultados, ruta_archivo):
+    with open(ruta_archivo, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+def guardar_csv(resultados, ruta_archivo):
+    with open(ruta_archivo, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS)
+        escritor.writeheader()
+        for fila in resultados:
+            escritor.writerow(fila)
+
+
+def imprimir_fila(fila):
+    if fila["estado"] == "ok":
+        detalle = (f"mediana {fila['mediana_s']:10.6f} s  p90 {fila['p90_s']:10.6f} s  "
+                   f"memoria {fila['memoria_pico_kb']:10.1f} KB  costo {fila['costo']}")
+    else:
+        detalle = fila["estado"] + (f" ({fila['error']})" if "error" in fila else "")
+    print(f"{fila['generador']:11s} {fila['metodo']:25s} n={fila['n']:3d}  {detalle}")
+
+
+def _leer_tamanos(texto):
+    """
+    "4:14" -> range(4, 15); "5,10,20" -> [5, 10, 20]
+    """
+    if ":" in texto:
+        desde, hasta = texto.split(":")
+        return range(int(desde), int(hasta) + 1)
+    return [int(t) for t in texto.split(",")]
+
+
+def principal(argumentos=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de los solvers TSP")
+    parser.add_argument("--metodos", default=",".join(METODOS),
+                        help="métodos separados por coma (por defecto todos)")
+    parser.add_argument("--generadores", default=",".join(GENERADORES),
+                        help="generadores separados por coma (por defecto todos)")
+    parser.add_argument("--tamanos", default="4:14", help='rango "desde:hasta" o lista "5,10,20"')
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--calentamiento", type=int, default=1)
+    parser.add_argument("--presupuesto", type=float, default=10.0,
+                        help="segundos máximos por método y tamaño")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="archivo donde guardar los resultados en JSON")
+    parser.add_argument("--csv", help="archivo donde guardar los resultados en CSV")
+    args = parser.parse_args(argumentos)
+
+    print("===== SUITE DE BENCHMARKS TSP =====")
+    resultados = ejecutar_suite(
+        metodos=args.metodos.split(","),
+        generadores=args.generadores.split(","),
+        tamanos=_leer_tamanos(args.tamanos),
+        repeticiones=args.repeticiones,
+        calentamiento=args.calentamiento,
+        presupuesto_s=args.presupuesto,
+        semilla=args.semilla,
+        al_medir=imprimir_fila,
+    )
+
+    if args.json:
+        guardar_json(resultados, args.json)
+    if args.csv:
+        guardar_csv(resultados, args.csv)
+    return resultados
+
+
+if __name__ == "__main__":
+    principal()
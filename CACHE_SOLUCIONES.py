@@ -0,0 +1,285 @@
+import functools
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+
+import INSTRUMENTACION
+from MATRIZ import ejemplo_peru
+from VECINOS import huella_matriz
+
+
+# ==========================
+# CLAVE DE LA INSTANCIA (INVARIANTE AL REETIQUETADO)
+# ==========================
+
+def _a_rangos(firmas):
+    """
+    Reemplaza cada firma por su posición entre las firmas distintas ordenadas.
+    Como solo depende de los valores, no del número de cada ciudad, dos
+    instancias iguales salvo el orden de las ciudades dan los mismos rangos.
+    """
+    distintas = {f: i for i, f in enumerate(sorted(set(firmas)))}
+    return [distintas[f] for f in firmas]
+
+
+def etiquetado_canonico(distancias, ciudad_inicio):
+    """
+    Busca un orden de las ciudades que no dependa de cómo se numeraron:
+    refinamiento de colores (cada ciudad se distingue por sus distancias y
+    por los colores de las ciudades a esas distancias) hasta que no cambie.
+    Devuelve la lista 'orden' (orden[i] = ciudad original en la posición
+    canónica i), o None si quedan ciudades indistinguibles (instancias muy
+    simétricas); en ese caso solo se reconoce la instancia con su numeración.
+    """
+    n = len(distancias)
+    filas = [[distancias[v][u] for u in range(n)] for v in range(n)]
+
+    color = _a_rangos([
+        (v == ciudad_inicio, tuple(sorted((filas[v][u], filas[u][v]) for u in range(n) if u != v)))
+        for v in range(n)
+    ])
+    num_colores = len(set(color))
+
+    while num_colores < n:
+        nuevo = _a_rangos([
+            (color[v], tuple(sorted((filas[v][u], filas[u][v], color[u]) for u in range(n) if u != v)))
+            for v in range(n)
+        ])
+        num_nuevos = len(set(nuevo))
+        if num_nuevos == num_colores:
+            return None
+        color, num_colores = nuevo, num_nuevos
+
+    return sorted(range(n), key=color.__getitem__)
+
+
+def _instancia_canonica(distancias, ciudad_inicio, huella=None):
+    """
+    Parte de la clave que depende solo de (matriz, inicio), junto con el
+    orden canónico (o None). 'huella' es huella_matriz(distancias) si ya se
+    calculó.
+    """
+    orden = etiquetado_canonico(distancias, ciudad_inicio)
+    if orden is None:
+        if huella is None:
+            huella = huella_matriz(distancias)
+        return f"identidad|{ciudad_inicio}|{huella.hex()}", None
+    reordenada = [[distancias[a][b] for b in orden] for a in orden]
+    return f"canonica|{orden.index(ciudad_inicio)}|{huella_matriz(reordenada).hex()}", orden
+
+
+def clave_instancia(distancias, ciudad_inicio, nombre_solver):
+    """
+    Devuelve (clave, orden): la clave identifica (matriz, inicio, solver) y
+    'orden' es el etiquetado canónico usado (o None si se usó la numeración
+    original). Las rutas se guardan en posiciones canónicas. Si el solver se
+    llama con opciones, 'nombre_solver' debe incluirlas (ver resolver()).
+    """
+    instancia, orden = _instancia_canonica(distancias, ciudad_inicio)
+    return f"{nombre_solver}|{instancia}", orden
+
+
+# ==========================
+# CACHE EN MEMORIA + SQLITE
+# ==========================
+
+class CacheSoluciones:
+    """
+    Cache de soluciones óptimas entre ejecuciones.
+    - Primer nivel: diccionario LRU en memoria (aciertos en microsegundos).
+    - Segundo nivel: archivo SQLite con a lo más max_entradas soluciones;
+      al pasarse se borran las usadas hace más tiempo. El número de filas
+      se lleva en memoria (se cuenta una vez al abrir), así que guardar no
+      recorre la tabla.
+    - El etiquetado canónico de cada matriz (por su huella) también se
+      recuerda: otro solver u otra opción sobre la misma matriz no lo
+      vuelve a calcular.
+    Se usa con resolver(solver, distancias, ...) o envolviendo un solver con
+    envolver(solver); en ambos casos se devuelve la misma tupla que el solver.
+    """
+
+    def __init__(self, ruta_bd="soluciones_tsp.sqlite", max_entradas=10000, max_memoria=1024):
+        self.max_entradas = max_entradas
+        self.max_memoria = max_memoria
+        self.aciertos = 0
+        self.fallos = 0
+        self._memoria = OrderedDict()
+        self._canonicas = OrderedDict()
+        self._conexion = sqlite3.connect(ruta_bd)
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS soluciones ("
+            " clave TEXT PRIMARY KEY,"
+            " ruta TEXT NOT NULL,"
+            " costo TEXT NOT NULL,"
+            " extras TEXT NOT NULL,"
+            " ultimo_uso REAL NOT NULL)"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS soluciones_ultimo_uso ON soluciones (ultimo_uso)"
+        )
+        self._conexion.commit()
+        self._num_entradas = self._conexion.execute("SELECT COUNT(*) FROM soluciones").fetchone()[0]
+
+    def cerrar(self):
+        self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __len__(self):
+        return self._num_entradas
+
+    def _recordar(self, clave, valor):
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def obtener(self, clave):
+        """
+        Devuelve (ruta_canonica, costo, extras) o None si no está.
+        """
+        valor = self._memoria.get(clave)
+        if valor is not None:
+            self._memoria.move_to_end(clave)
+            return valor
+
+        fila = self._conexion.execute(
+            "SELECT ruta, costo, extras FROM soluciones WHERE clave = ?", (clave,)
+        ).fetchone()
+        if fila is None:
+            return None
+
+        self._conexion.execute(
+            "UPDATE soluciones SET ultimo_uso = ? WHERE clave = ?", (time.time(), clave)
+        )
+        self._conexion.commit()
+        valor = (json.loads(fila[0]), json.loads(fila[1]), tuple(json.loads(fila[2])))
+        self._recordar(clave, valor)
+        return valor
+
+    def guardar(self, clave, ruta, costo, extras=()):
+        fila = (json.dumps(list(ruta)), json.dumps(costo), json.dumps(list(extras)), time.time(), clave)
+        cursor = self._conexion.execute(
+            "UPDATE soluciones SET ruta = ?, costo = ?, extras = ?, ultimo_uso = ? WHERE clave = ?", fila
+        )
+        if cursor.rowcount == 0:
+            self._conexion.execute(
+                "INSERT INTO soluciones (ruta, costo, extras, ultimo_uso, clave) VALUES (?, ?, ?, ?, ?)", fila
+            )
+            self._num_entradas += 1
+        sobrantes = self._num_entradas - self.max_entradas
+        if sobrantes > 0:
+            cursor = self._conexion.execute(
+                "DELETE FROM soluciones WHERE clave IN"
+                " (SELECT clave FROM soluciones ORDER BY ultimo_uso LIMIT ?)",
+                (sobrantes,),
+            )
+            self._num_entradas -= cursor.rowcount
+        self._conexion.commit()
+        self._recordar(clave, (list(ruta), costo, tuple(extras)))
+
+    def resolver(self, solver, distancias, nombres_ciudades=None, ciudad_inicio=0, **opciones):
+        """
+        Igual que solver(distancias, nombres_ciudades, ciudad_inicio, **opciones),
+        pero si la misma instancia (aunque tenga las ciudades renumeradas) ya se
+        resolvió con ese solver y las mismas opciones, devuelve la ruta guardada
+        sin volver a calcular. Las opciones forman parte de la clave (en JSON
+        con las claves ordenadas); si alguna no se puede pasar a JSON (por
+        ejemplo un IndiceVecinos), la llamada no pasa por la cache.
+        """
+        nombre_solver = f"{solver.__module__}.{solver.__qualname__}"
+        if opciones:
+            try:
+                nombre_solver += "|" + json.dumps(opciones, sort_keys=True, separators=(",", ":"))
+            except (TypeError, ValueError):
+                self.fallos += 1
+                INSTRUMENTACION.registrar("cache", fallos_cache=1)
+                return solver(distancias, nombres_ciudades, ciudad_inicio, **opciones)
+
+        # Camino rápido: la misma matriz con la misma numeración, ya en memoria
+        huella = huella_matriz(distancias)
+        clave_rapida = f"{nombre_solver}|original|{ciudad_inicio}|{huella.hex()}"
+        guardado = self._memoria.get(clave_rapida)
+        if guardado is not None:
+            self._memoria.move_to_end(clave_rapida)
+            self.aciertos += 1
+            INSTRUMENTACION.registrar("cache", aciertos_cache=1)
+            ruta_indices, costo, extras = guardado
+            ruta_indices = list(ruta_indices)
+            if nombres_ciudades is not None:
+                ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+            else:
+                ruta_nombres = ruta_indices
+            return (ruta_indices, ruta_nombres, costo, *extras)
+
+        clave_canonica = (ciudad_inicio, huella)
+        canonica = self._canonicas.get(clave_canonica)
+        if canonica is None:
+            canonica = _instancia_canonica(distancias, ciudad_inicio, huella)
+            self._canonicas[clave_canonica] = canonica
+            while len(self._canonicas) > self.max_memoria:
+                self._canonicas.popitem(last=False)
+        else:
+            self._canonicas.move_to_end(clave_canonica)
+        instancia, orden = canonica
+        clave = f"{nombre_solver}|{instancia}"
+
+        guardado = self.obtener(clave)
+        if guardado is not None:
+            self.aciertos += 1
+            INSTRUMENTACION.registrar("cache", aciertos_cache=1)
+            ruta_canonica, costo, extras = guardado
+            if orden is None:
+                ruta_indices = list(ruta_canonica)
+            else:
+                ruta_indices = [orden[i] for i in ruta_canonica]
+        else:
+            self.fallos += 1
+            INSTRUMENTACION.registrar("cache", fallos_cache=1)
+            ruta_indices, _, costo, *extras = solver(distancias, None, ciudad_inicio, **opciones)
+            if orden is None:
+                ruta_canonica = ruta_indices
+            else:
+                posicion = {c: i for i, c in enumerate(orden)}
+                ruta_canonica = [posicion[c] for c in ruta_indices]
+            self.guardar(clave, ruta_canonica, costo, extras)
+        self._recordar(clave_rapida, (list(ruta_indices), costo, tuple(extras)))
+
+        if nombres_ciudades is not None:
+            ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+        else:
+            ruta_nombres = ruta_indices
+
+        return (ruta_indices, ruta_nombres, costo, *extras)
+
+    def envolver(self, solver):
+        """
+        Devuelve un solver con la misma firma que 'solver' que pasa por la cache.
+        """
+        @functools.wraps(solver)
+        def solver_con_cache(distancias, nombres_ciudades=None, ciudad_inicio=0, **opciones):
+            return self.resolver(solver, distancias, nombres_ciudades, ciudad_inicio, **opciones)
+        return solver_con_cache
+
+
+if __name__ == "__main__":
+    from comparacion import tsp_fuerza_bruta, tsp_recursivo_sin_memo, tsp_top_down_memo
+
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    ciudad_inicio = 0
+
+    with CacheSoluciones() as cache:
+        print("=== Cache de soluciones TSP ===")
+        for solver in (tsp_fuerza_bruta, tsp_recursivo_sin_memo, tsp_top_down_memo):
+            for intento in (1, 2):
+                inicio = time.perf_counter()
+                resultado = cache.resolver(solver, distancias, nombres_ciudades, ciudad_inicio)
+                tiempo = time.perf_counter() - inicio
+                print(f"{solver.__name__:24s} intento {intento}: {resultado[2]} km en {tiempo * 1e6:9.1f} µs")
+        print("Aciertos:", cache.aciertos, "Fallos:", cache.fallos, "Entradas en disco:", len(cache))
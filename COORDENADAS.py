@@ -0,0 +1,264 @@
+import hashlib
+import heapq
+import math
+from array import array
+
+import INSTRUMENTACION
+from HEURISTICAS import tsp_heuristico
+from MATRIZ import _METRICAS, CIUDADES_PERU, COORDENADAS_PERU, RADIO_TIERRA_KM
+from VECINOS import IndiceVecinos
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy es opcional: sin él los vecinos salen de la rejilla
+    cKDTree = None
+
+# Puntos por celda (en promedio) de la rejilla del índice espacial
+PUNTOS_POR_CELDA = 2
+
+# ==========================
+# ÍNDICE ESPACIAL (REJILLA)
+# ==========================
+
+def _proyectar(puntos, metrica):
+    """
+    Coordenadas planas para el índice: las euclidianas tal cual; las
+    (lat, lon) proyectadas en km (equirectangular alrededor de la latitud
+    media). La proyección solo ordena vecinos; las distancias se siguen
+    calculando con la métrica.
+    """
+    if metrica == "euclidiana":
+        return [(p[0], p[1]) for p in puntos]
+    lat_media = math.radians(sum(p[0] for p in puntos) / len(puntos))
+    escala_lon = math.cos(lat_media)
+    return [(RADIO_TIERRA_KM * math.radians(p[1]) * escala_lon, RADIO_TIERRA_KM * math.radians(p[0]))
+            for p in puntos]
+
+
+class IndiceEspacial:
+    """
+    Rejilla uniforme sobre los puntos (x, y): cada celda guarda los índices
+    de los puntos que caen en ella, con unos PUNTOS_POR_CELDA por celda.
+    Los k más cercanos a un punto se buscan por anillos de celdas alrededor
+    del suyo y se para cuando el anillo siguiente ya no puede tener nada más
+    cerca que el k-ésimo encontrado.
+    """
+
+    __slots__ = ("xs", "ys", "x0", "y0", "lado", "columnas", "filas", "celdas")
+
+    def __init__(self, puntos, puntos_por_celda=PUNTOS_POR_CELDA):
+        n = len(puntos)
+        self.xs = array('d', (p[0] for p in puntos))
+        self.ys = array('d', (p[1] for p in puntos))
+        self.x0, self.y0 = min(self.xs, default=0.0), min(self.ys, default=0.0)
+        ancho = max(self.xs, default=0.0) - self.x0
+        alto = max(self.ys, default=0.0) - self.y0
+        if ancho > 0 and alto > 0:
+            self.lado = math.sqrt(ancho * alto * puntos_por_celda / n)
+        else:
+            # Todos en una línea (o en un punto)
+            self.lado = max(ancho, alto) * puntos_por_celda / max(n, 1) or 1.0
+        self.columnas = int(ancho / self.lado) + 1
+        self.filas = int(alto / self.lado) + 1
+        self.celdas = [[] for _ in range(self.columnas * self.filas)]
+        for i in range(n):
+            cx, cy = self._celda(self.xs[i], self.ys[i])
+            self.celdas[cy * self.columnas + cx].append(i)
+
+    def _celda(self, x, y):
+        cx = min(max(int((x - self.x0) / self.lado), 0), self.columnas - 1)
+        cy = min(max(int((y - self.y0) / self.lado), 0), self.filas - 1)
+        return cx, cy
+
+    def cercanos(self, x, y, k, excluir=-1):
+        """
+        Los k puntos más cercanos a (x, y), del más cercano al más lejano
+        (sin contar el índice 'excluir').
+        """
+        xs, ys, celdas, columnas, filas = self.xs, self.ys, self.celdas, self.columnas, self.filas
+        cx, cy = self._celda(x, y)
+        candidatos = []
+        radio = 0
+        while True:
+            # Celdas del anillo 'radio' (a distancia de Chebyshev radio de la propia)
+            if radio == 0:
+                anillo = ((cx, cy),)
+            else:
+                anillo = [(cx + dx, cy + d) for dx in range(-radio, radio + 1) for d in (-radio, radio)]
+                anillo += [(cx + d, cy + dy) for dy in range(-radio + 1, radio) for d in (-radio, radio)]
+            for ax, ay in anillo:
+                if 0 <= ax < columnas and 0 <= ay < filas:
+                    for i in celdas[ay * columnas + ax]:
+                        if i != excluir:
+                            candidatos.append((math.hypot(xs[i] - x, ys[i] - y), i))
+            # Lo que está más allá del anillo queda a más de radio * lado
+            if len(candidatos) >= k:
+                mejores = heapq.nsmallest(k, candidatos)
+                if mejores[-1][0] <= radio * self.lado:
+                    return [i for _, i in mejores]
+            if radio > columnas and radio > filas:
+                return [i for _, i in heapq.nsmallest(k, candidatos)]
+            radio += 1
+
+
+def _huella_coordenadas(puntos, metrica):
+    h = hashlib.sha256()
+    h.update(f"{metrica}|{len(puntos)}".encode())
+    for p in puntos:
+        h.update(repr(tuple(p)).encode())
+    return h.digest()
+
+
+def vecinos_desde_coordenadas(puntos, k=10, metrica="euclidiana"):
+    """
+    IndiceVecinos (los k más cercanos de cada ciudad) sin armar la matriz:
+    con el KD-tree de scipy si está instalado y si no con IndiceEspacial.
+    Cuesta O(n log n) (u O(n) con la rejilla) en lugar de los O(n^2) de
+    IndiceVecinos.desde_distancias. Con "haversine" el orden de los vecinos
+    sale de la proyección plana y puede diferir un poco en distancias muy largas.
+    """
+    if metrica not in _METRICAS:
+        raise ValueError(f"Métrica desconocida: {metrica!r}")
+    n = len(puntos)
+    k = max(0, min(k, n - 1))
+    planos = _proyectar(puntos, metrica) if n else []
+    datos = array('i')
+    if k == 0:
+        pass
+    elif cKDTree is not None:
+        # k + 1 porque cada punto es su propio vecino más cercano (salvo puntos repetidos)
+        _, cercanos = cKDTree(planos).query(planos, k + 1)
+        for a, fila in enumerate(cercanos.tolist()):
+            datos.extend([b for b in fila if b != a][:k])
+    else:
+        indice = IndiceEspacial(planos)
+        for a, (x, y) in enumerate(planos):
+            datos.extend(indice.cercanos(x, y, k, excluir=a))
+    return IndiceVecinos(n, k, datos, _huella_coordenadas(puntos, metrica))
+
+
+# ==========================
+# DISTANCIAS SIN MATRIZ (MODO DISPERSO)
+# ==========================
+
+class _FilaCoordenadas:
+    """
+    Fila 'a' de la matriz: fila[b] calcula la distancia al pedirla.
+    """
+
+    __slots__ = ("origen", "puntos", "distancia")
+
+    def __init__(self, origen, puntos, distancia):
+        self.origen = origen
+        self.puntos = puntos
+        self.distancia = distancia
+
+    def __getitem__(self, b):
+        return self.distancia(self.origen, self.puntos[b])
+
+    def __len__(self):
+        return len(self.puntos)
+
+
+class _FilaCoordenadasEntera(_FilaCoordenadas):
+
+    __slots__ = ()
+
+    def __getitem__(self, b):
+        return round(self.distancia(self.origen, self.puntos[b]))
+
+
+class DistanciasCoordenadas:
+    """
+    Sustituto de la matriz para miles de ciudades: distancias[a][b] se
+    calcula desde las coordenadas en cada acceso y no se guarda ninguna
+    fila, así que la memoria es O(n). Junto con un IndiceVecinos (O(n*k),
+    ver vecinos_desde_coordenadas) es todo lo que necesitan las heurísticas,
+    que solo miran las distancias de pocos pares por movimiento.
+    No conviene con los solvers exactos, que recorren filas completas una y
+    otra vez: para ellos, MatrizDistancias.desde_coordenadas (con max_filas).
+    """
+
+    __slots__ = ("n", "tipo", "metrica", "_filas")
+
+    # Una métrica siempre es simétrica: VECINOS.es_simetrica no recorre los pares
+    simetrica = True
+
+    def __init__(self, puntos, metrica="euclidiana", tipo='f'):
+        if metrica not in _METRICAS:
+            raise ValueError(f"Métrica desconocida: {metrica!r}")
+        puntos = tuple(tuple(p) for p in puntos)
+        self.n = len(puntos)
+        self.tipo = tipo
+        self.metrica = metrica
+        clase = _FilaCoordenadasEntera if tipo == 'i' else _FilaCoordenadas
+        distancia = _METRICAS[metrica]
+        self._filas = [clase(p, puntos, distancia) for p in puntos]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, a):
+        return self._filas[a]
+
+    def __iter__(self):
+        return iter(self._filas)
+
+
+# ==========================
+# HEURÍSTICA DESDE COORDENADAS
+# ==========================
+
+def tsp_heuristico_coordenadas(puntos, nombres_ciudades=None, ciudad_inicio=0, metrica="euclidiana",
+                               tipo='f', construccion="voraz", k_vecinos=10, busqueda_local=True):
+    """
+    tsp_heuristico a partir de las coordenadas, sin la matriz n x n: los
+    vecinos candidatos salen del índice espacial (vecinos_desde_coordenadas)
+    y las distancias se calculan en cada acceso (DistanciasCoordenadas), así
+    que la memoria es O(n*k). Con la matriz completa, solo armarla ya cuesta
+    O(n^2) en tiempo y memoria (y construir los vecinos recorre cada fila).
+    Una matriz perezosa con caché LRU de filas (MatrizDistancias.desde_coordenadas
+    con max_filas) no sirve para esto: 2-opt y Or-opt piden pares de filas
+    distintas en cada movimiento y la caché recalcularía filas sin parar.
+    La construcción por defecto es "voraz", que solo usa las aristas entre
+    vecinos; "vecino" a veces tiene que recorrer todas las ciudades pendientes.
+    Devuelve lo mismo que tsp_heuristico: (ruta_indices, ruta_nombres, costo, num_mejoras).
+    """
+    medicion = INSTRUMENTACION.iniciar("heuristico_coordenadas")
+    indice = vecinos_desde_coordenadas(puntos, k_vecinos, metrica)
+    medicion.fase("indice")
+    distancias = DistanciasCoordenadas(puntos, metrica, tipo)
+    medicion.fase("distancias")
+    medicion.terminar()
+    return tsp_heuristico(distancias, nombres_ciudades, ciudad_inicio, construccion, k_vecinos,
+                          busqueda_local, indice)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    ruta_idx, ruta_nombres, costo, mejoras = tsp_heuristico_coordenadas(
+        COORDENADAS_PERU, CIUDADES_PERU, 0, "haversine", tipo='i'
+    )
+    print("=== TSP heurístico desde coordenadas (Perú, en línea recta) ===")
+    print("Ruta:", " -> ".join(ruta_nombres))
+    print("Costo total:", costo, "km")
+    print()
+
+    print("=== Índice de vecinos: rejilla vs KD-tree (k = 10) ===")
+    print(f"{'n':>6s} {'Rejilla (s)':>12s} {'KD-tree (s)':>12s} {'Iguales':>8s}")
+    for n in (1000, 5000, 20000):
+        rng = random.Random(n)
+        puntos = [(rng.uniform(0, 2000), rng.uniform(0, 2000)) for _ in range(n)]
+        inicio = time.perf_counter()
+        rejilla = IndiceEspacial(puntos)
+        por_rejilla = [rejilla.cercanos(x, y, 10, excluir=a) for a, (x, y) in enumerate(puntos)]
+        t_rejilla = time.perf_counter() - inicio
+        texto_kdtree, iguales = "-", "-"
+        if cKDTree is not None:
+            inicio = time.perf_counter()
+            indice = vecinos_desde_coordenadas(puntos, 10)
+            texto_kdtree = f"{time.perf_counter() - inicio:.3f}"
+            iguales = str(all(list(indice[a]) == por_rejilla[a] for a in range(n)))
+        print(f"{n:6d} {t_rejilla:12.3f} {texto_kdtree:>12s} {iguales:>8s}")
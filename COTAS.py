@@ -0,0 +1,421 @@
+import math
+import time
+
+import INSTRUMENTACION
+from VECINOS import es_simetrica
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo lo necesitan las cotas vectorizadas
+    np = None
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy es opcional: sin él la asignación se resuelve con numpy
+    linear_sum_assignment = None
+
+# Parámetros del subgradiente (Held-Karp): iteraciones máximas, paso inicial
+# y cuántas iteraciones sin mejorar la cota antes de reducir el paso a la mitad
+ITERACIONES_SUBGRADIENTE = 500
+LAMBDA_INICIAL = 2.0
+LAMBDA_MINIMO = 1e-4
+PACIENCIA_SUBGRADIENTE = 10
+
+
+def matriz_numpy(distancias):
+    """
+    La matriz de distancias como arreglo numpy float64 (requiere numpy).
+    """
+    if np is None:
+        raise ImportError("COTAS requiere numpy (pip install numpy)")
+    return np.asarray(distancias, dtype=np.float64)
+
+
+def es_entera(matriz):
+    """
+    True si todas las distancias del arreglo 'matriz' son enteras.
+    """
+    return bool(np.all(matriz == np.floor(matriz)))
+
+
+def redondear_cota(cota, entera):
+    """
+    Si todas las distancias son enteras, toda ruta cuesta un entero:
+    se puede subir la cota al entero siguiente (con margen por redondeo).
+    """
+    if entera:
+        return math.ceil(cota - 1e-6)
+    return float(cota)
+
+
+# ==========================
+# COTA POR CIUDAD (sin numpy)
+# ==========================
+
+def aportes_por_ciudad(distancias):
+    """
+    Precalcula la cota inferior simple que usan RAMIFICACION_Y_PODA y
+    MEMOIZACION (nunca sobrestima el resto de una ruta):
+    - aporte[v]: contribución de la ciudad v a la cota mientras no se visite
+        simétrica:  (arista más barata + segunda más barata) de v
+        asimétrica: arista de salida más barata de v
+    - salida[v]: arista más barata de v (se usa para la ciudad actual y el inicio)
+    - vecinos[v]: las demás ciudades de la más cercana a la más lejana desde v
+    """
+    n = len(distancias)
+    simetrica = es_simetrica(distancias)
+
+    aporte = [0] * n
+    salida = [0] * n
+    vecinos = []
+    for v in range(n):
+        cercanas = sorted((b for b in range(n) if b != v), key=lambda b: distancias[v][b])
+        vecinos.append(cercanas)
+        if not cercanas:
+            continue
+        salida[v] = distancias[v][cercanas[0]]
+        if simetrica:
+            segunda = distancias[v][cercanas[1]] if len(cercanas) > 1 else salida[v]
+            aporte[v] = salida[v] + segunda
+        else:
+            aporte[v] = salida[v]
+
+    return {"simetrica": simetrica, "aporte": aporte, "salida": salida, "vecinos": vecinos}
+
+
+# ==========================
+# COTA DE ASIGNACIÓN
+# ==========================
+
+def _asignacion_numpy(costos):
+    """
+    Método húngaro (caminos de aumento más cortos), O(n^3) con el bucle
+    interno vectorizado. Devuelve el costo de la asignación mínima.
+    """
+    n = len(costos)
+    u = np.zeros(n + 1)
+    v = np.zeros(n + 1)
+    p = np.zeros(n + 1, dtype=np.intp)   # p[j] = fila asignada a la columna j (1..n)
+    camino = np.zeros(n + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minimos = np.full(n + 1, np.inf)
+        usadas = np.zeros(n + 1, dtype=bool)
+        while True:
+            usadas[j0] = True
+            i0 = p[j0]
+            reducidos = costos[i0 - 1] - u[i0] - v[1:]
+            libres = ~usadas[1:]
+            mejora = libres & (reducidos < minimos[1:])
+            minimos[1:][mejora] = reducidos[mejora]
+            camino[1:][mejora] = j0
+            candidatos = np.where(libres, minimos[1:], np.inf)
+            j1 = int(np.argmin(candidatos)) + 1
+            delta = candidatos[j1 - 1]
+            u[p[usadas]] += delta
+            v[usadas] -= delta
+            minimos[~usadas] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = camino[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    return float(-v[0])
+
+
+def cota_asignacion(distancias):
+    """
+    Cota de asignación: cada ciudad elige una sucesora distinta de sí misma,
+    sin exigir un solo ciclo. Toda ruta es una asignación, así que la
+    asignación mínima nunca supera al óptimo. Vale también para matrices
+    asimétricas. Usa scipy si está instalado.
+    """
+    matriz = matriz_numpy(distancias)
+    n = len(matriz)
+    if n <= 1:
+        return 0
+    costos = matriz.copy()
+    # Prohibimos quedarse en la misma ciudad con un costo que ninguna ruta alcanza
+    np.fill_diagonal(costos, (np.abs(matriz).max() + 1) * n)
+    if linear_sum_assignment is not None:
+        filas, columnas = linear_sum_assignment(costos)
+        valor = float(costos[filas, columnas].sum())
+    else:
+        valor = _asignacion_numpy(costos)
+    return redondear_cota(valor, es_entera(matriz))
+
+
+# ==========================
+# ÁRBOL DE EXPANSIÓN MÍNIMA Y 1-ÁRBOL
+# ==========================
+
+def _simetrizar(matriz):
+    """
+    Para matrices asimétricas se usa min(d[a][b], d[b][a]): una ruta dirigida
+    cuesta al menos lo mismo que su versión no dirigida con esas aristas.
+    """
+    if np.array_equal(matriz, matriz.T):
+        return matriz
+    return np.minimum(matriz, matriz.T)
+
+
+def _arbol_minimo(matriz, penalizaciones):
+    """
+    Árbol de expansión mínima con costos d[a][b] + pi[a] + pi[b] (Prim: una
+    fila de numpy por paso, O(n^2) en total).
+    Devuelve (costo con penalizaciones, grado de cada ciudad en el árbol).
+    """
+    m = len(matriz)
+    grados = np.zeros(m, dtype=np.int64)
+    pi = penalizaciones
+    bloqueo = np.zeros(m)        # inf para las ciudades que ya están en el árbol
+    bloqueo[0] = np.inf
+    mejor = matriz[0] + pi + (pi[0] + bloqueo)
+    padre = np.zeros(m, dtype=np.intp)
+    costo = 0.0
+    for _ in range(m - 1):
+        v = int(np.argmin(mejor))
+        costo += mejor[v]
+        grados[v] += 1
+        grados[padre[v]] += 1
+        bloqueo[v] = np.inf
+        fila = matriz[v] + pi + (pi[v] + bloqueo)
+        cambia = fila < mejor
+        np.copyto(mejor, fila, where=cambia)
+        np.copyto(padre, v, where=cambia)
+        mejor[v] = np.inf
+    return costo, grados
+
+
+def _un_arbol(matriz, penalizaciones):
+    """
+    1-árbol mínimo: árbol de expansión mínima de las ciudades 1..n-1 más las
+    dos aristas más baratas de la ciudad 0 (costos con penalizaciones).
+    Devuelve (costo con penalizaciones, grado de cada ciudad).
+    """
+    costo, grados_resto = _arbol_minimo(matriz[1:, 1:], penalizaciones[1:])
+    grados = np.empty(len(matriz), dtype=np.int64)
+    grados[1:] = grados_resto
+    grados[0] = 2
+
+    aristas = matriz[0, 1:] + penalizaciones[1:] + penalizaciones[0]
+    dos = np.argpartition(aristas, 1)[:2]
+    costo += aristas[dos].sum()
+    grados[dos + 1] += 1
+    return costo, grados
+
+
+def cota_arbol_minimo(distancias):
+    """
+    Costo del árbol de expansión mínima: quitar una arista a una ruta deja
+    un árbol, así que el óptimo nunca es menor. Se calcula sobre la versión
+    simétrica (ver _simetrizar).
+    """
+    matriz = matriz_numpy(distancias)
+    n = len(matriz)
+    if n <= 1:
+        return 0
+    costo, _ = _arbol_minimo(_simetrizar(matriz), np.zeros(n))
+    return redondear_cota(costo, es_entera(matriz))
+
+
+def cota_un_arbol(distancias):
+    """
+    Cota del 1-árbol sin penalizaciones: una ruta es un árbol sobre las
+    ciudades 1..n-1 más dos aristas de la ciudad 0.
+    """
+    matriz = matriz_numpy(distancias)
+    n = len(matriz)
+    if n <= 2:
+        return cota_asignacion(distancias)
+    costo, _ = _un_arbol(_simetrizar(matriz), np.zeros(n))
+    return redondear_cota(costo, es_entera(matriz))
+
+
+# ==========================
+# COTA LAGRANGIANA DE HELD-KARP
+# ==========================
+
+class CotaHeldKarp:
+    """
+    Cota de Held-Karp: máximo sobre las penalizaciones pi del 1-árbol con
+    costos d[a][b] + pi[a] + pi[b], menos 2 * sum(pi). Se busca con
+    subgradiente (pi[a] += paso * (grado[a] - 2)).
+    Es incremental: las penalizaciones y la mejor cota quedan guardadas, así
+    que mejorar() puede llamarse varias veces (por ejemplo con una cota
+    superior mejor, o con más tiempo) y continúa donde quedó.
+        cota = CotaHeldKarp(distancias)
+        cota.mejorar(costo_ruta, tiempo_limite=2.0)
+        cota.valor, cota.penalizaciones
+    """
+
+    def __init__(self, distancias):
+        matriz = matriz_numpy(distancias)
+        self.n = len(matriz)
+        self.entera = es_entera(matriz)
+        self.matriz = _simetrizar(matriz)
+        self.penalizaciones = np.zeros(self.n)
+        self.mejor_penalizaciones = self.penalizaciones.copy()
+        self.mejor_cota = -math.inf
+        self.es_ruta = False
+        self.iteraciones = 0
+        self._lambda = LAMBDA_INICIAL
+
+    @property
+    def valor(self):
+        """
+        Mejor cota encontrada (entera si las distancias lo son).
+        """
+        return redondear_cota(self.mejor_cota, self.entera)
+
+    def evaluar(self, penalizaciones):
+        """
+        Cota L(pi) para unas penalizaciones dadas y los grados del 1-árbol.
+        """
+        costo, grados = _un_arbol(self.matriz, penalizaciones)
+        return costo - 2 * penalizaciones.sum(), grados
+
+    def mejorar(self, cota_superior, iteraciones=ITERACIONES_SUBGRADIENTE, tiempo_limite=None):
+        """
+        Hace hasta 'iteraciones' pasos de subgradiente. Termina antes si el
+        1-árbol ya es una ruta (la cota es el óptimo), si la cota alcanza a
+        cota_superior, si el paso se vuelve despreciable o si se acaba
+        tiempo_limite (segundos). Devuelve la mejor cota (ver valor).
+        """
+        if self.n <= 2:
+            self.mejor_cota = self.matriz.sum() if self.n == 2 else 0
+            return self.valor
+
+        limite = None if tiempo_limite is None else time.perf_counter() + tiempo_limite
+        sin_mejora = 0
+        pi = self.penalizaciones
+        for _ in range(iteraciones):
+            cota, grados = self.evaluar(pi)
+            self.iteraciones += 1
+            if cota > self.mejor_cota + 1e-9:
+                self.mejor_cota = cota
+                self.mejor_penalizaciones = pi.copy()
+                sin_mejora = 0
+            else:
+                sin_mejora += 1
+                if sin_mejora >= PACIENCIA_SUBGRADIENTE:
+                    self._lambda /= 2
+                    sin_mejora = 0
+
+            subgradiente = grados - 2
+            norma = int(subgradiente @ subgradiente)
+            if norma == 0:
+                self.es_ruta = True
+                break
+            if self.valor >= cota_superior or self._lambda < LAMBDA_MINIMO:
+                break
+            if limite is not None and time.perf_counter() >= limite:
+                break
+            paso = self._lambda * max(cota_superior - cota, 1e-9) / norma
+            pi = pi + paso * subgradiente
+
+        self.penalizaciones = pi
+        return self.valor
+
+    def distancias_reducidas(self, distancias):
+        """
+        d[a][b] + pi[a] + pi[b] con las mejores penalizaciones, como lista de
+        listas. Toda ruta cuesta lo mismo más 2 * sum(pi), así que la ruta
+        óptima no cambia, pero las cotas simples (dos aristas más baratas)
+        quedan mucho más ajustadas.
+        Devuelve (distancias_reducidas, desplazamiento = 2 * sum(pi)).
+        """
+        pi = self.mejor_penalizaciones
+        # pi[a] + pi[b] se suma primero para que la matriz siga siendo
+        # exactamente simétrica (a + b == b + a en punto flotante)
+        reducidas = matriz_numpy(distancias) + (pi[:, None] + pi[None, :])
+        return reducidas.tolist(), float(2 * pi.sum())
+
+
+def cota_lagrangiana(distancias, cota_superior=None, iteraciones=ITERACIONES_SUBGRADIENTE,
+                     tiempo_limite=None):
+    """
+    Cota de Held-Karp optimizada por subgradiente. Si no se da cota_superior
+    se usa el costo de tsp_heuristico (el paso del subgradiente la necesita).
+    Devuelve (cota, penalizaciones, iteraciones_hechas).
+    """
+    if cota_superior is None:
+        from HEURISTICAS import tsp_heuristico
+        cota_superior = tsp_heuristico(distancias)[2]
+    cota = CotaHeldKarp(distancias)
+    cota.mejorar(cota_superior, iteraciones, tiempo_limite)
+    return cota.valor, cota.mejor_penalizaciones, cota.iteraciones
+
+
+# ==========================
+# BRECHA CERTIFICADA
+# ==========================
+
+def cota_inferior(distancias, cota_superior=None, iteraciones=ITERACIONES_SUBGRADIENTE,
+                  tiempo_limite=None):
+    """
+    La mejor de las cotas: asignación y Held-Karp (en matrices simétricas
+    casi siempre gana Held-Karp; en asimétricas, la asignación).
+    Devuelve (cota, nombre_de_la_cota).
+    """
+    medicion = INSTRUMENTACION.iniciar("cotas")
+    asignacion = cota_asignacion(distancias)
+    medicion.fase("asignacion")
+    held_karp, _, num_iteraciones = cota_lagrangiana(distancias, cota_superior, iteraciones, tiempo_limite)
+    medicion.fase("subgradiente")
+    medicion.terminar(iteraciones=num_iteraciones)
+    if held_karp >= asignacion:
+        return held_karp, "held_karp"
+    return asignacion, "asignacion"
+
+
+def brecha_certificada(distancias, ruta_indices, iteraciones=ITERACIONES_SUBGRADIENTE, tiempo_limite=None):
+    """
+    Qué tan lejos del óptimo puede estar una ruta, sin conocer el óptimo:
+    (costo - cota) / cota. Una brecha de 0.01 garantiza que la ruta cuesta
+    a lo más 1% más que la óptima.
+    Devuelve (costo, cota, brecha).
+    """
+    costo = 0
+    for i in range(len(ruta_indices) - 1):
+        costo += distancias[ruta_indices[i]][ruta_indices[i + 1]]
+    cota, _ = cota_inferior(distancias, costo, iteraciones, tiempo_limite)
+    brecha = (costo - cota) / cota if cota > 0 else 0.0
+    return costo, cota, max(brecha, 0.0)
+
+
+if __name__ == "__main__":
+    from BENCHMARK import instancia_euclidiana, instancia_asimetrica
+    from HEURISTICAS import tsp_heuristico
+    from MATRIZ import ejemplo_peru
+
+    nombres_ciudades, distancias = ejemplo_peru()
+    print("=== Cotas inferiores (ciudades de Perú) ===")
+    print("Asignación:", cota_asignacion(distancias))
+    print("Árbol mínimo:", cota_arbol_minimo(distancias))
+    print("1-árbol:", cota_un_arbol(distancias))
+    print("Held-Karp:", cota_lagrangiana(distancias)[0])
+    ruta, _, costo, _ = tsp_heuristico(distancias, nombres_ciudades)
+    print("Ruta heurística:", costo, "km  brecha:", f"{brecha_certificada(distancias, ruta)[2]:.2%}")
+
+    for nombre, generador in (("euclidiana", instancia_euclidiana), ("asimetrica", instancia_asimetrica)):
+        for n in (200, 1000):
+            matriz = generador(n, semilla=1)
+            inicio = time.perf_counter()
+            ruta, _, costo, _ = tsp_heuristico(matriz)
+            tiempo_ruta = time.perf_counter() - inicio
+
+            print(f"\n=== {nombre} n={n} (ruta heurística: {costo}, {tiempo_ruta:.2f} s) ===")
+            for etiqueta, funcion in (
+                ("Asignación", cota_asignacion),
+                ("Árbol mínimo", cota_arbol_minimo),
+                ("1-árbol", cota_un_arbol),
+                ("Held-Karp", lambda m: cota_lagrangiana(m, costo)[0]),
+            ):
+                inicio = time.perf_counter()
+                cota = funcion(matriz)
+                tiempo = time.perf_counter() - inicio
+                print(f"{etiqueta:>13s}: {cota:>10}  brecha {(costo - cota) / cota:7.2%}  {tiempo:6.2f} s")
@@ -1,20 +1,14 @@
+import concurrent.futures
 import itertools
+import math
+import os
 
-nombres_ciudades = [
-    "Lima",      # 0
-    "Arequipa",  # 1
-    "Cusco",     # 2
-    "Trujillo",  # 3
-    "Piura"      # 4
-]
-
-distancias = [
-    [   0, 1000, 1100,  560,  980],  # Lima
-    [1000,    0,  510, 1600, 1850],  # Arequipa
-    [1100,  510,    0, 1300, 1500],  # Cusco
-    [ 560, 1600, 1300,    0,  410],  # Trujillo
-    [ 980, 1850, 1500,  410,    0]   # Piura
-]
+import INSTRUMENTACION
+from MATRIZ import CIUDADES_PERU, DISTANCIAS_PERU, ejemplo_peru
+from VECINOS import es_simetrica
+
+nombres_ciudades = list(CIUDADES_PERU)
+distancias = [list(fila) for fila in DISTANCIAS_PERU]
 
 ciudad_inicio = 0  # Lima
 
@@ -38,6 +32,7 @@ def tsp_fuerza_bruta(distancias, nombres_ciudades=None, ciudad_inicio=0):
     que comienzan y terminan en ciudad_inicio.
     """
     n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("fuerza_bruta")
 
     # Lista de todas las ciudades excepto la de inicio
     otras_ciudades = []
@@ -60,6 +55,7 @@ def tsp_fuerza_bruta(distancias, nombres_ciudades=None, ciudad_inicio=0):
         if costo < mejor_costo:
             mejor_costo = costo
             mejor_ruta = ruta
+    medicion.fase("busqueda")
 
     # Convertimos índices a nombres si los tenemos
     if nombres_ciudades is not None:
@@ -68,26 +64,280 @@ def tsp_fuerza_bruta(distancias, nombres_ciudades=None, ciudad_inicio=0):
             mejor_ruta_nombres.append(nombres_ciudades[idx])
     else:
         mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_rutas_evaluadas)
+
+    return mejor_ruta, mejor_ruta_nombres, mejor_costo, num_rutas_evaluadas
+
+
+# ==========================
+# FUERZA BRUTA POR BLOQUES (VARIOS PROCESOS)
+# ==========================
+
+# Bloques por proceso: más bloques reparten mejor la carga entre procesos
+BLOQUES_POR_PROCESO = 4
+
+# Por debajo de este número de permutaciones no vale la pena levantar procesos
+MIN_PERMUTACIONES_PARALELO = 40320  # 8!
+
+# Datos del proceso trabajador (se cargan una sola vez en _inicializar_trabajador)
+_DATOS = None
+
+
+def _prefijo_por_rango(elementos, longitud, rango):
+    """
+    Devuelve el prefijo número 'rango' (orden lexicográfico, desde 0) de
+    'longitud' elementos tomados de la lista ordenada 'elementos', junto con
+    los elementos que sobran (también ordenados).
+    """
+    disponibles = list(elementos)
+    prefijo = []
+    for i in range(longitud):
+        # Número de prefijos que comparten la elección de esta posición
+        bloque = math.perm(len(disponibles) - 1, longitud - i - 1)
+        posicion, rango = divmod(rango, bloque)
+        prefijo.append(disponibles.pop(posicion))
+    return prefijo, disponibles
+
+
+def _grupos_de_sufijos(distancias, ciudad_inicio, prefijo, costo_prefijo, resto, omitir_espejos):
+    """
+    Reparte las rutas que empiezan con 'prefijo' en grupos
+    (prefijo, costo_prefijo, ultima_del_prefijo, medio, ultima): cada grupo
+    son las permutaciones de 'medio' entre el prefijo y 'ultima' (None si la
+    última ciudad no está fija).
+    Si omitir_espejos es True, la última ciudad se elige mayor que la primera,
+    así que las permutaciones espejo (primera > última) nunca se generan.
+    """
+    anterior = prefijo[-1] if prefijo else ciudad_inicio
+    if not omitir_espejos:
+        return [(prefijo, costo_prefijo, anterior, resto, None)]
+    if not resto:
+        if prefijo[0] < prefijo[-1]:
+            return [(prefijo, costo_prefijo, anterior, (), None)]
+        return []
+
+    grupos = []
+    if prefijo:
+        for i, ultima in enumerate(resto):
+            if ultima > prefijo[0]:
+                grupos.append((prefijo, costo_prefijo, anterior, resto[:i] + resto[i + 1:], ultima))
+    else:
+        # Sin prefijo, la primera ciudad también se fija aquí
+        for i, primera in enumerate(resto):
+            for j in range(i + 1, len(resto)):
+                medio = resto[:i] + resto[i + 1:j] + resto[j + 1:]
+                grupos.append(([primera], costo_prefijo + distancias[anterior][primera],
+                               primera, medio, resto[j]))
+    return grupos
+
+
+def _evaluar_bloque(distancias, ciudad_inicio, otras_ciudades, longitud_prefijo,
+                    desde, hasta, omitir_espejos):
+    """
+    Evalúa las rutas cuyos prefijos (de longitud_prefijo ciudades) tienen
+    rango lexicográfico en [desde, hasta). El costo del prefijo se calcula una
+    vez y el resto de cada ruta se recorre directamente sobre la tupla de
+    itertools.permutations, sin construir la ruta completa.
+    Si omitir_espejos es True, solo se generan las permutaciones cuya primera
+    ciudad es menor que la última (la otra mitad son las mismas rutas al
+    revés): la última ciudad se fija antes de permutar las del medio.
+    En empate gana la permutación lexicográficamente menor, como en el
+    recorrido en orden.
+    Devuelve (mejor_perm, mejor_costo, num_rutas_evaluadas).
+    """
+    n = len(distancias)
+    mejor_perm = None
+    mejor_costo = float('inf')
+    num_rutas_evaluadas = 0
+    regreso = [distancias[c][ciudad_inicio] for c in range(n)]
+
+    for rango in range(desde, hasta):
+        prefijo, resto = _prefijo_por_rango(otras_ciudades, longitud_prefijo, rango)
+
+        costo_prefijo = 0
+        anterior = ciudad_inicio
+        for c in prefijo:
+            costo_prefijo += distancias[anterior][c]
+            anterior = c
+
+        for inicio, costo_inicio, ultimo_inicio, medio, ultima in _grupos_de_sufijos(
+                distancias, ciudad_inicio, prefijo, costo_prefijo, resto, omitir_espejos):
+            if ultima is None:
+                cierre = regreso
+                final = []
+            else:
+                # Desde la última del medio: pasar por 'ultima' y volver al inicio
+                cierre = [distancias[c][ultima] + regreso[ultima] for c in range(n)]
+                final = [ultima]
+
+            for sufijo in itertools.permutations(medio):
+                costo = costo_inicio
+                a = ultimo_inicio
+                for c in sufijo:
+                    costo += distancias[a][c]
+                    a = c
+                costo += cierre[a]
+                num_rutas_evaluadas += 1
+
+                if costo < mejor_costo:
+                    mejor_costo = costo
+                    mejor_perm = inicio + list(sufijo) + final
+                elif costo == mejor_costo:
+                    perm = inicio + list(sufijo) + final
+                    if perm < mejor_perm:
+                        mejor_perm = perm
+
+    return mejor_perm, mejor_costo, num_rutas_evaluadas
+
+
+def _inicializar_trabajador(distancias, ciudad_inicio, otras_ciudades, longitud_prefijo, omitir_espejos):
+    global _DATOS
+    _DATOS = (distancias, ciudad_inicio, otras_ciudades, longitud_prefijo, omitir_espejos)
+
+
+def _evaluar_bloque_en_trabajador(bloque):
+    distancias, ciudad_inicio, otras_ciudades, longitud_prefijo, omitir_espejos = _DATOS
+    desde, hasta = bloque
+    return _evaluar_bloque(distancias, ciudad_inicio, otras_ciudades, longitud_prefijo,
+                           desde, hasta, omitir_espejos)
+
+
+def tsp_fuerza_bruta_paralelo(distancias, nombres_ciudades=None, ciudad_inicio=0,
+                              num_procesos=None, omitir_espejos=None):
+    """
+    Fuerza bruta exacta repartida en bloques de permutaciones.
+    El espacio de (n-1)! permutaciones se divide en rangos lexicográficos de
+    prefijos [desde, hasta) independientes; cada proceso reconstruye sus
+    prefijos a partir del rango y recorre los sufijos sin crear listas por ruta.
+    Al final se combinan los mejores de cada bloque en orden (en empate gana
+    el bloque de menor rango, igual que en el recorrido secuencial).
+    Si la matriz es simétrica (o omitir_espejos=True) se salta la ruta
+    espejo de cada ruta, así que num_rutas_evaluadas es (n-1)!/2 y sigue
+    siendo un conteo exacto de las rutas cuyo costo se calculó.
+    """
+    n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("fuerza_bruta_paralelo")
+    otras_ciudades = [i for i in range(n) if i != ciudad_inicio]
+    m = len(otras_ciudades)
+
+    if omitir_espejos is None:
+        omitir_espejos = es_simetrica(distancias)
+    if m < 2:
+        omitir_espejos = False
+
+    if num_procesos is None:
+        num_procesos = os.cpu_count() or 1
+
+    if num_procesos <= 1 or math.factorial(m) < MIN_PERMUTACIONES_PARALELO:
+        resultados = [_evaluar_bloque(distancias, ciudad_inicio, otras_ciudades, 0, 0, 1, omitir_espejos)]
+    else:
+        # Prefijos lo bastante largos como para tener al menos num_bloques rangos
+        num_bloques = num_procesos * BLOQUES_POR_PROCESO
+        longitud_prefijo = 1
+        while longitud_prefijo < m and math.perm(m, longitud_prefijo) < num_bloques:
+            longitud_prefijo += 1
+        total = math.perm(m, longitud_prefijo)
+        tamano = -(-total // num_bloques)
+        bloques = ((desde, min(desde + tamano, total)) for desde in range(0, total, tamano))
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_procesos,
+            initializer=_inicializar_trabajador,
+            initargs=(distancias, ciudad_inicio, otras_ciudades, longitud_prefijo, omitir_espejos),
+        ) as executor:
+            resultados = list(executor.map(_evaluar_bloque_en_trabajador, bloques))
+
+    mejor_perm = None
+    mejor_costo = float('inf')
+    num_rutas_evaluadas = 0
+    for perm, costo, evaluadas in resultados:
+        num_rutas_evaluadas += evaluadas
+        if perm is not None and costo < mejor_costo:
+            mejor_perm, mejor_costo = perm, costo
+    medicion.fase("busqueda")
+
+    mejor_ruta = [ciudad_inicio] + mejor_perm + [ciudad_inicio]
+
+    if nombres_ciudades is not None:
+        mejor_ruta_nombres = [nombres_ciudades[i] for i in mejor_ruta]
+    else:
+        mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_rutas_evaluadas)
+
+    return mejor_ruta, mejor_ruta_nombres, mejor_costo, num_rutas_evaluadas
+
+
+# ==========================
+# FUERZA BRUTA CON COSTO INCREMENTAL (PREFIJOS COMPARTIDOS)
+# ==========================
+
+def tsp_fuerza_bruta_incremental(distancias, nombres_ciudades=None, ciudad_inicio=0):
+    """
+    Misma búsqueda que tsp_fuerza_bruta (mismas rutas, en el mismo orden
+    lexicográfico que itertools.permutations), pero el costo se acumula a
+    medida que se fija cada posición: las rutas que comparten un prefijo
+    comparten también su costo, y cerrar cada ruta cuesta O(1) en lugar de
+    recorrerla entera con calcular_costo_ruta.
+    Devuelve exactamente lo mismo que tsp_fuerza_bruta.
+    """
+    n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("fuerza_bruta_incremental")
+
+    # Ciudades pendientes, en orden creciente (así se conserva el orden lexicográfico)
+    restantes = [i for i in range(n) if i != ciudad_inicio]
+    m = len(restantes)
+
+    regreso = [distancias[c][ciudad_inicio] for c in range(n)]
+    perm = [ciudad_inicio] * m
+
+    mejor_perm = None
+    mejor_costo = float('inf')
+    num_rutas_evaluadas = 0
+
+    def extender(posicion, anterior, costo_prefijo):
+        nonlocal mejor_perm, mejor_costo, num_rutas_evaluadas
+
+        # Queda una sola ciudad: la ruta se cierra en tiempo constante
+        if posicion == m - 1:
+            ultima = restantes[0]
+            costo = costo_prefijo + distancias[anterior][ultima] + regreso[ultima]
+            num_rutas_evaluadas += 1
+            if costo < mejor_costo:
+                mejor_costo = costo
+                perm[posicion] = ultima
+                mejor_perm = perm[:]
+            return
+
+        fila = distancias[anterior]
+        for i in range(len(restantes)):
+            c = restantes.pop(i)
+            perm[posicion] = c
+            extender(posicion + 1, c, costo_prefijo + fila[c])
+            restantes.insert(i, c)
+
+    if m == 0:
+        mejor_perm = []
+        mejor_costo = regreso[ciudad_inicio]
+        num_rutas_evaluadas = 1
+    else:
+        extender(0, ciudad_inicio, 0)
+    medicion.fase("busqueda")
+
+    mejor_ruta = [ciudad_inicio] + mejor_perm + [ciudad_inicio]
+
+    if nombres_ciudades is not None:
+        mejor_ruta_nombres = [nombres_ciudades[i] for i in mejor_ruta]
+    else:
+        mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_rutas_evaluadas)
 
     return mejor_ruta, mejor_ruta_nombres, mejor_costo, num_rutas_evaluadas
 
 
 if __name__ == "__main__":
-    nombres_ciudades = [
-        "Lima",
-        "Arequipa",
-        "Cusco",
-        "Trujillo",
-        "Piura"
-    ]
-
-    distancias = [
-        [   0, 1000, 1100,  560,  980],
-        [1000,    0,  510, 1600, 1850],
-        [1100,  510,    0, 1300, 1500],
-        [ 560, 1600, 1300,    0,  410],
-        [ 980, 1850, 1500,  410,    0]
-    ]
+    nombres_ciudades, distancias = ejemplo_peru()
 
     ciudad_inicio = 0  # Lima
 
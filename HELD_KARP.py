@@ -0,0 +1,725 @@
+import concurrent.futures
+import os
+import tempfile
+import threading
+from multiprocessing import shared_memory
+from array import array
+
+import INSTRUMENTACION
+from MATRIZ import MatrizDistancias, ejemplo_peru
+from SUBCONJUNTOS import (IndiceCapas, binomiales, bits, bits_debajo, mascaras_por_rango,
+                          rango_mascaras, rangos_sin_cada_bit_mascaras)
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo lo necesita tsp_held_karp_vectorizado
+    np = None
+
+# Máscaras que las versiones numpy resuelven juntas: acota los temporales
+# (rango sin cada bit y posiciones, m enteros por máscara)
+MASCARAS_POR_BLOQUE = 4096
+
+
+def _tipo_arreglo(distancias, n):
+    """
+    Elige el tipo del arreglo de costos:
+    - 'i' (int32) si todas las distancias son enteras y ninguna ruta puede desbordarlo,
+    - 'q' (int64) si son enteras pero la suma podría pasar de 2^31 - 1,
+    - 'd' (float64) si hay distancias con decimales.
+    """
+    if isinstance(distancias, MatrizDistancias):
+        # El tipo ya está en el búfer: no hace falta revisar valor por valor
+        if distancias.tipo != 'i':
+            return 'd'
+        maximo = distancias.maximo()
+    else:
+        maximo = 0
+        for fila in distancias:
+            for valor in fila:
+                if not isinstance(valor, int):
+                    return 'd'
+                if valor > maximo:
+                    maximo = valor
+    if maximo * n < 2 ** 31 - 1:
+        return 'i'
+    return 'q'
+
+
+def tsp_held_karp(distancias, nombres_ciudades=None, ciudad_inicio=0):
+    """
+    TSP usando Programación Dinámica Bottom-Up (Held-Karp iterativo).
+    En lugar de diccionarios con claves (ciudad_actual, visited_mask), la tabla
+    vive en arreglos contiguos, una capa por tamaño de subconjunto, indexada
+    con SUBCONJUNTOS.IndiceCapas:
+        capa_k[rango(mask) * k + p] = costo mínimo de salir de ciudad_inicio,
+                                      visitar exactamente las ciudades de 'mask'
+                                      y terminar en su p-ésima ciudad
+        padre_k[rango(mask) * k + p] = ciudad anterior en ese camino (uint8)
+    'mask' solo tiene bits para las m = n - 1 ciudades distintas del inicio.
+    Cada capa ocupa C(m, k) * k posiciones en lugar de m * 2^m; de los costos
+    solo se guarda la capa anterior (los padres se guardan todos para
+    reconstruir la ruta). Las máscaras de cada capa salen en orden de rango
+    (truco de Gosper), así que la fila de cada una es simplemente la siguiente.
+    """
+    n = len(distancias)
+
+    # Ciudades distintas del inicio: el bit b de 'mask' representa a otras[b]
+    otras = [i for i in range(n) if i != ciudad_inicio]
+    m = len(otras)
+
+    if m == 0:
+        ruta_indices = [ciudad_inicio, ciudad_inicio]
+        mejor_costo = distancias[ciudad_inicio][ciudad_inicio]
+        if nombres_ciudades is not None:
+            ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+        else:
+            ruta_nombres = ruta_indices
+        return ruta_indices, ruta_nombres, mejor_costo, 0, 0
+
+    if m > 256:
+        raise ValueError("Held-Karp admite como máximo 257 ciudades (padre es uint8)")
+
+    medicion = INSTRUMENTACION.iniciar("held_karp")
+    tipo = _tipo_arreglo(distancias, n)
+    INF = float('inf')
+
+    # hacia[j][i] = distancia de otras[i] a otras[j] (columna j, ya reindexada)
+    hacia = [[distancias[otras[i]][otras[j]] for i in range(m)] for j in range(m)]
+
+    indice = IndiceCapas(m)
+    cero = 0.0 if tipo == 'd' else 0
+
+    # Capa 1: ir directamente desde el inicio a la ciudad j (rango de 1 << j es j)
+    anterior = array(tipo, [distancias[ciudad_inicio][otras[j]] for j in range(m)])
+    padres = [None, None]
+
+    num_transiciones = m
+    num_estados = m
+
+    # Capas 2..m: cada estado depende solo de la capa anterior
+    for k in range(2, m + 1):
+        actual = array(tipo, [cero]) * (indice.tamano(k) * k)
+        padre = array('B', [0]) * (indice.tamano(k) * k)
+        base = 0
+        for mask in indice.mascaras(k):
+            posiciones = list(bits(mask))
+            rangos = indice.rangos_sin_cada_bit(posiciones)
+
+            for p in range(k):
+                j = posiciones[p]
+                columna = hacia[j]
+                # La fila de 'mask' sin j tiene las demás ciudades en el mismo orden
+                t = rangos[p] * (k - 1)
+                mejor = INF
+                mejor_i = 0
+                for i in posiciones:
+                    if i != j:
+                        c = anterior[t] + columna[i]
+                        t += 1
+                        if c < mejor:
+                            mejor = c
+                            mejor_i = i
+                actual[base + p] = mejor
+                padre[base + p] = mejor_i
+
+            base += k
+            num_transiciones += k * (k - 1)
+            num_estados += k
+
+        anterior = actual
+        padres.append(padre)
+
+    # Cierre del ciclo: regresar al inicio desde la última ciudad (la capa m
+    # tiene una sola máscara, con todas las ciudades en orden)
+    ALL_VISITED = (1 << m) - 1
+    mejor_costo = INF
+    ultima = 0
+    for j in range(m):
+        c = anterior[j] + distancias[otras[j]][ciudad_inicio]
+        if c < mejor_costo:
+            mejor_costo = c
+            ultima = j
+    num_transiciones += m
+
+    medicion.fase("busqueda")
+
+    # Reconstrucción hacia atrás usando los padres de cada capa
+    camino = []
+    mask = ALL_VISITED
+    j = ultima
+    for k in range(m, 1, -1):
+        camino.append(otras[j])
+        anterior_j = padres[k][indice.rango(mask) * k + indice.posicion(mask, j)]
+        mask ^= 1 << j
+        j = anterior_j
+    camino.append(otras[j])
+    camino.reverse()
+
+    ruta_indices = [ciudad_inicio] + camino + [ciudad_inicio]
+    medicion.fase("reconstruccion")
+
+    # Convertimos a nombres
+    if nombres_ciudades is not None:
+        ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+    else:
+        ruta_nombres = ruta_indices
+
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_estados, transiciones=num_transiciones)
+
+    return ruta_indices, ruta_nombres, mejor_costo, num_transiciones, num_estados
+
+
+def _relajar_mascaras(mascaras, costo_anterior, costo, padre, hacia, binom):
+    """
+    Calcula de una sola vez los estados (mask, j) de un bloque de máscaras
+    de la capa k, con las capas guardadas por rango:
+        costo_anterior[rango de mask sin j, i]   (capa k-1)
+        costo[fila, j], padre[fila, posición de j dentro de mask]
+    donde 'fila' es la posición de mask en 'mascaras'. Para cada j se toman
+    las máscaras que lo contienen y se evalúan todas las ciudades anteriores
+    i con una suma con broadcasting + min/argmin. Las posiciones (rango, i)
+    con i fuera de la máscara valen INF en 'costo_anterior', así que no hace
+    falta filtrarlas; 'costo' debe venir lleno de INF.
+    Devuelve el número de transiciones evaluadas.
+    """
+    m = costo.shape[1]
+    rangos, posiciones = rangos_sin_cada_bit_mascaras(mascaras, binom, m)
+    transiciones = 0
+    for j in range(m):
+        filas = np.flatnonzero(mascaras & (1 << j))
+        if len(filas) == 0:
+            continue
+        candidatos = costo_anterior[rangos[filas, j]] + hacia[j]
+        mejor_i = candidatos.argmin(axis=1)
+        costo[filas, j] = candidatos[np.arange(len(filas)), mejor_i]
+        padre[filas, posiciones[filas, j]] = mejor_i
+        transiciones += candidatos.size
+    return transiciones
+
+
+def _relajar_rangos(k, desde, hasta, costo_anterior, costo, padre, hacia, binom):
+    """
+    Resuelve las máscaras de la capa k con rango en [desde, hasta), de a
+    MASCARAS_POR_BLOQUE; 'costo' y 'padre' son las filas [desde, hasta) de
+    la capa. Devuelve el número de transiciones evaluadas.
+    """
+    m = len(hacia)
+    transiciones = 0
+    for inicio in range(desde, hasta, MASCARAS_POR_BLOQUE):
+        fin = min(inicio + MASCARAS_POR_BLOQUE, hasta)
+        mascaras = mascaras_por_rango(inicio, fin, k, binom, m)
+        transiciones += _relajar_mascaras(mascaras, costo_anterior, costo[inicio - desde:fin - desde],
+                                          padre[inicio - desde:fin - desde], hacia, binom)
+    return transiciones
+
+
+def _camino_por_capas(padres, ultima, otras):
+    """
+    Reconstruye hacia atrás el camino que termina en otras[ultima] con los
+    padres de cada capa (padres[k][rango, posición de j]).
+    """
+    m = len(otras)
+    indice = IndiceCapas(m)
+    camino = []
+    mask = (1 << m) - 1
+    j = ultima
+    for k in range(m, 1, -1):
+        camino.append(otras[j])
+        anterior = int(padres[k][indice.rango(mask), indice.posicion(mask, j)])
+        mask ^= 1 << j
+        j = anterior
+    camino.append(otras[j])
+    camino.reverse()
+    return camino
+
+
+def _preparar_numpy(distancias, otras):
+    """
+    Elige el dtype de la tabla (y su valor INF) y arma las matrices numpy:
+    matriz[a, b] = distancias[a][b], indices = otras como arreglo y
+    hacia[j, i] = distancia de otras[i] a otras[j].
+    """
+    n = len(distancias)
+    tipo = _tipo_arreglo(distancias, n)
+    if tipo == 'd':
+        dtype, INF = np.float64, np.inf
+    elif tipo == 'i' and max(max(fila) for fila in distancias) * n < 2 ** 30:
+        # INF + cualquier distancia sigue cabiendo en int32
+        dtype, INF = np.int32, 2 ** 30
+    else:
+        dtype, INF = np.int64, 2 ** 62
+
+    if isinstance(distancias, MatrizDistancias):
+        # Vista sobre el mismo búfer (solo se copia si hay que cambiar el tipo)
+        matriz = np.asarray(distancias).astype(dtype, copy=False)
+    else:
+        matriz = np.array([[distancias[a][b] for b in range(n)] for a in range(n)], dtype=dtype)
+    indices = np.array(otras, dtype=np.int64)
+    hacia = np.ascontiguousarray(matriz[np.ix_(indices, indices)].T)
+    return dtype, INF, matriz, indices, hacia
+
+
+def tsp_held_karp_vectorizado(distancias, nombres_ciudades=None, ciudad_inicio=0):
+    """
+    Held-Karp bottom-up vectorizado con numpy.
+    Tabla por capas como tsp_held_karp: la capa k tiene una fila por máscara
+    de k bits, en orden de rango (C(m, k) filas en lugar de 2^m):
+        costo_k[rango(mask), j]                    (INF si j no está en mask)
+        padre_k[rango(mask), posición de j en mask] (uint8)
+    Cada capa se resuelve con operaciones min/argmin por bloques de máscaras,
+    sin un bucle de Python por transición. De los costos solo se guardan dos
+    capas; los padres se guardan todos para reconstruir la ruta.
+    """
+    if np is None:
+        raise ImportError("tsp_held_karp_vectorizado requiere numpy (pip install numpy)")
+
+    n = len(distancias)
+    otras = [i for i in range(n) if i != ciudad_inicio]
+    m = len(otras)
+
+    if m == 0:
+        return tsp_held_karp(distancias, nombres_ciudades, ciudad_inicio)
+
+    if m > 62:
+        raise ValueError("Held-Karp vectorizado admite como máximo 63 ciudades (máscaras de 62 bits)")
+
+    medicion = INSTRUMENTACION.iniciar("held_karp_vectorizado")
+    dtype, INF, matriz, indices, hacia = _preparar_numpy(distancias, otras)
+    binom = binomiales(m)
+
+    # Capa 1: ir directamente desde el inicio a la ciudad j (rango de 1 << j es j)
+    costo_anterior = np.full((m, m), INF, dtype=dtype)
+    unos = np.arange(m)
+    costo_anterior[unos, unos] = matriz[ciudad_inicio, indices]
+    padres = [None, None]
+
+    num_transiciones = m
+    num_estados = m
+
+    for k in range(2, m + 1):
+        total = int(binom[m, k])
+        costo = np.full((total, m), INF, dtype=dtype)
+        padre = np.zeros((total, k), dtype=np.uint8)
+        num_transiciones += _relajar_rangos(k, 0, total, costo_anterior, costo, padre, hacia, binom)
+        num_estados += total * k
+        costo_anterior = costo
+        padres.append(padre)
+
+    # Cierre del ciclo (la última capa tiene una sola máscara, de rango 0)
+    cierre = costo_anterior[0] + matriz[indices, ciudad_inicio]
+    ultima = int(cierre.argmin())
+    mejor_costo = cierre[ultima].item()
+    num_transiciones += m
+
+    medicion.fase("busqueda")
+
+    camino = _camino_por_capas(padres, ultima, otras)
+
+    ruta_indices = [ciudad_inicio] + camino + [ciudad_inicio]
+    medicion.fase("reconstruccion")
+
+    if nombres_ciudades is not None:
+        ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+    else:
+        ruta_nombres = ruta_indices
+
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_estados, transiciones=num_transiciones)
+
+    return ruta_indices, ruta_nombres, mejor_costo, num_transiciones, num_estados
+
+
+# ==========================
+# HELD-KARP CON TABLA EN DISCO (numpy.memmap)
+# ==========================
+
+# Cada cuántos segundos se mide el RSS durante tsp_held_karp_disco
+INTERVALO_MUESTREO_MEMORIA = 0.01
+
+def _memoria_proceso_mb(campo):
+    """
+    Valor de 'campo' ("VmRSS": residente actual, "VmHWM": pico) de
+    /proc/self/status en MB, o None si no se puede leer (fuera de Linux).
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith(campo + ":"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class _MuestreoMemoria:
+    """
+    Pico de memoria de una resolución sin tocar el estado del proceso: un
+    hilo lee VmRSS cada INTERVALO_MUESTREO_MEMORIA segundos y el solver toma
+    además una muestra al terminar cada bloque (tomar()). Se informa cuánto
+    subió el RSS por encima del que había al empezar. Si /proc/self/status
+    no se puede leer (fuera de Linux), no hay hilo: el pico es el mayor
+    'estimado_mb' pasado a tomar() (lo que ocupan las capas abiertas y el
+    bloque de trabajo).
+    """
+
+    def __init__(self, intervalo=None):
+        self.base = _memoria_proceso_mb("VmRSS")
+        self.pico = self.base if self.base is not None else 0.0
+        self._fin = threading.Event()
+        self._hilo = None
+        if self.base is not None:
+            if intervalo is None:
+                intervalo = INTERVALO_MUESTREO_MEMORIA
+            self._hilo = threading.Thread(target=self._muestrear, args=(intervalo,), daemon=True)
+            self._hilo.start()
+
+    def _muestrear(self, intervalo):
+        while not self._fin.wait(intervalo):
+            self.tomar()
+
+    def tomar(self, estimado_mb=0.0):
+        if self.base is None:
+            self.pico = max(self.pico, estimado_mb)
+            return
+        rss = _memoria_proceso_mb("VmRSS")
+        if rss is not None and rss > self.pico:
+            self.pico = rss
+
+    def terminar(self):
+        """
+        Detiene el muestreo y devuelve el pico (MB) por encima del RSS inicial.
+        """
+        if self._hilo is None:
+            return self.pico
+        self._fin.set()
+        self._hilo.join()
+        self.tomar()
+        return max(0.0, self.pico - self.base)
+
+
+def tsp_held_karp_disco(distancias, nombres_ciudades=None, ciudad_inicio=0,
+                        directorio=None, memoria_maxima_mb=256):
+    """
+    Held-Karp bottom-up con la tabla en disco, para n entre 24 y 28 aprox.
+    Cada capa k (máscaras de k ciudades) se guarda en su propio archivo,
+    indexada por el rango de la máscara (C(m, k) filas en lugar de 2^m):
+        costo_k.bin: costo[rango, j]            (se lee con numpy.memmap)
+        padre_k.bin: padre[rango, posición de j] (uint8, solo las k ciudades de la máscara)
+    Las capas se escriben en orden secuencial, por bloques de máscaras cuyo
+    tamaño sale de memoria_maxima_mb (memoria de trabajo de cada bloque).
+    Solo se conservan dos capas de costos; los padres quedan en disco para
+    reconstruir la ruta. Los archivos van en una carpeta temporal dentro de
+    'directorio' y se borran al terminar.
+    Devuelve lo mismo que tsp_held_karp más el pico de memoria (MB) de esta
+    resolución: cuánto subió el RSS del proceso por encima del que tenía al
+    empezar, muestreado mientras corre (ver _MuestreoMemoria; no cambia
+    nada del proceso, así que no afecta otras mediciones). memoria_maxima_mb
+    acota la memoria de trabajo de cada bloque, no el RSS total: las
+    páginas de las capas leídas con memmap también cuentan, aunque el
+    sistema puede liberarlas cuando le falta memoria.
+    """
+    if np is None:
+        raise ImportError("tsp_held_karp_disco requiere numpy (pip install numpy)")
+
+    muestreo = _MuestreoMemoria()
+    try:
+        resultado = _held_karp_disco(distancias, nombres_ciudades, ciudad_inicio,
+                                     directorio, memoria_maxima_mb, muestreo)
+    finally:
+        pico = muestreo.terminar()
+    return resultado + (pico,)
+
+
+def _held_karp_disco(distancias, nombres_ciudades, ciudad_inicio, directorio, memoria_maxima_mb, muestreo):
+    n = len(distancias)
+    otras = [i for i in range(n) if i != ciudad_inicio]
+    m = len(otras)
+
+    if m == 0:
+        return tsp_held_karp(distancias, nombres_ciudades, ciudad_inicio)
+
+    if m > 62:
+        raise ValueError("Held-Karp en disco admite como máximo 63 ciudades (máscaras de 62 bits)")
+
+    medicion = INSTRUMENTACION.iniciar("held_karp_disco")
+    dtype, INF, matriz, indices, hacia = _preparar_numpy(distancias, otras)
+    binom = binomiales(m)
+
+    # Memoria de trabajo por máscara: candidatos, temporales de numpy y la fila de la capa
+    por_mascara = 4 * m * (np.dtype(dtype).itemsize + 8)
+    bloque = max(1, memoria_maxima_mb * 2 ** 20 // por_mascara)
+
+    with tempfile.TemporaryDirectory(prefix="held_karp_", dir=directorio) as carpeta:
+
+        def archivo(nombre, k):
+            return os.path.join(carpeta, f"{nombre}_{k}.bin")
+
+        # Capa 1: ir directamente desde el inicio a la ciudad j (rango de 1 << j es j)
+        capa = np.full((m, m), INF, dtype=dtype)
+        capa[np.arange(m), np.arange(m)] = matriz[ciudad_inicio, indices]
+        capa.tofile(archivo("costo", 1))
+        del capa
+        costo_anterior = np.memmap(archivo("costo", 1), dtype=dtype, mode="r", shape=(m, m))
+
+        num_transiciones = m
+        num_estados = m
+
+        for k in range(2, m + 1):
+            total = int(binom[m, k])
+            with open(archivo("costo", k), "wb") as f_costo, open(archivo("padre", k), "wb") as f_padre:
+                for desde in range(0, total, bloque):
+                    hasta = min(desde + bloque, total)
+                    mascaras = mascaras_por_rango(desde, hasta, k, binom, m)
+                    trozo = np.full((hasta - desde, m), INF, dtype=dtype)
+                    trozo_padre = np.zeros((hasta - desde, k), dtype=np.uint8)
+
+                    for j in range(m):
+                        bit = 1 << j
+                        filas = np.flatnonzero(mascaras & bit)
+                        if len(filas) == 0:
+                            continue
+                        seleccion = mascaras[filas]
+                        anteriores = rango_mascaras(seleccion ^ bit, binom, m)
+                        candidatos = costo_anterior[anteriores] + hacia[j]
+                        mejor_i = candidatos.argmin(axis=1)
+                        trozo[filas, j] = candidatos[np.arange(len(filas)), mejor_i]
+                        trozo_padre[filas, bits_debajo(seleccion, j)] = mejor_i
+                        num_transiciones += candidatos.size
+
+                    trozo.tofile(f_costo)
+                    trozo_padre.tofile(f_padre)
+                    muestreo.tomar((costo_anterior.nbytes + (hasta - desde) * por_mascara) / 2 ** 20)
+
+            num_estados += total * k
+
+            # La capa k-1 ya no hace falta: solo quedan dos capas de costos
+            del costo_anterior
+            os.remove(archivo("costo", k - 1))
+            costo_anterior = np.memmap(archivo("costo", k), dtype=dtype, mode="r", shape=(total, m))
+
+        # Cierre del ciclo (la última capa tiene una sola máscara, de rango 0)
+        cierre = np.asarray(costo_anterior[0]) + matriz[indices, ciudad_inicio]
+        del costo_anterior
+        ultima = int(cierre.argmin())
+        mejor_costo = cierre[ultima].item()
+        num_transiciones += m
+
+        medicion.fase("busqueda")
+
+        # Reconstrucción hacia atrás leyendo los padres de cada capa desde disco
+        camino = []
+        mask = (1 << m) - 1
+        j = ultima
+        for k in range(m, 1, -1):
+            camino.append(otras[j])
+            padre = np.memmap(archivo("padre", k), dtype=np.uint8, mode="r", shape=(int(binom[m, k]), k))
+            rango = int(rango_mascaras(np.array([mask], dtype=np.int64), binom, m)[0])
+            posicion = bin(mask & ((1 << j) - 1)).count("1")
+            anterior = int(padre[rango, posicion])
+            del padre
+            mask ^= 1 << j
+            j = anterior
+        camino.append(otras[j])
+        camino.reverse()
+
+    ruta_indices = [ciudad_inicio] + camino + [ciudad_inicio]
+    medicion.fase("reconstruccion")
+
+    if nombres_ciudades is not None:
+        ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+    else:
+        ruta_nombres = ruta_indices
+
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_estados, transiciones=num_transiciones)
+
+    return ruta_indices, ruta_nombres, mejor_costo, num_transiciones, num_estados
+
+
+# ==========================
+# HELD-KARP EN VARIOS PROCESOS (MEMORIA COMPARTIDA)
+# ==========================
+
+# Máscaras mínimas por tarea: por debajo, el envío de la tarea cuesta más que resolverla
+MIN_MASCARAS_POR_TAREA = 4096
+
+# Tablas compartidas del proceso trabajador (se conectan una vez en _inicializar_trabajador)
+_TABLA = None
+
+
+def _inicio_padres(binom, m):
+    """
+    inicio[k] = posición donde empiezan los padres de la capa k (C(m, k) * k
+    bytes) dentro del bloque de padres, con las capas 2..m una tras otra.
+    """
+    inicio = [0] * (m + 2)
+    for k in range(2, m + 1):
+        inicio[k + 1] = inicio[k] + int(binom[m, k]) * k
+    return inicio
+
+
+def _vistas_capa(tabla, k):
+    """
+    Vistas de la capa k-1 (costos), la capa k (costos) y los padres de la
+    capa k dentro de los bloques compartidos. Los costos alternan entre
+    dos capas del tamaño de la mayor.
+    """
+    binom = tabla["binom"]
+    m = tabla["m"]
+    total = int(binom[m, k])
+    anterior = tabla["costos"][(k - 1) % 2, :int(binom[m, k - 1])]
+    actual = tabla["costos"][k % 2, :total]
+    inicio = tabla["inicio_padres"][k]
+    padre = tabla["padres"][inicio:inicio + total * k].reshape(total, k)
+    return anterior, actual, padre
+
+
+def _tabla_compartida(bloque_costos, bloque_padres, m, dtype, hacia):
+    binom = binomiales(m)
+    filas = max(int(binom[m, k]) for k in range(1, m + 1))
+    inicio_padres = _inicio_padres(binom, m)
+    return {
+        # Se guardan los bloques para que no se cierren mientras se usen las vistas
+        "bloques": (bloque_costos, bloque_padres),
+        "costos": np.ndarray((2, filas, m), dtype=dtype, buffer=bloque_costos.buf),
+        "padres": np.ndarray((inicio_padres[m + 1],), dtype=np.uint8, buffer=bloque_padres.buf),
+        "inicio_padres": inicio_padres,
+        "hacia": hacia,
+        "binom": binom,
+        "m": m,
+    }
+
+
+def _inicializar_trabajador(nombre_costos, nombre_padres, m, dtype, hacia):
+    global _TABLA
+    # Los trabajadores comparten el resource_tracker del proceso principal,
+    # que es el dueño de los bloques y quien hace unlink() al final
+    _TABLA = _tabla_compartida(shared_memory.SharedMemory(name=nombre_costos),
+                               shared_memory.SharedMemory(name=nombre_padres), m, dtype, hacia)
+
+
+def _relajar_bloque(k, desde, hasta):
+    """
+    Resuelve las máscaras de la capa k con rango en [desde, hasta) directamente
+    sobre las capas compartidas. Cada tarea escribe filas distintas.
+    """
+    anterior, actual, padre = _vistas_capa(_TABLA, k)
+    return _relajar_rangos(k, desde, hasta, anterior, actual[desde:hasta], padre[desde:hasta],
+                           _TABLA["hacia"], _TABLA["binom"])
+
+
+def tsp_held_karp_paralelo(distancias, nombres_ciudades=None, ciudad_inicio=0, num_procesos=None):
+    """
+    Held-Karp vectorizado repartido entre procesos.
+    Dentro de una capa k, cada estado (mask, j) solo depende de la capa k-1,
+    así que las máscaras de la capa se dividen en rangos y cada proceso los
+    resuelve sobre las mismas capas en multiprocessing.shared_memory (sin
+    copiarlas). Las capas se guardan por rango como en
+    tsp_held_karp_vectorizado: dos capas de costos del tamaño de la mayor
+    (C(m, m/2) filas) que se alternan, y los padres de todas las capas.
+    Al terminar una capa se espera a todos antes de empezar la siguiente.
+    Devuelve lo mismo que tsp_held_karp_vectorizado.
+    """
+    if np is None:
+        raise ImportError("tsp_held_karp_paralelo requiere numpy (pip install numpy)")
+
+    if num_procesos is None:
+        num_procesos = os.cpu_count() or 1
+
+    n = len(distancias)
+    otras = [i for i in range(n) if i != ciudad_inicio]
+    m = len(otras)
+
+    if num_procesos <= 1 or m < 2:
+        return tsp_held_karp_vectorizado(distancias, nombres_ciudades, ciudad_inicio)
+
+    if m > 62:
+        raise ValueError("Held-Karp paralelo admite como máximo 63 ciudades (máscaras de 62 bits)")
+
+    medicion = INSTRUMENTACION.iniciar("held_karp_paralelo")
+    dtype, INF, matriz, indices, hacia = _preparar_numpy(distancias, otras)
+    binom = binomiales(m)
+    filas = max(int(binom[m, k]) for k in range(1, m + 1))
+
+    bloque_costos = shared_memory.SharedMemory(create=True, size=2 * filas * m * np.dtype(dtype).itemsize)
+    bloque_padres = shared_memory.SharedMemory(create=True, size=max(1, _inicio_padres(binom, m)[m + 1]))
+    try:
+        tabla = _tabla_compartida(bloque_costos, bloque_padres, m, dtype, hacia)
+
+        # Capa 1: ir directamente desde el inicio a la ciudad j (rango de 1 << j es j)
+        capa = tabla["costos"][1, :m]
+        capa[:] = INF
+        unos = np.arange(m)
+        capa[unos, unos] = matriz[ciudad_inicio, indices]
+
+        num_transiciones = m
+        num_estados = m
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_procesos,
+            initializer=_inicializar_trabajador,
+            initargs=(bloque_costos.name, bloque_padres.name, m, dtype, hacia),
+        ) as executor:
+            for k in range(2, m + 1):
+                total = int(binom[m, k])
+                _vistas_capa(tabla, k)[1][:] = INF
+                tamano = max(MIN_MASCARAS_POR_TAREA, -(-total // num_procesos))
+                tareas = [
+                    executor.submit(_relajar_bloque, k, desde, min(desde + tamano, total))
+                    for desde in range(0, total, tamano)
+                ]
+                # Barrera: la capa k+1 necesita la capa k completa
+                for tarea in tareas:
+                    num_transiciones += tarea.result()
+                num_estados += total * k
+
+        # Cierre del ciclo (la última capa tiene una sola máscara, de rango 0)
+        cierre = tabla["costos"][m % 2, 0] + matriz[indices, ciudad_inicio]
+        ultima = int(cierre.argmin())
+        mejor_costo = cierre[ultima].item()
+        num_transiciones += m
+
+        medicion.fase("busqueda")
+
+        padres = [None, None] + [_vistas_capa(tabla, k)[2] for k in range(2, m + 1)]
+        camino = _camino_por_capas(padres, ultima, otras)
+
+        del tabla, capa, padres
+    finally:
+        bloque_costos.close()
+        bloque_costos.unlink()
+        bloque_padres.close()
+        bloque_padres.unlink()
+
+    ruta_indices = [ciudad_inicio] + camino + [ciudad_inicio]
+    medicion.fase("reconstruccion")
+
+    if nombres_ciudades is not None:
+        ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+    else:
+        ruta_nombres = ruta_indices
+
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_estados, transiciones=num_transiciones)
+
+    return ruta_indices, ruta_nombres, mejor_costo, num_transiciones, num_estados
+
+
+if __name__ == "__main__":
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    ciudad_inicio = 0
+
+    ruta_idx, ruta_nombres, mejor_costo, transiciones, estados = tsp_held_karp(
+        distancias,
+        nombres_ciudades,
+        ciudad_inicio
+    )
+
+    print("=== TSP DP Bottom-Up (Held-Karp con tabla por capas) ===")
+    print("Mejor ruta (índices):", ruta_idx)
+    print("Mejor ruta (nombres):", " -> ".join(ruta_nombres))
+    print("Costo total:", mejor_costo, "km")
+    print("Transiciones evaluadas:", transiciones)
+    print("Estados en la tabla:", estados)
@@ -0,0 +1,301 @@
+from collections import deque
+from itertools import chain
+
+import INSTRUMENTACION
+from MATRIZ import ejemplo_peru
+from VECINOS import IndiceVecinos, Tour, es_simetrica
+
+# Tolerancia para aceptar una mejora (evita ciclos infinitos con distancias float)
+EPS = 1e-9
+
+
+# ==========================
+# CONSTRUCCIÓN DE RUTAS
+# ==========================
+
+def _vecino_mas_cercano(distancias, ciudad_inicio, vecinos=None):
+    """
+    Desde ciudad_inicio, ir siempre a la ciudad pendiente más cercana.
+    Si hay índice de vecinos, primero se busca entre los candidatos de la
+    ciudad actual y solo si todos están visitados se recorre la fila completa.
+    """
+    pendientes = set(range(len(distancias)))
+    pendientes.discard(ciudad_inicio)
+    tour = [ciudad_inicio]
+    actual = ciudad_inicio
+    while pendientes:
+        siguiente = None
+        if vecinos is not None:
+            for c in vecinos[actual]:
+                if c in pendientes:
+                    siguiente = c
+                    break
+        if siguiente is None:
+            siguiente = min(pendientes, key=distancias[actual].__getitem__)
+        actual = siguiente
+        pendientes.remove(actual)
+        tour.append(actual)
+    return tour
+
+
+def _aristas_voraz(distancias, vecinos):
+    """
+    Greedy edge: se agregan las aristas más cortas (solo entre vecinos
+    candidatos) mientras ninguna ciudad tenga grado 3 ni se cierre un ciclo.
+    Los fragmentos que quedan se unen por extremo más cercano.
+    """
+    n = len(distancias)
+
+    aristas = set()
+    for a in range(n):
+        for b in vecinos[a]:
+            aristas.add((a, b) if a < b else (b, a))
+    aristas = sorted(aristas, key=lambda arista: distancias[arista[0]][arista[1]])
+
+    # Unión-búsqueda para no cerrar ciclos antes de tiempo
+    raiz = list(range(n))
+
+    def buscar(x):
+        while raiz[x] != x:
+            raiz[x] = raiz[raiz[x]]
+            x = raiz[x]
+        return x
+
+    adyacentes = [[] for _ in range(n)]
+    for a, b in aristas:
+        if len(adyacentes[a]) < 2 and len(adyacentes[b]) < 2:
+            ra, rb = buscar(a), buscar(b)
+            if ra != rb:
+                raiz[ra] = rb
+                adyacentes[a].append(b)
+                adyacentes[b].append(a)
+
+    # Recorremos cada fragmento (camino) desde uno de sus extremos
+    visitada = [False] * n
+    fragmentos = []
+    for inicio in range(n):
+        if visitada[inicio] or len(adyacentes[inicio]) == 2:
+            continue
+        camino = [inicio]
+        visitada[inicio] = True
+        anterior, actual = None, inicio
+        while True:
+            siguiente = [c for c in adyacentes[actual] if c != anterior]
+            if not siguiente:
+                break
+            anterior, actual = actual, siguiente[0]
+            camino.append(actual)
+            visitada[actual] = True
+        fragmentos.append(camino)
+
+    # Unimos fragmentos: desde la cola del tour, el extremo libre más cercano
+    tour = fragmentos.pop()
+    while fragmentos:
+        fila = distancias[tour[-1]]
+        mejor = None
+        for i, camino in enumerate(fragmentos):
+            for invertido, extremo in ((False, camino[0]), (True, camino[-1])):
+                if mejor is None or fila[extremo] < mejor[0]:
+                    mejor = (fila[extremo], i, invertido)
+        _, i, invertido = mejor
+        camino = fragmentos.pop(i)
+        tour.extend(reversed(camino) if invertido else camino)
+    return tour
+
+
+# ==========================
+# BÚSQUEDA LOCAL
+# ==========================
+
+def _dos_opt(tour, distancias, vecinos, semillas=None):
+    """
+    2-opt con listas de vecinos y don't-look bits: solo se revisan ciudades
+    que están en la cola (al inicio todas, o solo 'semillas' si se pasan;
+    después, los extremos de cada movimiento aplicado).
+    Devuelve el número de movimientos aplicados.
+    """
+    n = tour.n
+    ciudades, pos = tour.ciudades, tour.pos
+    if semillas is None:
+        cola = deque(ciudades)
+        en_cola = [True] * len(pos)
+    else:
+        cola = deque(dict.fromkeys(semillas))
+        en_cola = [False] * len(pos)
+        for c in cola:
+            en_cola[c] = True
+    mejoras = 0
+
+    while cola:
+        a = cola.popleft()
+        en_cola[a] = False
+        fila_a = distancias[a]
+
+        for direccion in (1, -1):
+            b = ciudades[(pos[a] + direccion) % n]
+            d_ab = fila_a[b]
+            aplicado = False
+            for c in vecinos[a]:
+                d_ac = fila_a[c]
+                if d_ac >= d_ab:
+                    break
+                d = ciudades[(pos[c] + direccion) % n]
+                if c == b or d == a:
+                    continue
+                delta = d_ac + distancias[b][d] - d_ab - distancias[c][d]
+                if delta < -EPS:
+                    if direccion == 1:
+                        tour.invertir(pos[b], pos[c])
+                    else:
+                        tour.invertir(pos[a], pos[d])
+                    for x in (a, b, c, d):
+                        if not en_cola[x]:
+                            en_cola[x] = True
+                            cola.append(x)
+                    mejoras += 1
+                    aplicado = True
+                    break
+            if aplicado:
+                break
+
+    return mejoras
+
+
+def _or_opt(tour, distancias, vecinos, largo_maximo=3, permitir_invertir=True):
+    """
+    Or-opt: mueve tramos de 1 a largo_maximo ciudades a otro lugar del tour
+    (en cualquiera de los dos sentidos, salvo permitir_invertir=False),
+    probando solo posiciones junto a los vecinos candidatos de los extremos
+    del tramo.
+    Devuelve el número de movimientos aplicados.
+    """
+    n = tour.n
+    mejoras = 0
+
+    for largo in range(1, largo_maximo + 1):
+        if largo + 2 >= n:
+            break
+        i = 0
+        while i < n:
+            ciudades, pos = tour.ciudades, tour.pos
+            s1 = ciudades[i]
+            s2 = ciudades[(i + largo - 1) % n]
+            p = ciudades[(i - 1) % n]
+            nx = ciudades[(i + largo) % n]
+            ganancia = distancias[p][s1] + distancias[s2][nx] - distancias[p][nx]
+            if ganancia <= EPS:
+                i += 1
+                continue
+
+            mejor = None
+            for x in chain(vecinos[s1], vecinos[s2]):
+                if (pos[x] - i) % n < largo:
+                    continue
+                for c, e in ((x, ciudades[(pos[x] + 1) % n]), (ciudades[(pos[x] - 1) % n], x)):
+                    if (pos[c] - i) % n < largo or (pos[e] - i) % n < largo:
+                        continue
+                    d_ce = distancias[c][e]
+                    directo = distancias[c][s1] + distancias[s2][e] - d_ce
+                    invertido = distancias[c][s2] + distancias[s1][e] - d_ce
+                    if directo <= invertido or not permitir_invertir:
+                        agregado, al_reves = directo, False
+                    else:
+                        agregado, al_reves = invertido, True
+                    if agregado < ganancia - EPS and (mejor is None or agregado < mejor[0]):
+                        mejor = (agregado, c, al_reves)
+
+            if mejor is None:
+                i += 1
+                continue
+
+            _, c, al_reves = mejor
+            tour.mover_tramo(i, largo, c, al_reves)
+            mejoras += 1
+
+    return mejoras
+
+
+# ==========================
+# SOLVER HEURÍSTICO
+# ==========================
+
+def tsp_heuristico(distancias, nombres_ciudades=None, ciudad_inicio=0,
+                   construccion="vecino", k_vecinos=10, busqueda_local=True, indice=None):
+    """
+    TSP heurístico para instancias grandes (cientos o miles de ciudades).
+    1. Construcción: "vecino" (vecino más cercano) o "voraz" (greedy edge).
+    2. Mejora: 2-opt + Or-opt sobre los k_vecinos candidatos de cada ciudad,
+       hasta que ninguno de los dos encuentre una mejora.
+    'indice' permite reutilizar un IndiceVecinos ya construido (o cargado de
+    disco) para esta misma matriz; si no se pasa, se construye aquí.
+    No garantiza la ruta óptima. Si la matriz no es simétrica no se usa
+    2-opt ni se invierten tramos (cambiaría el costo de las aristas
+    internas): solo se mueven tramos con Or-opt en su mismo sentido.
+    Devuelve (ruta_indices, ruta_nombres, costo, num_mejoras).
+    """
+    n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("heuristico")
+
+    if n <= 3:
+        tour = Tour(_vecino_mas_cercano(distancias, ciudad_inicio))
+        num_mejoras = 0
+        medicion.fase("construccion")
+    else:
+        if indice is None:
+            indice = IndiceVecinos.desde_distancias(distancias, k_vecinos)
+        elif indice.n != n:
+            raise ValueError("El índice de vecinos es de otra instancia")
+
+        if construccion == "vecino":
+            tour = Tour(_vecino_mas_cercano(distancias, ciudad_inicio, indice))
+        elif construccion == "voraz":
+            tour = Tour(_aristas_voraz(distancias, indice))
+        else:
+            raise ValueError(f"Construcción desconocida: {construccion!r}")
+        medicion.fase("construccion")
+
+        num_mejoras = 0
+        if busqueda_local:
+            simetrica = es_simetrica(distancias)
+            while True:
+                if simetrica:
+                    num_mejoras += _dos_opt(tour, distancias, indice)
+                movimientos = _or_opt(tour, distancias, indice, permitir_invertir=simetrica)
+                num_mejoras += movimientos
+                if movimientos == 0:
+                    break
+        medicion.fase("busqueda_local")
+
+    # Rotamos el ciclo para que empiece y termine en ciudad_inicio
+    ruta_indices = tour.ruta_desde(ciudad_inicio)
+
+    costo = 0
+    for i in range(len(ruta_indices) - 1):
+        costo += distancias[ruta_indices[i]][ruta_indices[i + 1]]
+
+    if nombres_ciudades is not None:
+        ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+    else:
+        ruta_nombres = ruta_indices
+    medicion.fase("nombres")
+    medicion.terminar(mejoras=num_mejoras)
+
+    return ruta_indices, ruta_nombres, costo, num_mejoras
+
+
+if __name__ == "__main__":
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    ciudad_inicio = 0
+
+    ruta_idx, ruta_nombres, costo, mejoras = tsp_heuristico(
+        distancias,
+        nombres_ciudades,
+        ciudad_inicio
+    )
+
+    print("=== TSP Heurístico (vecino más cercano + 2-opt + Or-opt) ===")
+    print("Ruta (índices):", ruta_idx)
+    print("Ruta (nombres):", " -> ".join(ruta_nombres))
+    print("Costo total:", costo, "km")
+    print("Mejoras aplicadas:", mejoras)
@@ -0,0 +1,422 @@
+from array import array
+from itertools import combinations
+
+import INSTRUMENTACION
+from MATRIZ import ejemplo_peru
+from HEURISTICAS import _dos_opt, _or_opt
+from VECINOS import Tour, es_simetrica
+
+# Hasta cuántas ciudades (contando el inicio) se mantiene la tabla de Held-Karp
+MAX_N_EXACTO = 13
+
+# Tamaño de las listas de vecinos candidatos en el modo heurístico
+K_VECINOS = 10
+
+
+class ReoptimizadorIncremental:
+    """
+    Mantiene la solución de una instancia que cambia de a poco (se agrega o
+    se cancela una parada, cambia una distancia) sin resolver todo de nuevo.
+
+    - Modo exacto (hasta max_n_exacto ciudades activas): guarda la tabla de
+      Held-Karp plana costo[mask * cap + j] / padre[mask * cap + j], donde
+      cada bit de 'mask' es una casilla (slot) que ocupa una parada y cap es
+      fijo, así que la tabla no cambia de forma al agregar o quitar paradas.
+        * agregar parada: solo se calculan los estados que la contienen;
+        * quitar parada: se libera su casilla y solo se cierra el ciclo de nuevo
+          (los estados sin esa parada siguen siendo válidos);
+        * cambiar d[a][b]: solo se recalculan los estados cuyo camino puede
+          usar esa arista (los que contienen a a y a b).
+    - Modo heurístico (más paradas): guarda el tour y lo repara localmente
+      (inserción más barata, quitar la parada uniendo a sus vecinos) seguido
+      de una búsqueda local acotada que parte de las ciudades afectadas.
+
+    Los índices de las ciudades son los de la matriz y no se reutilizan: una
+    parada nueva recibe el índice len(distancias) y una parada quitada deja
+    su índice libre. Cada operación devuelve
+        (ruta_indices, ruta_nombres, costo, es_optimo, num_actualizados)
+    con es_optimo=True solo en modo exacto y num_actualizados = estados de la
+    tabla recalculados (modo exacto) o movimientos aplicados (modo heurístico).
+    """
+
+    def __init__(self, distancias, nombres_ciudades=None, ciudad_inicio=0,
+                 max_n_exacto=MAX_N_EXACTO, k_vecinos=K_VECINOS):
+        n = len(distancias)
+        self.distancias = [list(fila) for fila in distancias]
+        self.nombres_ciudades = list(nombres_ciudades) if nombres_ciudades is not None else None
+        self.ciudad_inicio = ciudad_inicio
+        self.max_n_exacto = max_n_exacto
+        self.k_vecinos = k_vecinos
+        self.activas = set(range(n))
+        self.simetrica = es_simetrica(self.distancias)
+
+        # Estado del modo exacto
+        self.cap = max(1, max_n_exacto - 1)
+        self.costo = None
+        self.padre = None
+        self.ciudad_de_casilla = []
+        self.casilla_de = {}
+
+        # Estado del modo heurístico
+        self.tour = None
+        self.vecinos = None
+
+        self._resultado = None
+        if n <= max_n_exacto:
+            num = self._iniciar_exacto()
+        else:
+            num = self._iniciar_heuristico(self._ruta_vecino_mas_cercano())
+        self._resultado = self._solucion(num)
+
+    # ==========================
+    # API
+    # ==========================
+
+    @property
+    def es_exacto(self):
+        return self.costo is not None
+
+    def solucion(self):
+        return self._resultado
+
+    def agregar_parada(self, distancias_desde, distancias_hacia=None, nombre=None):
+        """
+        Agrega una parada nueva (índice len(distancias)).
+        distancias_desde[c] = distancia de la parada nueva a c y
+        distancias_hacia[c] = distancia de c a la parada nueva (por defecto
+        las mismas), para cada índice c de la matriz actual.
+        """
+        d = self.distancias
+        nueva = len(d)
+        if distancias_hacia is None:
+            distancias_hacia = distancias_desde
+        if len(distancias_desde) != nueva or len(distancias_hacia) != nueva:
+            raise ValueError(f"Se esperaban {nueva} distancias hacia y desde la parada nueva")
+
+        medicion = INSTRUMENTACION.iniciar("incremental")
+        for c in range(nueva):
+            d[c].append(distancias_hacia[c])
+        d.append(list(distancias_desde) + [0])
+        if self.nombres_ciudades is not None:
+            self.nombres_ciudades.append(nueva if nombre is None else nombre)
+        if self.simetrica:
+            self.simetrica = all(distancias_desde[c] == distancias_hacia[c] for c in self.activas)
+        self.activas.add(nueva)
+
+        if self.es_exacto and len(self.activas) <= self.max_n_exacto:
+            casilla = self._ocupar_casilla(nueva)
+            num = self._recalcular(1 << casilla)
+        elif self.es_exacto:
+            # Se pasa del límite: seguimos desde la ruta óptima actual
+            ciudades = self._resultado[0][:-1]
+            ciudades.insert(_insercion_mas_barata(ciudades, nueva, d), nueva)
+            num = self._iniciar_heuristico(ciudades)
+        else:
+            self._agregar_vecino(nueva)
+            num = self._insertar_en_tour(nueva)
+
+        self._resultado = self._solucion(num)
+        medicion.fase("agregar_parada")
+        medicion.terminar(estados_expandidos=num)
+        return self._resultado
+
+    def quitar_parada(self, ciudad):
+        if ciudad == self.ciudad_inicio:
+            raise ValueError("No se puede quitar la ciudad de inicio")
+        if ciudad not in self.activas:
+            raise ValueError(f"La parada {ciudad} no está en la instancia")
+
+        medicion = INSTRUMENTACION.iniciar("incremental")
+        self.activas.discard(ciudad)
+        if self.es_exacto:
+            casilla = self.casilla_de.pop(ciudad)
+            self.ciudad_de_casilla[casilla] = None
+            num = 0
+        elif len(self.activas) <= self.max_n_exacto:
+            # Volvimos a un tamaño manejable: la tabla completa da la ruta óptima
+            self.tour = self.vecinos = None
+            num = self._iniciar_exacto()
+        else:
+            num = self._sacar_de_tour(ciudad)
+
+        self._resultado = self._solucion(num)
+        medicion.fase("quitar_parada")
+        medicion.terminar(estados_expandidos=num)
+        return self._resultado
+
+    def actualizar_distancia(self, a, b, valor, simetrica=False):
+        """
+        Cambia d[a][b] (y d[b][a] si simetrica=True), por ejemplo por un
+        cierre de vía.
+        """
+        medicion = INSTRUMENTACION.iniciar("incremental")
+        d = self.distancias
+        d[a][b] = valor
+        if simetrica:
+            d[b][a] = valor
+        if d[a][b] != d[b][a]:
+            self.simetrica = False
+
+        num = 0
+        if a in self.activas and b in self.activas and a != b:
+            if self.es_exacto:
+                vistas = set()
+                for x, y in ((a, b), (b, a)) if simetrica else ((a, b),):
+                    requeridas = self._casillas_afectadas(x, y)
+                    if requeridas is not None and requeridas not in vistas:
+                        vistas.add(requeridas)
+                        num += self._recalcular(requeridas)
+            else:
+                num = self._busqueda_local([a, b])
+
+        self._resultado = self._solucion(num)
+        medicion.fase("actualizar_distancia")
+        medicion.terminar(estados_expandidos=num)
+        return self._resultado
+
+    # ==========================
+    # MODO EXACTO (HELD-KARP CON CASILLAS)
+    # ==========================
+
+    def _iniciar_exacto(self):
+        self.costo = array('d', [0.0]) * (self.cap << self.cap)
+        self.padre = array('B', [0]) * (self.cap << self.cap)
+        self.ciudad_de_casilla = []
+        self.casilla_de = {}
+        for c in sorted(self.activas):
+            if c != self.ciudad_inicio:
+                self._ocupar_casilla(c)
+        return self._recalcular(0)
+
+    def _ocupar_casilla(self, ciudad):
+        libres = [b for b, c in enumerate(self.ciudad_de_casilla) if c is None]
+        if libres:
+            casilla = libres[0]
+            self.ciudad_de_casilla[casilla] = ciudad
+        else:
+            casilla = len(self.ciudad_de_casilla)
+            self.ciudad_de_casilla.append(ciudad)
+        self.casilla_de[ciudad] = casilla
+        return casilla
+
+    def _casillas_afectadas(self, a, b):
+        """
+        Máscara de casillas que debe contener un estado para poder usar la
+        arista a -> b, o None si ningún estado la usa (solo el cierre).
+        """
+        if b == self.ciudad_inicio:
+            return None
+        if a == self.ciudad_inicio:
+            return 1 << self.casilla_de[b]
+        return (1 << self.casilla_de[a]) | (1 << self.casilla_de[b])
+
+    def _recalcular(self, requeridas):
+        """
+        Recalcula, por capas, todos los estados cuyas máscaras contienen las
+        casillas de 'requeridas' (0 = toda la tabla). Los estados de capas
+        menores ya están al día cuando se usan. Devuelve cuántos se recalcularon.
+        """
+        d = self.distancias
+        costo, padre, cap = self.costo, self.padre, self.cap
+        inicio = self.ciudad_inicio
+        ciudad = self.ciudad_de_casilla
+        INF = float('inf')
+
+        fijas = [b for b in range(len(ciudad)) if requeridas >> b & 1]
+        resto = [b for b, c in enumerate(ciudad) if c is not None and not requeridas >> b & 1]
+        num = 0
+        for k in range(len(resto) + 1):
+            for combo in combinations(resto, k):
+                mask = requeridas
+                for b in combo:
+                    mask |= 1 << b
+                if mask == 0:
+                    continue
+                bits = fijas + list(combo)
+                base = mask * cap
+                for j in bits:
+                    cj = ciudad[j]
+                    if mask == 1 << j:
+                        costo[base + j] = d[inicio][cj]
+                        padre[base + j] = j
+                    else:
+                        base_anterior = (mask ^ (1 << j)) * cap
+                        mejor = INF
+                        mejor_i = 0
+                        for i in bits:
+                            if i != j:
+                                c = costo[base_anterior + i] + d[ciudad[i]][cj]
+                                if c < mejor:
+                                    mejor = c
+                                    mejor_i = i
+                        costo[base + j] = mejor
+                        padre[base + j] = mejor_i
+                    num += 1
+        return num
+
+    def _ruta_exacta(self):
+        d = self.distancias
+        inicio = self.ciudad_inicio
+        ciudad = self.ciudad_de_casilla
+        completa = 0
+        for b, c in enumerate(ciudad):
+            if c is not None:
+                completa |= 1 << b
+        if completa == 0:
+            return [inicio, inicio], d[inicio][inicio]
+
+        base = completa * self.cap
+        mejor_costo = float('inf')
+        ultima = 0
+        for j, c in enumerate(ciudad):
+            if c is not None:
+                total = self.costo[base + j] + d[c][inicio]
+                if total < mejor_costo:
+                    mejor_costo, ultima = total, j
+
+        camino = []
+        mask, j = completa, ultima
+        while mask:
+            camino.append(ciudad[j])
+            anterior = self.padre[mask * self.cap + j]
+            mask ^= 1 << j
+            j = anterior
+        camino.reverse()
+        ruta = [inicio] + camino + [inicio]
+        return ruta, _costo_ruta(ruta, d)
+
+    # ==========================
+    # MODO HEURÍSTICO (REPARACIÓN DEL TOUR)
+    # ==========================
+
+    def _ruta_vecino_mas_cercano(self):
+        d = self.distancias
+        pendientes = set(self.activas)
+        pendientes.discard(self.ciudad_inicio)
+        ruta = [self.ciudad_inicio]
+        while pendientes:
+            siguiente = min(pendientes, key=d[ruta[-1]].__getitem__)
+            pendientes.remove(siguiente)
+            ruta.append(siguiente)
+        return ruta
+
+    def _iniciar_heuristico(self, ciudades):
+        self.costo = self.padre = None
+        self.ciudad_de_casilla = []
+        self.casilla_de = {}
+        d = self.distancias
+        activas = sorted(self.activas)
+        self.vecinos = [[] for _ in range(len(d))]
+        for a in activas:
+            fila = d[a]
+            cercanas = sorted((c for c in activas if c != a), key=fila.__getitem__)
+            self.vecinos[a] = cercanas[:self.k_vecinos]
+        self.tour = Tour(ciudades)
+        return self._busqueda_local(None)
+
+    def _agregar_vecino(self, nueva):
+        d = self.distancias
+        self.vecinos.append([])
+        otras = [c for c in self.activas if c != nueva]
+        self.vecinos[nueva] = sorted(otras, key=d[nueva].__getitem__)[:self.k_vecinos]
+        for a in otras:
+            lista = self.vecinos[a]
+            fila = d[a]
+            if len(lista) < self.k_vecinos or fila[nueva] < fila[lista[-1]]:
+                lista.append(nueva)
+                lista.sort(key=fila.__getitem__)
+                del lista[self.k_vecinos:]
+
+    def _insertar_en_tour(self, nueva):
+        """
+        Inserción más barata de la parada nueva y búsqueda local alrededor.
+        """
+        ciudades = list(self.tour.ciudades)
+        i = _insercion_mas_barata(ciudades, nueva, self.distancias)
+        ciudades.insert(i, nueva)
+        self.tour = Tour(ciudades)
+        vecinas = [ciudades[i - 1], ciudades[(i + 1) % len(ciudades)]]
+        return self._busqueda_local([nueva] + vecinas)
+
+    def _sacar_de_tour(self, ciudad):
+        """
+        Une a los vecinos de la parada quitada y busca mejoras alrededor.
+        """
+        anterior, siguiente = self.tour.anterior(ciudad), self.tour.siguiente(ciudad)
+        ciudades = list(self.tour.ciudades)
+        ciudades.remove(ciudad)
+        self.tour = Tour(ciudades)
+        self.vecinos[ciudad] = []
+        for a in self.activas:
+            if ciudad in self.vecinos[a]:
+                self.vecinos[a].remove(ciudad)
+        return self._busqueda_local([anterior, siguiente])
+
+    def _busqueda_local(self, semillas):
+        """
+        2-opt desde las ciudades 'semillas' (todas si es None) más una pasada
+        de Or-opt; sin 2-opt ni tramos invertidos si la matriz no es simétrica.
+        """
+        tour = self.tour
+        if tour.n <= 3:
+            return 0
+        num = 0
+        if self.simetrica:
+            num += _dos_opt(tour, self.distancias, self.vecinos, semillas)
+        num += _or_opt(tour, self.distancias, self.vecinos, permitir_invertir=self.simetrica)
+        return num
+
+    # ==========================
+    # RESULTADO
+    # ==========================
+
+    def _solucion(self, num_actualizados):
+        if self.es_exacto:
+            ruta_indices, costo = self._ruta_exacta()
+        else:
+            ruta_indices = self.tour.ruta_desde(self.ciudad_inicio)
+            costo = _costo_ruta(ruta_indices, self.distancias)
+
+        if self.nombres_ciudades is not None:
+            ruta_nombres = [self.nombres_ciudades[i] for i in ruta_indices]
+        else:
+            ruta_nombres = ruta_indices
+
+        return ruta_indices, ruta_nombres, costo, self.es_exacto, num_actualizados
+
+
+def _insercion_mas_barata(ciudades, nueva, distancias):
+    """
+    Posición del tour cíclico 'ciudades' donde insertar 'nueva' alarga menos el ciclo.
+    """
+    mejor, mejor_i = None, 1
+    for i in range(len(ciudades)):
+        x, y = ciudades[i], ciudades[(i + 1) % len(ciudades)]
+        delta = distancias[x][nueva] + distancias[nueva][y] - distancias[x][y]
+        if mejor is None or delta < mejor:
+            mejor, mejor_i = delta, i + 1
+    return mejor_i
+
+
+def _costo_ruta(ruta, distancias):
+    costo = 0
+    for i in range(len(ruta) - 1):
+        costo += distancias[ruta[i]][ruta[i + 1]]
+    return costo
+
+
+if __name__ == "__main__":
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    def mostrar(titulo, resultado):
+        ruta_idx, ruta_nombres, costo, es_optimo, actualizados = resultado
+        print(f"{titulo}: {' -> '.join(ruta_nombres)}")
+        print(f"    costo {costo} km, {'óptima' if es_optimo else 'sin garantía'}, "
+              f"{actualizados} estados/movimientos actualizados")
+
+    print("=== Re-optimización incremental ===")
+    reoptimizador = ReoptimizadorIncremental(distancias, nombres_ciudades, 0)
+    mostrar("Inicial", reoptimizador.solucion())
+    mostrar("Agregar Chiclayo", reoptimizador.agregar_parada([770, 1700, 1400, 210, 270], nombre="Chiclayo"))
+    mostrar("Cierre Lima-Trujillo", reoptimizador.actualizar_distancia(0, 3, 900, simetrica=True))
+    mostrar("Cancelar Cusco", reoptimizador.quitar_parada(2))
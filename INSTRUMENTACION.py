@@ -0,0 +1,242 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# ==========================
+# MEDICIÓN DE UNA RESOLUCIÓN
+# ==========================
+
+
+class _MedicionNula:
+    """
+    Lo que devuelve iniciar() cuando la instrumentación está apagada:
+    todos los métodos no hacen nada, así que los solvers pagan solo un par
+    de llamadas vacías por resolución (nada dentro de los bucles calientes).
+    """
+
+    __slots__ = ()
+    activa = False
+
+    def fase(self, nombre):
+        pass
+
+    def terminar(self, **contadores):
+        pass
+
+
+_MEDICION_NULA = _MedicionNula()
+
+
+class Medicion:
+    """
+    Mide una resolución de un solver: tiempo de cada fase (desde la marca
+    anterior), contadores de esfuerzo y, si se pidió, pico de memoria.
+    Uso típico dentro de un solver:
+        medicion = INSTRUMENTACION.iniciar("held_karp")
+        ...búsqueda...
+        medicion.fase("busqueda")
+        ...reconstrucción...
+        medicion.fase("reconstruccion")
+        medicion.terminar(estados_expandidos=num_estados)
+    """
+
+    __slots__ = ("registro", "solver", "ultima_marca", "fases", "memoria_base")
+    activa = True
+
+    def __init__(self, registro, solver):
+        self.registro = registro
+        self.solver = solver
+        self.fases = []
+        self.memoria_base = 0
+        if registro.medir_memoria:
+            tracemalloc.reset_peak()
+            self.memoria_base = tracemalloc.get_traced_memory()[0]
+        self.ultima_marca = time.perf_counter()
+
+    def fase(self, nombre):
+        ahora = time.perf_counter()
+        self.fases.append((nombre, ahora - self.ultima_marca))
+        self.ultima_marca = ahora
+
+    def terminar(self, **contadores):
+        pico = None
+        if self.registro.medir_memoria:
+            pico = tracemalloc.get_traced_memory()[1] - self.memoria_base
+        self.registro._acumular(self.solver, self.fases, contadores, pico)
+
+
+# ==========================
+# REGISTRO DE MÉTRICAS
+# ==========================
+
+class Registro:
+    """
+    Acumula las métricas de todos los solvers del proceso.
+    - resoluciones[solver]           = número de resoluciones terminadas
+    - contadores[(solver, nombre)]   = suma de cada contador
+    - fases[(solver, fase)]          = segundos acumulados en esa fase
+    - memoria_pico[solver]           = mayor pico de memoria de una resolución
+                                       (bytes por encima de lo que había al empezar)
+    """
+
+    def __init__(self):
+        self.habilitado = False
+        self.medir_memoria = False
+        self._candado = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._candado:
+            self.resoluciones = {}
+            self.contadores = {}
+            self.fases = {}
+            self.memoria_pico = {}
+
+    def _acumular(self, solver, fases, contadores, pico):
+        with self._candado:
+            self.resoluciones[solver] = self.resoluciones.get(solver, 0) + 1
+            for nombre, segundos in fases:
+                clave = (solver, nombre)
+                self.fases[clave] = self.fases.get(clave, 0.0) + segundos
+            for nombre, valor in contadores.items():
+                clave = (solver, nombre)
+                self.contadores[clave] = self.contadores.get(clave, 0) + valor
+            if pico is not None and pico > self.memoria_pico.get(solver, 0):
+                self.memoria_pico[solver] = pico
+
+    def instantanea(self):
+        """
+        Copia de las métricas como diccionario serializable (JSON / entre procesos).
+        """
+        with self._candado:
+            return {
+                "resoluciones": dict(self.resoluciones),
+                "contadores": [[s, c, v] for (s, c), v in self.contadores.items()],
+                "fases": [[s, f, v] for (s, f), v in self.fases.items()],
+                "memoria_pico": dict(self.memoria_pico),
+            }
+
+    def fusionar(self, instantanea):
+        """
+        Suma una instantánea tomada en otro proceso (por ejemplo, un trabajador).
+        """
+        with self._candado:
+            for solver, cuenta in instantanea["resoluciones"].items():
+                self.resoluciones[solver] = self.resoluciones.get(solver, 0) + cuenta
+            for solver, nombre, valor in instantanea["contadores"]:
+                self.contadores[(solver, nombre)] = self.contadores.get((solver, nombre), 0) + valor
+            for solver, nombre, valor in instantanea["fases"]:
+                self.fases[(solver, nombre)] = self.fases.get((solver, nombre), 0.0) + valor
+            for solver, pico in instantanea["memoria_pico"].items():
+                if pico > self.memoria_pico.get(solver, 0):
+                    self.memoria_pico[solver] = pico
+
+
+_REGISTRO = Registro()
+
+
+# ==========================
+# API DEL MÓDULO
+# ==========================
+
+def habilitar(memoria=False):
+    """
+    Enciende la instrumentación. Con memoria=True también se mide el pico
+    de memoria de cada resolución con tracemalloc (más lento).
+    """
+    _REGISTRO.habilitado = True
+    _REGISTRO.medir_memoria = memoria
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def deshabilitar():
+    if _REGISTRO.medir_memoria and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _REGISTRO.habilitado = False
+    _REGISTRO.medir_memoria = False
+
+
+def esta_habilitado():
+    return _REGISTRO.habilitado
+
+
+def iniciar(solver):
+    """
+    Empieza a medir una resolución del solver indicado. Con la
+    instrumentación apagada devuelve una medición nula que no hace nada.
+    """
+    if not _REGISTRO.habilitado:
+        return _MEDICION_NULA
+    return Medicion(_REGISTRO, solver)
+
+
+def registrar(solver, **contadores):
+    """
+    Suma contadores sueltos (sin fases), por ejemplo aciertos de la cache.
+    """
+    if _REGISTRO.habilitado:
+        _REGISTRO._acumular(solver, (), contadores, None)
+
+
+def reiniciar():
+    _REGISTRO.reiniciar()
+
+
+def instantanea():
+    return _REGISTRO.instantanea()
+
+
+def fusionar(datos):
+    _REGISTRO.fusionar(datos)
+
+
+def exportar_json():
+    return json.dumps(_REGISTRO.instantanea(), indent=2, ensure_ascii=False)
+
+
+def _etiquetas(**pares):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pares.items()) + "}"
+
+
+def exportar_prometheus():
+    """
+    Métricas en el formato de texto de Prometheus.
+    """
+    datos = _REGISTRO.instantanea()
+    lineas = [
+        "# HELP tsp_resoluciones_total Resoluciones terminadas por solver.",
+        "# TYPE tsp_resoluciones_total counter",
+    ]
+    for solver, cuenta in sorted(datos["resoluciones"].items()):
+        lineas.append(f"tsp_resoluciones_total{_etiquetas(solver=solver)} {cuenta}")
+
+    lineas += [
+        "# HELP tsp_contador_total Contadores de esfuerzo (estados, podas, cache...).",
+        "# TYPE tsp_contador_total counter",
+    ]
+    for solver, nombre, valor in sorted(datos["contadores"]):
+        lineas.append(f"tsp_contador_total{_etiquetas(solver=solver, contador=nombre)} {valor}")
+
+    lineas += [
+        "# HELP tsp_fase_segundos_total Tiempo acumulado en cada fase del solver.",
+        "# TYPE tsp_fase_segundos_total counter",
+    ]
+    for solver, fase, valor in sorted(datos["fases"]):
+        lineas.append(f"tsp_fase_segundos_total{_etiquetas(solver=solver, fase=fase)} {valor:.9f}")
+
+    lineas += [
+        "# HELP tsp_memoria_pico_bytes Mayor pico de memoria de una resolución (tracemalloc).",
+        "# TYPE tsp_memoria_pico_bytes gauge",
+    ]
+    for solver, pico in sorted(datos["memoria_pico"].items()):
+        lineas.append(f"tsp_memoria_pico_bytes{_etiquetas(solver=solver)} {pico}")
+
+    return "\n".join(lineas) + "\n"
+
+
+# Se puede encender sin tocar código: TSP_METRICAS=1 (o TSP_METRICAS=memoria)
+if os.environ.get("TSP_METRICAS"):
+    habilitar(memoria=os.environ["TSP_METRICAS"] == "memoria")
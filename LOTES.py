@@ -0,0 +1,280 @@
+import atexit
+import concurrent.futures
+import os
+from itertools import islice
+
+import INSTRUMENTACION
+from FUERZA_BRUTA import tsp_fuerza_bruta_incremental
+from HELD_KARP import np, tsp_held_karp, tsp_held_karp_vectorizado
+from HEURISTICAS import tsp_heuristico
+from RESULTADO import ResultadoRuta, TablaCiudades
+
+# Límites por defecto para elegir solver según el número de ciudades
+MAX_N_FUERZA_BRUTA = 8
+MAX_N_HELD_KARP = 16 if np is not None else 13
+
+# Instancias pequeñas que viajan juntas en una sola tarea (menos ida y vuelta al pool)
+INSTANCIAS_POR_TAREA = 32
+
+# Tareas enviadas al pool por proceso antes de esperar resultados (lee la
+# entrada de a poco, así un generador infinito no llena la memoria)
+TAREAS_POR_PROCESO = 4
+
+SOLVERS = {
+    "fuerza_bruta": tsp_fuerza_bruta_incremental,
+    "held_karp": tsp_held_karp_vectorizado if np is not None else tsp_held_karp,
+    "heuristico": tsp_heuristico,
+}
+
+
+def elegir_solver(n, max_n_fuerza_bruta=MAX_N_FUERZA_BRUTA, max_n_held_karp=MAX_N_HELD_KARP):
+    """
+    Nombre del solver (clave de SOLVERS) para una instancia de n ciudades:
+    fuerza bruta hasta max_n_fuerza_bruta, Held-Karp hasta max_n_held_karp
+    y heurístico por encima.
+    """
+    if n <= max_n_fuerza_bruta:
+        return "fuerza_bruta"
+    if n <= max_n_held_karp:
+        return "held_karp"
+    return "heuristico"
+
+
+# ==========================
+# TRABAJO DE CADA PROCESO
+# ==========================
+
+def _calentar_trabajador():
+    """
+    Resuelve una instancia mínima con cada solver para que la primera tarea
+    real no pague imports perezosos ni la primera asignación de numpy.
+    Luego vacía las métricas: las heredadas del padre y las del calentamiento
+    no deben volver al padre con la primera tarea.
+    """
+    distancias = [[0, 1, 2], [1, 0, 1], [2, 1, 0]]
+    for solver in SOLVERS.values():
+        solver(distancias)
+    INSTRUMENTACION.reiniciar()
+
+
+def _resolver_paquete(paquete, medir, compacto=False):
+    """
+    Resuelve en orden las instancias del paquete, cada una con el solver
+    ya elegido. Un error en una instancia no afecta a las demás.
+    Con compacto=True cada resultado vuelve como los bytes de un
+    ResultadoRuta (sin nombres), que viajan al proceso padre mucho más
+    rápido que la tupla con sus dos listas.
+    Devuelve (resultados, métricas del trabajador o None).
+    """
+    if medir and not INSTRUMENTACION.esta_habilitado():
+        INSTRUMENTACION.habilitar()
+
+    resultados = []
+    for id_instancia, nombre_solver, distancias, nombres_ciudades, ciudad_inicio in paquete:
+        try:
+            resultado = SOLVERS[nombre_solver](distancias, nombres_ciudades, ciudad_inicio)
+            if compacto:
+                resultado = ResultadoRuta.desde_tupla(resultado).a_bytes()
+            resultados.append((id_instancia, nombre_solver, resultado, None))
+        except Exception as error:
+            resultados.append((id_instancia, nombre_solver, None, error))
+
+    metricas = None
+    if medir:
+        metricas = INSTRUMENTACION.instantanea()
+        INSTRUMENTACION.reiniciar()
+    return resultados, metricas
+
+
+def _normalizar(instancia):
+    """
+    Acepta (id, distancias), (id, distancias, nombres) o
+    (id, distancias, nombres, ciudad_inicio).
+    """
+    id_instancia, distancias, *resto = instancia
+    nombres_ciudades = resto[0] if len(resto) > 0 else None
+    ciudad_inicio = resto[1] if len(resto) > 1 else 0
+    return id_instancia, distancias, nombres_ciudades, ciudad_inicio
+
+
+# ==========================
+# RESOLVEDOR DE LOTES
+# ==========================
+
+class ResolvedorLotes:
+    """
+    Resuelve muchas instancias independientes sobre un pool de procesos que
+    se crea una sola vez y queda caliente entre lotes:
+        with ResolvedorLotes() as resolvedor:
+            for id_instancia, solver, resultado, error in resolvedor.resolver(instancias):
+                ...
+    Cada resultado es la misma tupla que devuelve el solver elegido; si el
+    solver falló, resultado es None y error trae la excepción.
+    Con resolver(instancias, compacto=True) cada resultado es un
+    ResultadoRuta (índices en un arreglo y nombres de una TablaCiudades
+    compartida, armados solo si se piden), que se desempaqueta igual que la
+    tupla y conviene cuando se resuelven miles de instancias.
+    Con num_procesos=1 todo corre en el proceso actual.
+    """
+
+    def __init__(self, num_procesos=None, max_n_fuerza_bruta=MAX_N_FUERZA_BRUTA,
+                 max_n_held_karp=MAX_N_HELD_KARP, instancias_por_tarea=INSTANCIAS_POR_TAREA):
+        if num_procesos is None:
+            num_procesos = os.cpu_count() or 1
+        self.num_procesos = num_procesos
+        self.max_n_fuerza_bruta = max_n_fuerza_bruta
+        self.max_n_held_karp = max_n_held_karp
+        self.instancias_por_tarea = instancias_por_tarea
+        self._executor = None
+        if num_procesos > 1:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_procesos,
+                initializer=_calentar_trabajador,
+            )
+
+    def cerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _paquetes(self, instancias):
+        """
+        Agrupa las instancias en tareas: las de fuerza bruta (muy rápidas)
+        de a instancias_por_tarea, las demás de a una.
+        """
+        pequenas = []
+        for instancia in instancias:
+            id_instancia, distancias, nombres_ciudades, ciudad_inicio = _normalizar(instancia)
+            nombre_solver = elegir_solver(len(distancias), self.max_n_fuerza_bruta, self.max_n_held_karp)
+            tarea = (id_instancia, nombre_solver, distancias, nombres_ciudades, ciudad_inicio)
+            if nombre_solver == "fuerza_bruta":
+                pequenas.append(tarea)
+                if len(pequenas) == self.instancias_por_tarea:
+                    yield pequenas
+                    pequenas = []
+            else:
+                yield [tarea]
+        if pequenas:
+            yield pequenas
+
+    def resolver(self, instancias, compacto=False):
+        """
+        Generador: recibe un iterable (o flujo) de instancias y entrega
+        (id_instancia, nombre_solver, resultado, error) a medida que terminan,
+        no en el orden de entrada. Con compacto=True, resultado es un
+        ResultadoRuta; los nombres de cada instancia (lista o TablaCiudades)
+        no viajan a los procesos: se enganchan al volver.
+        """
+        medir = INSTRUMENTACION.esta_habilitado()
+        paquetes = self._paquetes(instancias)
+
+        if self._executor is None:
+            for paquete in paquetes:
+                if not compacto:
+                    resultados, _ = _resolver_paquete(paquete, False)
+                    yield from resultados
+                    continue
+                tablas = _tablas(paquete)
+                resultados, _ = _resolver_paquete(_sin_nombres(paquete), False)
+                for (id_instancia, nombre_solver, resultado, error), tabla in zip(resultados, tablas):
+                    if resultado is not None:
+                        resultado = ResultadoRuta.desde_tupla(resultado, tabla)
+                    yield id_instancia, nombre_solver, resultado, error
+            return
+
+        # Con compacto, los nombres de cada paquete se quedan aquí hasta que vuelve
+        tablas_de = {}
+
+        def enviar(paquete):
+            if not compacto:
+                return self._executor.submit(_resolver_paquete, paquete, medir)
+            futuro = self._executor.submit(_resolver_paquete, _sin_nombres(paquete), medir, True)
+            tablas_de[futuro] = _tablas(paquete)
+            return futuro
+
+        limite = self.num_procesos * TAREAS_POR_PROCESO
+        pendientes = {enviar(paquete) for paquete in islice(paquetes, limite)}
+        while pendientes:
+            listas, pendientes = concurrent.futures.wait(
+                pendientes, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for paquete in islice(paquetes, len(listas)):
+                pendientes.add(enviar(paquete))
+            for futuro in listas:
+                resultados, metricas = futuro.result()
+                if metricas is not None:
+                    INSTRUMENTACION.fusionar(metricas)
+                if not compacto:
+                    yield from resultados
+                    continue
+                for (id_instancia, nombre_solver, datos, error), tabla in zip(resultados, tablas_de.pop(futuro)):
+                    resultado = None if datos is None else ResultadoRuta.desde_bytes(datos, tabla)
+                    yield id_instancia, nombre_solver, resultado, error
+
+
+def _tablas(paquete):
+    """
+    TablaCiudades (o None) de cada instancia del paquete.
+    """
+    return [None if tarea[3] is None else TablaCiudades.compartida(tarea[3]) for tarea in paquete]
+
+
+def _sin_nombres(paquete):
+    return [(id_instancia, nombre_solver, distancias, None, ciudad_inicio)
+            for id_instancia, nombre_solver, distancias, _, ciudad_inicio in paquete]
+
+
+# Resolvedor compartido por resolver_lote(): se crea en la primera llamada
+_RESOLVEDOR = None
+
+
+def _cerrar_resolvedor():
+    if _RESOLVEDOR is not None:
+        _RESOLVEDOR.cerrar()
+
+
+atexit.register(_cerrar_resolvedor)
+
+
+def resolver_lote(instancias, compacto=False):
+    """
+    Igual que ResolvedorLotes().resolver(instancias, compacto), pero reutiliza
+    un mismo pool (con todos los núcleos) en todas las llamadas del proceso.
+    """
+    global _RESOLVEDOR
+    if _RESOLVEDOR is None:
+        _RESOLVEDOR = ResolvedorLotes()
+    return _RESOLVEDOR.resolver(instancias, compacto)
+
+
+if __name__ == "__main__":
+    import time
+
+    from BENCHMARK import instancia_euclidiana
+
+    # Un ciclo de despacho: rutas de conductores de distintos tamaños
+    instancias = [
+        (f"conductor-{i:03d}", instancia_euclidiana(n, semilla=i))
+        for i, n in enumerate([5, 6, 7, 8] * 40 + [10, 12, 14] * 6 + [60, 120] * 2)
+    ]
+
+    with ResolvedorLotes() as resolvedor:
+        print(f"=== Lote de {len(instancias)} instancias en {resolvedor.num_procesos} procesos ===")
+        for ciclo, compacto in ((1, False), (2, False), (3, True)):
+            inicio = time.perf_counter()
+            por_solver = {}
+            errores = 0
+            for id_instancia, nombre_solver, resultado, error in resolvedor.resolver(instancias, compacto):
+                if error is not None:
+                    errores += 1
+                    continue
+                por_solver[nombre_solver] = por_solver.get(nombre_solver, 0) + 1
+            tiempo = time.perf_counter() - inicio
+            formato = "ResultadoRuta" if compacto else "tuplas"
+            print(f"Ciclo {ciclo} ({formato}): {tiempo:.3f} s  {por_solver}  errores: {errores}")
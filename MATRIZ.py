@@ -0,0 +1,377 @@
+import ast
+import math
+from collections import OrderedDict
+import mmap
+import struct
+import sys
+from array import array
+
+# ==========================
+# DATOS DE EJEMPLO (CIUDADES DEL PERÚ)
+# ==========================
+
+CIUDADES_PERU = ("Lima", "Arequipa", "Cusco", "Trujillo", "Piura")
+
+# (latitud, longitud) en grados
+COORDENADAS_PERU = (
+    (-12.0464, -77.0428),  # Lima
+    (-16.4090, -71.5375),  # Arequipa
+    (-13.5320, -71.9675),  # Cusco
+    ( -8.1091, -79.0215),  # Trujillo
+    ( -5.1945, -80.6328),  # Piura
+)
+
+# Distancias por carretera (km)
+DISTANCIAS_PERU = (
+    (   0, 1000, 1100,  560,  980),  # Lima
+    (1000,    0,  510, 1600, 1850),  # Arequipa
+    (1100,  510,    0, 1300, 1500),  # Cusco
+    ( 560, 1600, 1300,    0,  410),  # Trujillo
+    ( 980, 1850, 1500,  410,    0),  # Piura
+)
+
+RADIO_TIERRA_KM = 6371.0
+
+# Cabecera del formato binario propio: firma, versión, tipo ('i' o 'f'), n
+_CABECERA = struct.Struct("<4sHcxI4x")
+_FIRMA = b"TSPM"
+_VERSION = 1
+
+# Tipos de numpy (.npy) que se pueden mapear sin copiar
+_DTYPES_NPY = {"<i4": 'i', "<f4": 'f'}
+_DTYPES_NPY_CONVERTIBLES = {"<i8": ('q', 'i'), "<f8": ('d', 'f')}
+
+
+def haversine(punto_a, punto_b):
+    """
+    Distancia en km sobre la superficie terrestre entre dos (lat, lon) en grados.
+    """
+    lat1, lon1 = map(math.radians, punto_a)
+    lat2, lon2 = map(math.radians, punto_b)
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(math.sqrt(h))
+
+
+_METRICAS = {
+    "euclidiana": math.dist,
+    "haversine": haversine,
+}
+
+
+def _reconstruir(n, tipo, datos):
+    return MatrizDistancias(n, tipo, array(tipo, datos))
+
+
+# ==========================
+# MATRIZ DE DISTANCIAS COMPACTA
+# ==========================
+
+class MatrizDistancias:
+    """
+    Matriz n x n guardada en un solo búfer contiguo int32 ('i') o float32
+    ('f'): un array de Python o un archivo mapeado en memoria. Cada fila es
+    una memoryview sobre ese búfer, así que matriz[a][b] funciona igual que
+    con listas anidadas y los solvers la aceptan sin convertirla.
+    Con numpy, numpy.asarray(matriz) es una vista del mismo búfer (sin copia).
+    Las matrices creadas desde coordenadas calculan cada fila la primera vez
+    que se pide.
+    """
+
+    __slots__ = ("n", "tipo", "_datos", "_filas", "_mapa", "_origen", "_coordenadas", "_metrica",
+                 "_max_filas", "_recientes")
+
+    def __init__(self, n, tipo, datos, mapa=None, origen=None):
+        if len(datos) != n * n:
+            raise ValueError(f"Se esperaban {n * n} valores y hay {len(datos)}")
+        self.n = n
+        self.tipo = tipo
+        self._datos = datos
+        self._mapa = mapa
+        self._origen = origen
+        self._coordenadas = None
+        self._metrica = None
+        self._max_filas = None
+        self._recientes = None
+        vista = memoryview(datos)
+        self._filas = [vista[a * n:(a + 1) * n] for a in range(n)]
+
+    # ---------- acceso ----------
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, a):
+        fila = self._filas[a]
+        if fila is None:
+            fila = self._calcular_fila(a)
+        elif self._recientes is not None:
+            self._recientes.move_to_end(a)
+        return fila
+
+    def __iter__(self):
+        for a in range(self.n):
+            yield self[a]
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+
+        self.materializar()
+        matriz = np.frombuffer(self._datos, dtype=np.int32 if self.tipo == 'i' else np.float32)
+        matriz = matriz.reshape(self.n, self.n)
+        if dtype is not None:
+            matriz = matriz.astype(dtype, copy=False)
+        return matriz
+
+    def __reduce__(self):
+        # Para pasarla a otros procesos: las de archivo se vuelven a mapear,
+        # las perezosas se vuelven a calcular y el resto viaja como bytes
+        if self._origen is not None:
+            return self._origen
+        if self._coordenadas is not None:
+            return (MatrizDistancias.desde_coordenadas,
+                    (self._coordenadas, self._metrica, self.tipo, self._max_filas))
+        return (_reconstruir, (self.n, self.tipo, bytes(self._datos)))
+
+    def tolist(self):
+        return [list(self[a]) for a in range(self.n)]
+
+    @property
+    def simetrica(self):
+        """
+        True si se sabe sin recorrerla que es simétrica (las creadas desde
+        coordenadas); None si hay que revisarla.
+        """
+        return True if self._coordenadas is not None else None
+
+    def maximo(self):
+        return max((max(self[a]) for a in range(self.n)), default=0)
+
+    # ---------- matrices desde coordenadas ----------
+
+    @classmethod
+    def desde_coordenadas(cls, puntos, metrica="euclidiana", tipo='f', max_filas=None):
+        """
+        Matriz perezosa a partir de coordenadas: "euclidiana" para (x, y) o
+        "haversine" para (lat, lon) en grados (km). Con tipo='i' se redondea.
+        Con max_filas solo se guardan las max_filas filas usadas más
+        recientemente (LRU): la memoria queda en max_filas * n valores en
+        lugar de n * n, a cambio de recalcular las filas que se descartan.
+        """
+        if metrica not in _METRICAS:
+            raise ValueError(f"Métrica desconocida: {metrica!r}")
+        matriz = cls.__new__(cls)
+        matriz.n = len(puntos)
+        matriz.tipo = tipo
+        matriz._datos = None
+        matriz._mapa = None
+        matriz._origen = None
+        matriz._coordenadas = tuple(tuple(p) for p in puntos)
+        matriz._metrica = metrica
+        matriz._filas = [None] * matriz.n
+        matriz._max_filas = max_filas
+        matriz._recientes = OrderedDict() if max_filas is not None else None
+        return matriz
+
+    def _calcular_fila(self, a):
+        distancia = _METRICAS[self._metrica]
+        puntos = self._coordenadas
+        origen = puntos[a]
+        if self.tipo == 'i':
+            fila = array('i', (0 if b == a else round(distancia(origen, puntos[b])) for b in range(self.n)))
+        else:
+            fila = array('f', (0.0 if b == a else distancia(origen, puntos[b]) for b in range(self.n)))
+        self._filas[a] = fila
+        if self._recientes is not None:
+            self._recientes[a] = None
+            if len(self._recientes) > self._max_filas:
+                vieja, _ = self._recientes.popitem(last=False)
+                self._filas[vieja] = None
+        return fila
+
+    def materializar(self):
+        """
+        Calcula todas las filas pendientes y las junta en un solo búfer.
+        """
+        if self._datos is not None:
+            return self
+        datos = array(self.tipo)
+        for a in range(self.n):
+            datos.extend(self[a])
+        vista = memoryview(datos)
+        self._datos = datos
+        self._filas = [vista[a * self.n:(a + 1) * self.n] for a in range(self.n)]
+        self._recientes = None
+        return self
+
+    # ---------- cargar y guardar ----------
+
+    @classmethod
+    def desde_lista(cls, distancias, tipo=None):
+        """
+        Copia una matriz de listas anidadas. Sin 'tipo' se usa int32 si todos
+        los valores son enteros y float32 si no.
+        """
+        n = len(distancias)
+        if tipo is None:
+            tipo = 'i'
+            for fila in distancias:
+                if not all(isinstance(valor, int) for valor in fila):
+                    tipo = 'f'
+                    break
+        datos = array(tipo)
+        for fila in distancias:
+            if len(fila) != n:
+                raise ValueError("La matriz de distancias debe ser cuadrada")
+            datos.extend(fila)
+        return cls(n, tipo, datos)
+
+    @classmethod
+    def desde_csv(cls, ruta_archivo, separador=",", tipo=None):
+        """
+        Una fila de la matriz por línea; se ignoran líneas vacías y las que
+        empiezan con '#'.
+        """
+        with open(ruta_archivo, encoding="utf-8") as f:
+            lineas = [linea for linea in f if linea.strip() and not linea.startswith("#")]
+        n = len(lineas)
+        if tipo in (None, 'i'):
+            try:
+                datos = array('i')
+                for linea in lineas:
+                    datos.extend(map(int, linea.split(separador)))
+                return cls(n, 'i', datos)
+            except ValueError:
+                if tipo == 'i':
+                    raise
+        datos = array('f')
+        for linea in lineas:
+            datos.extend(map(float, linea.split(separador)))
+        return cls(n, 'f', datos)
+
+    def guardar_csv(self, ruta_archivo, separador=","):
+        with open(ruta_archivo, "w", encoding="utf-8") as f:
+            for a in range(self.n):
+                f.write(separador.join(map(str, self[a])) + "\n")
+
+    @classmethod
+    def desde_binario(cls, ruta_archivo):
+        """
+        Abre un archivo escrito con guardar_binario() mapeándolo en memoria:
+        no se lee ni se copia nada hasta que se usan las distancias.
+        """
+        with open(ruta_archivo, "rb") as f:
+            firma, version, tipo, n = _CABECERA.unpack(f.read(_CABECERA.size))
+            if firma != _FIRMA or version != _VERSION:
+                raise ValueError(f"{ruta_archivo} no es una matriz de distancias válida")
+            tipo = tipo.decode("ascii")
+            return cls._mapear(f, _CABECERA.size, n, tipo, (cls.desde_binario, (ruta_archivo,)))
+
+    def guardar_binario(self, ruta_archivo):
+        self.materializar()
+        with open(ruta_archivo, "wb") as f:
+            f.write(_CABECERA.pack(_FIRMA, _VERSION, self.tipo.encode("ascii"), self.n))
+            f.write(self._bytes_little_endian())
+
+    @classmethod
+    def desde_npy(cls, ruta_archivo):
+        """
+        Abre un .npy de numpy (no hace falta tener numpy instalado).
+        int32/float32 little-endian en orden C se mapean sin copiar;
+        int64/float64 se convierten a int32/float32.
+        """
+        with open(ruta_archivo, "rb") as f:
+            if f.read(6) != b"\x93NUMPY":
+                raise ValueError(f"{ruta_archivo} no es un archivo .npy")
+            version = f.read(2)[0]
+            largo = struct.unpack("<H" if version == 1 else "<I", f.read(2 if version == 1 else 4))[0]
+            cabecera = ast.literal_eval(f.read(largo).decode("latin-1"))
+            inicio_datos = f.tell()
+            descr, forma = cabecera["descr"], cabecera["shape"]
+            if len(forma) != 2 or forma[0] != forma[1] or cabecera["fortran_order"]:
+                raise ValueError("Se esperaba una matriz cuadrada en orden C")
+            n = forma[0]
+            if descr in _DTYPES_NPY:
+                return cls._mapear(f, inicio_datos, n, _DTYPES_NPY[descr], (cls.desde_npy, (ruta_archivo,)))
+            if descr not in _DTYPES_NPY_CONVERTIBLES:
+                raise ValueError(f"Tipo de datos no soportado en .npy: {descr}")
+            tipo_archivo, tipo = _DTYPES_NPY_CONVERTIBLES[descr]
+            leidos = array(tipo_archivo)
+            leidos.fromfile(f, n * n)
+        if sys.byteorder != "little":
+            leidos.byteswap()
+        return cls(n, tipo, array(tipo, leidos))
+
+    def guardar_npy(self, ruta_archivo):
+        self.materializar()
+        descr = "<i4" if self.tipo == 'i' else "<f4"
+        cabecera = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({self.n}, {self.n}), }}"
+        # Relleno para que los datos empiecen alineados a 64 bytes, como hace numpy
+        relleno = 64 - (10 + len(cabecera) + 1) % 64
+        cabecera = (cabecera + " " * relleno + "\n").encode("latin-1")
+        with open(ruta_archivo, "wb") as f:
+            f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(cabecera)) + cabecera)
+            f.write(self._bytes_little_endian())
+
+    @classmethod
+    def _mapear(cls, archivo, desplazamiento, n, tipo, origen):
+        if n == 0:
+            return cls(0, tipo, array(tipo), origen=origen)
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        tamano = n * n * array(tipo).itemsize
+        if len(mapa) < desplazamiento + tamano:
+            raise ValueError("El archivo es más corto que la matriz que declara")
+        datos = memoryview(mapa)[desplazamiento:desplazamiento + tamano].cast(tipo)
+        if sys.byteorder != "little":
+            datos = array(tipo, datos)
+            datos.byteswap()
+        return cls(n, tipo, datos, mapa=mapa, origen=origen)
+
+    def _bytes_little_endian(self):
+        if sys.byteorder == "little":
+            return memoryview(self._datos).cast('B')
+        datos = array(self.tipo, self._datos)
+        datos.byteswap()
+        return datos.tobytes()
+
+
+def ejemplo_peru(tipo='i'):
+    """
+    Devuelve (nombres_ciudades, matriz) con las distancias por carretera
+    entre las cinco ciudades de ejemplo.
+    """
+    return list(CIUDADES_PERU), MatrizDistancias.desde_lista(DISTANCIAS_PERU, tipo)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    from FUERZA_BRUTA import tsp_fuerza_bruta
+    from MEMOIZACION import tsp_top_down_memo
+    from RECURSION import tsp_recursivo_sin_memo
+
+    nombres_ciudades, matriz = ejemplo_peru()
+    print("=== Matriz de distancias compacta ===")
+    for solver in (tsp_fuerza_bruta, tsp_recursivo_sin_memo, tsp_top_down_memo):
+        ruta_idx, ruta_nombres, costo = solver(matriz, nombres_ciudades, 0)[:3]
+        print(f"{solver.__name__:24s} {' -> '.join(ruta_nombres)}  {costo} km")
+
+    en_linea_recta = MatrizDistancias.desde_coordenadas(COORDENADAS_PERU, "haversine", tipo='i')
+    print("Lima -> Cusco en línea recta:", en_linea_recta[0][2], "km (por carretera:", matriz[0][2], "km)")
+
+    # Carga de una matriz grande desde disco
+    n = 5000
+    grande = MatrizDistancias(n, 'i', array('i', range(n)) * n)
+    with tempfile.TemporaryDirectory() as carpeta:
+        for guardar, cargar, nombre in (
+            (grande.guardar_binario, MatrizDistancias.desde_binario, "matriz.bin"),
+            (grande.guardar_npy, MatrizDistancias.desde_npy, "matriz.npy"),
+        ):
+            ruta_archivo = os.path.join(carpeta, nombre)
+            guardar(ruta_archivo)
+            inicio = time.perf_counter()
+            cargada = cargar(ruta_archivo)
+            tiempo = time.perf_counter() - inicio
+            print(f"Cargar {n} x {n} desde {nombre}: {tiempo * 1000:.1f} ms (d[4321][1234] = {cargada[4321][1234]})")
+            del cargada
@@ -1,18 +1,9 @@
-nombres_ciudades = [
-    "Lima",      # 0
-    "Arequipa",  # 1
-    "Cusco",     # 2
-    "Trujillo",  # 3
-    "Piura"      # 4
-]
-
-distancias = [
-    [   0, 1000, 1100,  560,  980],  # Lima
-    [1000,    0,  510, 1600, 1850],  # Arequipa
-    [1100,  510,    0, 1300, 1500],  # Cusco
-    [ 560, 1600, 1300,    0,  410],  # Trujillo
-    [ 980, 1850, 1500,  410,    0]   # Piura
-]
+import INSTRUMENTACION
+from COTAS import aportes_por_ciudad
+from MATRIZ import CIUDADES_PERU, DISTANCIAS_PERU, ejemplo_peru
+
+nombres_ciudades = list(CIUDADES_PERU)
+distancias = [list(fila) for fila in DISTANCIAS_PERU]
 
 ciudad_inicio = 0  # Lima
 
@@ -23,6 +14,7 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
     visited_mask es un entero donde cada bit indica si una ciudad ya fue visitada.
     """
     n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("top_down_memo")
     ALL_VISITED = (1 << n) - 1  # ejemplo: n=4 -> 1111 (binario)
 
     # memo[(ciudad_actual, visited_mask)] = mejor costo para completar el viaje
@@ -53,18 +45,19 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
         mejor_costo = float('inf')
         mejor_siguiente = None
 
-        # Probar ir a cualquier ciudad no visitada
-        for siguiente in range(n):
-            # Si el bit de 'siguiente' está apagado, no se ha visitado
-            if (visited_mask & (1 << siguiente)) == 0:
-                nuevo_mask = visited_mask | (1 << siguiente)
-                costo_ir = distancias[ciudad_actual][siguiente]
-                costo_restante = dp(siguiente, nuevo_mask)
-                costo_total = costo_ir + costo_restante
+        # Probar ir a cualquier ciudad no visitada: se recorren solo los bits
+        # apagados, extrayendo el más bajo (como SUBCONJUNTOS.bits_apagados)
+        fila = distancias[ciudad_actual]
+        libres = ALL_VISITED ^ visited_mask
+        while libres:
+            bajo = libres & -libres
+            libres ^= bajo
+            siguiente = bajo.bit_length() - 1
+            costo_total = fila[siguiente] + dp(siguiente, visited_mask | bajo)
 
-                if costo_total < mejor_costo:
-                    mejor_costo = costo_total
-                    mejor_siguiente = siguiente
+            if costo_total < mejor_costo:
+                mejor_costo = costo_total
+                mejor_siguiente = siguiente
 
         memo[clave] = mejor_costo
         decision[clave] = mejor_siguiente
@@ -73,6 +66,7 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
     # Llamada inicial: solo la ciudad de inicio está visitada
     visited_mask_inicial = (1 << ciudad_inicio)
     mejor_costo = dp(ciudad_inicio, visited_mask_inicial)
+    medicion.fase("busqueda")
 
     # Reconstrucción de la ruta óptima usando 'decision'
     ruta_indices = [ciudad_inicio]
@@ -88,32 +82,187 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
 
     # Volvemos al origen
     ruta_indices.append(ciudad_inicio)
+    medicion.fase("reconstruccion")
 
     # Convertimos a nombres
     if nombres_ciudades is not None:
         ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
     else:
         ruta_nombres = ruta_indices
+    medicion.fase("nombres")
+
+    if medicion.activa:
+        # Sin contador dentro de dp: cada estado no final llama a dp una vez
+        # por ciudad no visitada; las llamadas que no son estados nuevos son aciertos
+        llamadas = 1
+        for _, mask in memo:
+            if mask != ALL_VISITED:
+                llamadas += n - mask.bit_count()
+        medicion.terminar(
+            estados_expandidos=len(memo),
+            aciertos_cache=llamadas - len(memo),
+            fallos_cache=len(memo),
+        )
 
     return ruta_indices, ruta_nombres, mejor_costo
 
 
+# ==========================
+# DP CON PODA (COTAS Y SIMETRÍA)
+# ==========================
+
+def _camino_hasta(padre, clave, n, ciudad_inicio):
+    """
+    Camino [ciudad_inicio, ..., j] guardado en 'padre' para el estado
+    clave = visited_mask * n + j.
+    """
+    mask_inicial = 1 << ciudad_inicio
+    visited_mask, ciudad = divmod(clave, n)
+    camino = []
+    while visited_mask != mask_inicial:
+        camino.append(ciudad)
+        anterior = padre[clave]
+        visited_mask ^= 1 << ciudad
+        ciudad = anterior
+        clave = visited_mask * n + ciudad
+    camino.append(ciudad_inicio)
+    camino.reverse()
+    return camino
+
+
+def tsp_top_down_memo_podado(distancias, nombres_ciudades=None, ciudad_inicio=0, ruta_inicial=None):
+    """
+    Misma DP sobre estados (ciudad_actual, visited_mask), pero solo se
+    materializan los estados que todavía pueden mejorar la mejor ruta conocida.
+    - Cota superior: costo de ruta_inicial (por defecto, la de tsp_heuristico).
+    - Los estados se generan hacia adelante, por capas (número de ciudades
+      visitadas), guardando el costo del mejor camino desde el inicio. Un
+      estado se descarta si costo_parcial + cota_inferior(resto) >= cota superior.
+      La cota inferior es COTAS.aportes_por_ciudad: nunca sobrestima.
+    - Si la matriz es simétrica, una ruta y su inversa cuestan lo mismo: basta
+      llegar hasta la mitad de las ciudades y unir cada camino (S, j) con el
+      camino del complemento de S que también termina en j (encuentro a la
+      mitad). Así no se generan las capas de la segunda mitad y la
+      reconstrucción recorre dos medios caminos.
+    Devuelve (ruta_indices, ruta_nombres, costo, num_estados_materializados, num_podas);
+    num_estados_materializados se compara con len(memo) de tsp_top_down_memo.
+    """
+    n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("top_down_memo_podado")
+
+    if ruta_inicial is None:
+        from HEURISTICAS import tsp_heuristico
+        ruta_inicial = tsp_heuristico(distancias, None, ciudad_inicio)[0]
+    mejor_ruta = list(ruta_inicial)
+    mejor_costo = 0
+    for i in range(len(mejor_ruta) - 1):
+        mejor_costo += distancias[mejor_ruta[i]][mejor_ruta[i + 1]]
+    medicion.fase("cota_superior")
+
+    datos = aportes_por_ciudad(distancias)
+    simetrica = datos["simetrica"]
+    aporte = datos["aporte"]
+    salida = datos["salida"]
+    salida_inicio = salida[ciudad_inicio]
+
+    ALL_VISITED = (1 << n) - 1
+    visited_mask_inicial = 1 << ciudad_inicio
+
+    # Con encuentro a la mitad: el primer camino cubre 'mitad' ciudades además
+    # del inicio y el segundo el resto más la ciudad de unión
+    encuentro = simetrica and n >= 3
+    otras = n - 1
+    mitad = (otras + 2) // 2 if encuentro else otras
+    mitad_complemento = otras + 1 - mitad
+
+    # capa[visited_mask * n + ciudad] = costo del mejor camino desde el inicio
+    # sumas[visited_mask] = suma de aportes de las ciudades aún no visitadas
+    capa = {visited_mask_inicial * n + ciudad_inicio: 0}
+    sumas = {visited_mask_inicial: sum(aporte[v] for v in range(n) if v != ciudad_inicio)}
+    padre = {}
+    capa_anterior = capa
+    num_estados = 1
+    num_podas = 0
+
+    for _ in range(mitad):
+        capa_anterior = capa
+        siguiente_capa = {}
+        siguientes_sumas = {}
+        for clave, costo in capa.items():
+            visited_mask, ciudad_actual = divmod(clave, n)
+            suma = sumas[visited_mask]
+            fila = distancias[ciudad_actual]
+            libres = ALL_VISITED ^ visited_mask
+            while libres:
+                bajo = libres & -libres
+                libres ^= bajo
+                siguiente = bajo.bit_length() - 1
+                nuevo_costo = costo + fila[siguiente]
+                nueva_suma = suma - aporte[siguiente]
+                if simetrica:
+                    cota = nuevo_costo + (nueva_suma + salida[siguiente] + salida_inicio) / 2
+                else:
+                    cota = nuevo_costo + nueva_suma + salida[siguiente]
+                if cota >= mejor_costo:
+                    num_podas += 1
+                    continue
+                nuevo_mask = visited_mask | bajo
+                nueva_clave = nuevo_mask * n + siguiente
+                anterior = siguiente_capa.get(nueva_clave)
+                if anterior is None or nuevo_costo < anterior:
+                    siguiente_capa[nueva_clave] = nuevo_costo
+                    padre[nueva_clave] = ciudad_actual
+                    siguientes_sumas[nuevo_mask] = nueva_suma
+        capa = siguiente_capa
+        sumas = siguientes_sumas
+        num_estados += len(capa)
+        if not capa:
+            break
+    medicion.fase("busqueda")
+
+    # Cierre: volver al inicio, o unir con el camino del complemento
+    mejor_cierre = None
+    if encuentro:
+        capa_complemento = capa if mitad_complemento == mitad else capa_anterior
+        for clave, costo in capa.items():
+            visited_mask, ciudad = divmod(clave, n)
+            mask_complemento = (ALL_VISITED ^ visited_mask) | (1 << ciudad) | visited_mask_inicial
+            clave_complemento = mask_complemento * n + ciudad
+            costo_complemento = capa_complemento.get(clave_complemento)
+            if costo_complemento is not None and costo + costo_complemento < mejor_costo:
+                mejor_costo = costo + costo_complemento
+                mejor_cierre = (clave, clave_complemento)
+    else:
+        for clave, costo in capa.items():
+            ciudad = clave % n
+            costo_total = costo + distancias[ciudad][ciudad_inicio]
+            if costo_total < mejor_costo:
+                mejor_costo = costo_total
+                mejor_cierre = (clave, None)
+
+    # Si nada mejoró la cota superior, la ruta inicial ya era óptima
+    if mejor_cierre is not None:
+        clave, clave_complemento = mejor_cierre
+        mejor_ruta = _camino_hasta(padre, clave, n, ciudad_inicio)
+        if clave_complemento is None:
+            mejor_ruta.append(ciudad_inicio)
+        else:
+            segunda_mitad = _camino_hasta(padre, clave_complemento, n, ciudad_inicio)
+            mejor_ruta += segunda_mitad[-2::-1]
+    medicion.fase("reconstruccion")
+
+    if nombres_ciudades is not None:
+        ruta_nombres = [nombres_ciudades[i] for i in mejor_ruta]
+    else:
+        ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_estados, podas=num_podas)
+
+    return mejor_ruta, ruta_nombres, mejor_costo, num_estados, num_podas
+
+
 if __name__ == "__main__":
-    nombres_ciudades = [
-        "Lima",
-        "Arequipa",
-        "Cusco",
-        "Trujillo",
-        "Piura"
-    ]
-
-    distancias = [
-        [   0, 1000, 1100,  560,  980],
-        [1000,    0,  510, 1600, 1850],
-        [1100,  510,    0, 1300, 1500],
-        [ 560, 1600, 1300,    0,  410],
-        [ 980, 1850, 1500,  410,    0]
-    ]
+    nombres_ciudades, distancias = ejemplo_peru()
 
     ciudad_inicio = 0
 
@@ -127,3 +276,16 @@ if __name__ == "__main__":
     print("Mejor ruta (índices):", ruta_idx)
     print("Mejor ruta (nombres):", " -> ".join(ruta_nombres))
     print("Costo total:", mejor_costo, "km")
+
+    ruta_idx, ruta_nombres, mejor_costo, estados, podas = tsp_top_down_memo_podado(
+        distancias,
+        nombres_ciudades,
+        ciudad_inicio
+    )
+
+    print()
+    print("=== TSP DP con poda (cota heurística + simetría) ===")
+    print("Mejor ruta (nombres):", " -> ".join(ruta_nombres))
+    print("Costo total:", mejor_costo, "km")
+    print("Estados materializados:", estados, "de", len(distancias) * 2 ** (len(distancias) - 1))
+    print("Transiciones podadas:", podas)
@@ -0,0 +1,402 @@
+import time
+from itertools import permutations
+
+import INSTRUMENTACION
+from COTAS import es_entera, matriz_numpy, redondear_cota
+from HEURISTICAS import tsp_heuristico
+from MATRIZ import ejemplo_peru
+from VECINOS import es_simetrica
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él este solver no está disponible
+    np = None
+
+try:
+    from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # scipy es opcional: solo lo usa este solver
+    milp = None
+
+# Tolerancia para decidir si una arista está en el soporte de la solución y
+# si un corte de subtour está violado
+TOLERANCIA = 1e-6
+
+
+# ==========================
+# FORMULACIÓN DFJ
+# ==========================
+
+class _Formulacion:
+    """
+    Variables y restricciones de la formulación de Dantzig-Fulkerson-Johnson:
+    - simétrica: una variable por arista {a, b} (a < b), grado 2 en cada ciudad;
+    - asimétrica: una variable por arco (a, b), una salida y una entrada por ciudad.
+    Los cortes de subtour se guardan en la forma x(E(S)) <= |S| - 1 (aristas
+    o arcos con las dos puntas en S), siempre con el lado más chico del
+    corte: equivale a x(delta(S)) >= 2 (o a salir de S al menos una vez) y
+    tiene menos coeficientes.
+    """
+
+    def __init__(self, matriz, simetrica):
+        n = len(matriz)
+        self.n = n
+        self.simetrica = simetrica
+        if simetrica:
+            origenes, destinos = np.triu_indices(n, 1)
+        else:
+            origenes, destinos = np.nonzero(~np.eye(n, dtype=bool))
+        self.origenes = origenes
+        self.destinos = destinos
+        self.m = len(origenes)
+        self.costos = matriz[origenes, destinos]
+
+        # indice[a, b] = variable de la arista (o arco) a -> b
+        self.indice = np.full((n, n), -1, dtype=np.int64)
+        self.indice[origenes, destinos] = np.arange(self.m)
+        if simetrica:
+            self.indice[destinos, origenes] = np.arange(self.m)
+
+        variables = np.arange(self.m)
+        if simetrica:
+            filas = np.concatenate((origenes, destinos))
+            columnas = np.concatenate((variables, variables))
+            self.lados_grado = np.full(n, 2.0)
+        else:
+            filas = np.concatenate((origenes, n + destinos))
+            columnas = np.concatenate((variables, variables))
+            self.lados_grado = np.ones(2 * n)
+        self.grado = csr_matrix((np.ones(len(filas)), (filas, columnas)), shape=(len(self.lados_grado), self.m))
+
+        self.cortes = []            # variables de cada corte
+        self.tamanos = []           # |S| de cada corte
+        self._vistos = set()
+
+    def agregar_corte(self, conjunto):
+        """
+        Agrega el corte de subtour del conjunto de ciudades (si no estaba).
+        Devuelve True si es nuevo.
+        """
+        conjunto = sorted(conjunto)
+        if 2 * len(conjunto) > self.n:
+            adentro = set(conjunto)
+            conjunto = [c for c in range(self.n) if c not in adentro]
+        clave = tuple(conjunto)
+        if len(conjunto) < 2 or clave in self._vistos:
+            return False
+        self._vistos.add(clave)
+        sub = self.indice[np.ix_(conjunto, conjunto)]
+        if self.simetrica:
+            variables = sub[np.triu_indices(len(conjunto), 1)]
+        else:
+            variables = sub[~np.eye(len(conjunto), dtype=bool)]
+        self.cortes.append(variables)
+        self.tamanos.append(len(conjunto))
+        return True
+
+    def matriz_cortes(self):
+        """
+        (A, b) con una fila A x <= b por corte.
+        """
+        filas = np.concatenate([np.full(len(v), i) for i, v in enumerate(self.cortes)])
+        columnas = np.concatenate(self.cortes)
+        a = csr_matrix((np.ones(len(filas)), (filas, columnas)), shape=(len(self.cortes), self.m))
+        b = np.array(self.tamanos, dtype=np.float64) - 1.0
+        return a, b
+
+    def pesos(self, x):
+        """
+        Matriz simétrica n x n con el valor de x en cada par (x_ab + x_ba si
+        es asimétrica: con una entrada y una salida por ciudad, lo que sale de
+        S es igual a lo que entra, así que el corte simetrizado vale el doble).
+        """
+        pesos = np.zeros((self.n, self.n))
+        np.add.at(pesos, (self.origenes, self.destinos), x)
+        return pesos + pesos.T
+
+    def ruta(self, x, ciudad_inicio):
+        """
+        Ruta desde ciudad_inicio con las aristas (o arcos) en 1 de una solución
+        entera que forma un solo ciclo.
+        """
+        elegidas = np.nonzero(x > 0.5)[0]
+        siguientes = [[] for _ in range(self.n)]
+        for e in elegidas:
+            a, b = int(self.origenes[e]), int(self.destinos[e])
+            siguientes[a].append(b)
+            if self.simetrica:
+                siguientes[b].append(a)
+        ruta = [ciudad_inicio]
+        anterior = -1
+        actual = ciudad_inicio
+        for _ in range(self.n - 1):
+            siguiente = next(c for c in siguientes[actual] if c != anterior)
+            ruta.append(siguiente)
+            anterior, actual = actual, siguiente
+        ruta.append(ciudad_inicio)
+        return ruta
+
+
+# ==========================
+# SEPARACIÓN DE CORTES
+# ==========================
+
+def _componentes(pesos):
+    """
+    Componentes conexas del soporte (pares con peso mayor que TOLERANCIA).
+    """
+    num, etiquetas = connected_components(csr_matrix(pesos > TOLERANCIA), directed=False)
+    return [np.nonzero(etiquetas == c)[0].tolist() for c in range(num)]
+
+
+def _cortes_minimos(pesos, umbral):
+    """
+    Stoer-Wagner sobre la matriz de pesos: en cada fase se agregan las
+    ciudades de a una (la más conectada a las ya agregadas) y la última
+    define un corte; después se fusiona con la penúltima. El corte mínimo
+    global es el menor de los cortes de fase. Devuelve todos los cortes de
+    fase con valor menor que 'umbral' (cada uno es un conjunto de ciudades),
+    que también son cortes de subtour violados.
+    """
+    n = len(pesos)
+    w = pesos.copy()
+    grupos = [[v] for v in range(n)]
+    activos = list(range(n))
+    cortes = []
+    while len(activos) > 1:
+        idx = np.array(activos)
+        sub = w[np.ix_(idx, idx)]
+        conexion = sub[0].copy()
+        agregado = np.zeros(len(idx), dtype=bool)
+        agregado[0] = True
+        conexion[0] = -np.inf
+        s = t = 0
+        valor = 0.0
+        for _ in range(len(idx) - 1):
+            j = int(np.argmax(conexion))
+            s, t, valor = t, j, conexion[j]
+            agregado[j] = True
+            conexion += sub[j]
+            conexion[agregado] = -np.inf
+        if valor < umbral:
+            cortes.append(list(grupos[idx[t]]))
+        # Fusionamos la última ciudad de la fase con la penúltima
+        a, b = idx[s], idx[t]
+        w[a, :] += w[b, :]
+        w[:, a] += w[:, b]
+        w[a, a] = 0.0
+        grupos[a].extend(grupos[b])
+        activos.remove(b)
+    return cortes
+
+
+def _separar(formulacion, x):
+    """
+    Cortes de subtour violados por la solución x: uno por componente si el
+    soporte no es conexo; si no, los cortes de fase de Stoer-Wagner con
+    valor menor que 2. Devuelve cuántos cortes nuevos se agregaron.
+    """
+    pesos = formulacion.pesos(x)
+    componentes = _componentes(pesos)
+    if len(componentes) > 1:
+        conjuntos = componentes
+    else:
+        conjuntos = _cortes_minimos(pesos, 2.0 - TOLERANCIA)
+    return sum(formulacion.agregar_corte(conjunto) for conjunto in conjuntos)
+
+
+# ==========================
+# SOLVER
+# ==========================
+
+def _ruta_pocas_ciudades(distancias, ciudad_inicio):
+    n = len(distancias)
+    otras = [c for c in range(n) if c != ciudad_inicio]
+    mejor_ruta, mejor_costo = None, None
+    for orden in permutations(otras):
+        ruta = [ciudad_inicio, *orden, ciudad_inicio]
+        costo = 0
+        for i in range(n):
+            costo += distancias[ruta[i]][ruta[i + 1]]
+        if mejor_costo is None or costo < mejor_costo:
+            mejor_ruta, mejor_costo = ruta, costo
+    return mejor_ruta, mejor_costo
+
+
+def tsp_programacion_entera(distancias, nombres_ciudades=None, ciudad_inicio=0,
+                            tiempo_limite=None, al_iterar=None):
+    """
+    TSP exacto por programación entera (formulación DFJ) con planos de corte,
+    sobre HiGHS de scipy (linprog / milp). Para 50-150 ciudades, donde
+    Held-Karp ya no entra en memoria.
+    1. Incumbente inicial: la ruta de tsp_heuristico (cota superior).
+    2. Relajación lineal con las restricciones de grado; los cortes de subtour
+       (2^n) se agregan de a poco: por componente conexa si el soporte no es
+       conexo y por corte mínimo (Stoer-Wagner) si lo es, hasta que ninguno
+       esté violado. Si la cota ya alcanza al incumbente, este es óptimo.
+    3. Con los costos reducidos del último LP se fijan en 0 las aristas que
+       no pueden estar en una ruta mejor que el incumbente.
+    4. Se resuelve el problema entero con esos cortes; si la solución tiene
+       subtours, se agrega un corte por subtour y se vuelve a resolver.
+    'al_iterar' (opcional) se llama después de cada resolución con
+    (iteracion, etapa, cota, costo_incumbente, brecha, num_cortes), con
+    etapa "lp" o "entera" y brecha relativa al incumbente. Con tiempo_limite
+    (segundos) se devuelve el incumbente si se agota el tiempo: en ese caso
+    la ruta es óptima solo si la última brecha informada es 0.
+    Requiere numpy y scipy.
+    Devuelve (ruta_indices, ruta_nombres, costo, iteraciones, num_cortes).
+    """
+    n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("programacion_entera")
+    iteraciones = 0
+    num_cortes = 0
+
+    if n <= 3:
+        mejor_ruta, mejor_costo = _ruta_pocas_ciudades(distancias, ciudad_inicio)
+        medicion.fase("busqueda")
+    else:
+        if milp is None:
+            raise ImportError("PROGRAMACION_ENTERA requiere scipy (pip install scipy)")
+        inicio = time.perf_counter()
+        matriz = matriz_numpy(distancias)
+        entera = es_entera(matriz)
+
+        mejor_ruta, _, mejor_costo, _ = tsp_heuristico(distancias, None, ciudad_inicio)
+        medicion.fase("incumbente")
+
+        formulacion = _Formulacion(matriz, es_simetrica(distancias))
+        cotas_superiores = np.ones(formulacion.m)
+
+        def restante():
+            if tiempo_limite is None:
+                return None
+            return tiempo_limite - (time.perf_counter() - inicio)
+
+        def informar(etapa, cota):
+            if al_iterar is not None:
+                brecha = (mejor_costo - cota) / mejor_costo if mejor_costo else 0.0
+                al_iterar(iteraciones, etapa, cota, mejor_costo, max(brecha, 0.0), len(formulacion.cortes))
+
+        # ---------- planos de corte sobre la relajación lineal ----------
+        cota = None
+        agotado = False
+        while True:
+            opciones = {}
+            if tiempo_limite is not None:
+                if restante() <= 0:
+                    agotado = True
+                    break
+                opciones["time_limit"] = restante()
+            if formulacion.cortes:
+                a_cortes, b_cortes = formulacion.matriz_cortes()
+            else:
+                a_cortes, b_cortes = None, None
+            resultado = linprog(formulacion.costos, A_ub=a_cortes, b_ub=b_cortes,
+                                A_eq=formulacion.grado, b_eq=formulacion.lados_grado,
+                                bounds=(0, 1), method="highs", options=opciones)
+            iteraciones += 1
+            if resultado.status != 0:
+                if resultado.status == 1:
+                    agotado = True      # límite de tiempo: queda el incumbente
+                    break
+                raise RuntimeError(f"HiGHS no resolvió la relajación: {resultado.message}")
+            cota = redondear_cota(resultado.fun, entera)
+            informar("lp", cota)
+            if cota >= mejor_costo:
+                break
+            if _separar(formulacion, resultado.x) == 0:
+                break
+        medicion.fase("relajacion")
+
+        if not agotado and cota < mejor_costo:
+            # Fijación por costo reducido: con la arista e la cota sube al
+            # menos su costo reducido
+            reducidos = resultado.lower.marginals
+            cotas_superiores[resultado.fun + reducidos > mejor_costo + TOLERANCIA] = 0.0
+
+            # ---------- problema entero, agregando cortes por subtour ----------
+            while True:
+                opciones = {}
+                if tiempo_limite is not None:
+                    if restante() <= 0:
+                        break
+                    opciones["time_limit"] = restante()
+                restricciones = [
+                    LinearConstraint(formulacion.grado, formulacion.lados_grado, formulacion.lados_grado),
+                ]
+                if formulacion.cortes:
+                    a_cortes, b_cortes = formulacion.matriz_cortes()
+                    restricciones.append(LinearConstraint(a_cortes, -np.inf, b_cortes))
+                resultado = milp(formulacion.costos, constraints=restricciones,
+                                 integrality=np.ones(formulacion.m),
+                                 bounds=Bounds(0, cotas_superiores), options=opciones)
+                iteraciones += 1
+                if resultado.status != 0:
+                    if resultado.status == 1:
+                        break       # límite de tiempo: queda el incumbente
+                    raise RuntimeError(f"HiGHS no resolvió el problema entero: {resultado.message}")
+                x = np.round(resultado.x)
+                cota = redondear_cota(resultado.fun, entera)
+                componentes = _componentes(formulacion.pesos(x))
+                if len(componentes) == 1:
+                    ruta = formulacion.ruta(x, ciudad_inicio)
+                    costo = 0
+                    for i in range(n):
+                        costo += distancias[ruta[i]][ruta[i + 1]]
+                    if costo < mejor_costo:
+                        mejor_ruta, mejor_costo = ruta, costo
+                    informar("entera", cota)
+                    break
+                for componente in componentes:
+                    formulacion.agregar_corte(componente)
+                informar("entera", cota)
+            medicion.fase("entera")
+        num_cortes = len(formulacion.cortes)
+
+    if nombres_ciudades is not None:
+        mejor_ruta_nombres = [nombres_ciudades[i] for i in mejor_ruta]
+    else:
+        mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=iteraciones, cortes=num_cortes)
+
+    return mejor_ruta, mejor_ruta_nombres, mejor_costo, iteraciones, num_cortes
+
+
+if __name__ == "__main__":
+    from BENCHMARK import instancia_asimetrica, instancia_euclidiana
+    from MEMOIZACION import tsp_top_down_memo
+
+    nombres_ciudades, distancias = ejemplo_peru()
+    ruta_idx, ruta_nombres, costo, iteraciones, cortes = tsp_programacion_entera(
+        distancias, nombres_ciudades, 0
+    )
+    print("=== TSP por programación entera (DFJ + cortes, HiGHS) ===")
+    print("Ruta (índices):", ruta_idx)
+    print("Ruta (nombres):", " -> ".join(ruta_nombres))
+    print("Costo total:", costo, "km")
+    print("Iteraciones:", iteraciones, " Cortes:", cortes)
+    print()
+
+    print("=== Verificación contra tsp_top_down_memo ===")
+    for generador in (instancia_euclidiana, instancia_asimetrica):
+        for n in range(4, 13):
+            for semilla in range(3):
+                matriz = generador(n, semilla)
+                esperado = tsp_top_down_memo(matriz)[2]
+                obtenido = tsp_programacion_entera(matriz)[2]
+                assert obtenido == esperado, (generador.__name__, n, semilla, obtenido, esperado)
+        print(f"  {generador.__name__}: n = 4..12, 3 semillas cada uno: OK")
+    print()
+
+    def mostrar(iteracion, etapa, cota, incumbente, brecha, num_cortes):
+        print(f"  {iteracion:4d} {etapa:>7s} {cota:10.0f} {incumbente:11.0f} {100 * brecha:8.3f}% {num_cortes:6d}")
+
+    for n in (50, 100, 150):
+        matriz = instancia_euclidiana(n, semilla=n)
+        print(f"=== {n} ciudades (euclidiana) ===")
+        print(f"  {'Iter':>4s} {'Etapa':>7s} {'Cota':>10s} {'Incumbente':>11s} {'Brecha':>9s} {'Cortes':>6s}")
+        inicio = time.perf_counter()
+        costo = tsp_programacion_entera(matriz, al_iterar=mostrar)[2]
+        print(f"  Óptimo: {costo}  ({time.perf_counter() - inicio:.2f} s)")
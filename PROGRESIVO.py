@@ -0,0 +1,233 @@
+import threading
+import time
+
+import INSTRUMENTACION
+from MATRIZ import ejemplo_peru
+
+# Cada cuántos nodos se mira el reloj y el pedido de cancelación (mirar en
+# cada nodo haría la búsqueda bastante más lenta)
+CHEQUEO_CADA = 1024
+
+
+def tsp_progresivo(distancias, nombres_ciudades=None, ciudad_inicio=0,
+                   tiempo_limite=None, max_nodos=None, cancelacion=None, poda=True):
+    """
+    Búsqueda exhaustiva "anytime": el mismo backtracking que
+    tsp_recursivo_sin_memo, pero como generador que entrega cada ruta que
+    mejora a la mejor encontrada, en cuanto la encuentra:
+        for ruta_indices, ruta_nombres, costo, transcurrido, nodos in tsp_progresivo(d):
+            ...
+    - tiempo_limite (segundos) y max_nodos cortan la búsqueda; cancelacion
+      (un threading.Event) la corta desde otro hilo. Se revisan cada
+      CHEQUEO_CADA nodos.
+    - Desde cada ciudad se prueba primero la más cercana, así que la primera
+      ruta entregada es la del vecino más cercano y las siguientes la mejoran.
+    - Con poda=True se descarta una ruta parcial que ya cuesta lo mismo que la
+      mejor (las distancias no pueden ser negativas); con poda=False se
+      recorren las (n-1)! rutas, como tsp_recursivo_sin_memo.
+    'transcurrido' son los segundos desde el comienzo y 'nodos' las rutas
+    parciales extendidas hasta ese momento. Al terminar, el generador
+    devuelve (en StopIteration.value) True si recorrió todo el espacio, es
+    decir, si la última ruta entregada es óptima.
+    """
+    n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("progresivo")
+    inicio = time.perf_counter()
+    nodos = 0
+    num_mejoras = 0
+    completa = False
+
+    def incumbente(ruta, costo):
+        if nombres_ciudades is not None:
+            ruta_nombres = [nombres_ciudades[i] for i in ruta]
+        else:
+            ruta_nombres = ruta
+        return ruta, ruta_nombres, costo, time.perf_counter() - inicio, nodos
+
+    try:
+        if n == 1:
+            num_mejoras = 1
+            yield incumbente([ciudad_inicio, ciudad_inicio], 0)
+            completa = True
+            return completa
+
+        # Candidatos de cada ciudad, de la más cercana a la más lejana
+        cercanas = [sorted((c for c in range(n) if c != a), key=distancias[a].__getitem__) for a in range(n)]
+        regreso = [distancias[c][ciudad_inicio] for c in range(n)]
+        mejor_costo = float('inf')
+
+        limite_nodos = max_nodos if max_nodos is not None else float('inf')
+        proximo_chequeo = min(CHEQUEO_CADA, limite_nodos)
+
+        # Pila explícita (en lugar de recursión) para poder entregar la ruta a
+        # mitad de la búsqueda: ruta parcial, su costo en cada profundidad y el
+        # próximo candidato a probar en cada profundidad
+        visitadas = [False] * n
+        visitadas[ciudad_inicio] = True
+        ruta = [ciudad_inicio]
+        costos = [0]
+        proximo = [0]
+        ultima_profundidad = n - 1
+
+        while proximo:
+            actual = ruta[-1]
+            candidatos = cercanas[actual]
+            i = proximo[-1]
+            while i < n - 1 and visitadas[candidatos[i]]:
+                i += 1
+            if i == n - 1:
+                # Sin más candidatos: deshacemos la decisión (backtracking)
+                proximo.pop()
+                costos.pop()
+                visitadas[ruta.pop()] = False
+                continue
+            proximo[-1] = i + 1
+            siguiente = candidatos[i]
+
+            nodos += 1
+            if nodos >= proximo_chequeo:
+                if nodos >= limite_nodos:
+                    break
+                if cancelacion is not None and cancelacion.is_set():
+                    break
+                if tiempo_limite is not None and time.perf_counter() - inicio >= tiempo_limite:
+                    break
+                proximo_chequeo = min(nodos + CHEQUEO_CADA, limite_nodos)
+
+            costo = costos[-1] + distancias[actual][siguiente]
+            if poda and costo >= mejor_costo:
+                # Los candidatos que siguen están más lejos: tampoco sirven
+                proximo[-1] = n - 1
+                continue
+
+            if len(ruta) == ultima_profundidad:
+                costo += regreso[siguiente]
+                if costo < mejor_costo:
+                    mejor_costo = costo
+                    num_mejoras += 1
+                    yield incumbente(ruta + [siguiente, ciudad_inicio], costo)
+                continue
+
+            visitadas[siguiente] = True
+            ruta.append(siguiente)
+            costos.append(costo)
+            proximo.append(0)
+        else:
+            completa = True
+        return completa
+    finally:
+        # También si quien consume el generador lo abandona a mitad de camino
+        medicion.fase("busqueda")
+        medicion.terminar(estados_expandidos=nodos, mejoras=num_mejoras)
+
+
+# ==========================
+# BÚSQUEDA EN SEGUNDO PLANO
+# ==========================
+
+class BusquedaProgresiva:
+    """
+    Corre tsp_progresivo en un hilo aparte y guarda la mejor ruta hasta el
+    momento, para tomar una buena ruta enseguida y dejar que la búsqueda la
+    siga refinando:
+        busqueda = BusquedaProgresiva(distancias, nombres_ciudades, 0, tiempo_limite=60)
+        ruta_indices, ruta_nombres, costo, transcurrido, nodos = busqueda.esperar(0.2)
+        ...                       # despachar con esa ruta
+        busqueda.cancelar()       # o dejarla seguir y consultar busqueda.mejor
+    'al_mejorar' (opcional) se llama desde el hilo de la búsqueda con cada
+    ruta nueva. Al terminar, 'completa' es True si se recorrió todo el
+    espacio (la mejor es óptima) y 'error' trae la excepción si la hubo.
+    """
+
+    def __init__(self, distancias, nombres_ciudades=None, ciudad_inicio=0,
+                 tiempo_limite=None, max_nodos=None, poda=True, al_mejorar=None):
+        self.mejor = None
+        self.terminada = False
+        self.completa = False
+        self.error = None
+        self._al_mejorar = al_mejorar
+        self._cancelacion = threading.Event()
+        self._condicion = threading.Condition()
+        generador = tsp_progresivo(distancias, nombres_ciudades, ciudad_inicio,
+                                   tiempo_limite, max_nodos, self._cancelacion, poda)
+        self._hilo = threading.Thread(target=self._correr, args=(generador,), daemon=True)
+        self._hilo.start()
+
+    def _correr(self, generador):
+        completa = False
+        try:
+            while True:
+                try:
+                    resultado = next(generador)
+                except StopIteration as fin:
+                    completa = fin.value
+                    break
+                with self._condicion:
+                    self.mejor = resultado
+                    self._condicion.notify_all()
+                if self._al_mejorar is not None:
+                    self._al_mejorar(resultado)
+        except Exception as error:
+            self.error = error
+        finally:
+            with self._condicion:
+                self.completa = completa
+                self.terminada = True
+                self._condicion.notify_all()
+
+    def esperar(self, segundos=None):
+        """
+        Espera hasta que pasen 'segundos' (o sin límite) o termine la
+        búsqueda, lo que ocurra primero, y devuelve la mejor ruta hasta el
+        momento (None si todavía no hay ninguna).
+        """
+        with self._condicion:
+            self._condicion.wait_for(lambda: self.terminada, segundos)
+            return self.mejor
+
+    def cancelar(self, esperar=True):
+        """
+        Pide a la búsqueda que se detenga; con esperar=True, espera a que el
+        hilo termine (a lo sumo CHEQUEO_CADA nodos más).
+        """
+        self._cancelacion.set()
+        if esperar:
+            self._hilo.join()
+        return self.mejor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cancelar()
+
+
+if __name__ == "__main__":
+    from BENCHMARK import instancia_euclidiana
+    from HELD_KARP import tsp_held_karp
+
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    print("=== TSP progresivo (Perú) ===")
+    generador = tsp_progresivo(distancias, nombres_ciudades, 0)
+    while True:
+        try:
+            _, ruta_nombres, costo, transcurrido, nodos = next(generador)
+        except StopIteration as fin:
+            print("Recorrido completo:", fin.value)
+            break
+        print(f"  {costo:6d} km  nodo {nodos:4d}  {' -> '.join(ruta_nombres)}")
+    print()
+
+    n = 14
+    matriz = instancia_euclidiana(n, semilla=1)
+    optimo = tsp_held_karp(matriz)[2]
+    print(f"=== Despacho con {n} ciudades: ruta a los 200 ms, refinando en segundo plano ===")
+    print(f"(óptimo según Held-Karp: {optimo})")
+    inicio = time.perf_counter()
+    with BusquedaProgresiva(matriz, tiempo_limite=5) as busqueda:
+        for segundos in (0.2, 1.0, 5.0):
+            _, _, costo, transcurrido, nodos = busqueda.esperar(max(0.0, segundos - (time.perf_counter() - inicio)))
+            print(f"  a los {segundos:3.1f} s: costo {costo} (encontrada a los {transcurrido:.3f} s, "
+                  f"nodo {nodos:,}), brecha {100 * (costo - optimo) / optimo:.2f}%")
+    print("Recorrido completo:", busqueda.completa)
@@ -0,0 +1,279 @@
+import concurrent.futures
+import multiprocessing
+import os
+
+import INSTRUMENTACION
+from COTAS import CotaHeldKarp, aportes_por_ciudad
+from MATRIZ import ejemplo_peru
+
+# Por debajo de este tamaño el costo de levantar procesos supera a la búsqueda
+MIN_CIUDADES_PARALELO = 10
+
+# Cada cuántos nodos un proceso vuelve a leer el incumbente compartido
+INTERVALO_SINCRONIZACION = 1024
+
+# Datos del proceso trabajador (se cargan una sola vez en _inicializar_trabajador)
+_DATOS = None
+
+
+def _preparar(distancias, ciudad_inicio):
+    """
+    Precalcula lo que usa la búsqueda: la cota inferior de
+    COTAS.aportes_por_ciudad y el orden de los hijos
+    (orden[c]: ciudades de la más cercana a la más lejana desde c, sin el inicio).
+    """
+    aportes = aportes_por_ciudad(distancias)
+    return {
+        "distancias": distancias,
+        "ciudad_inicio": ciudad_inicio,
+        "simetrica": aportes["simetrica"],
+        "aporte": aportes["aporte"],
+        "salida": aportes["salida"],
+        "orden": [[b for b in vecinos if b != ciudad_inicio] for vecinos in aportes["vecinos"]],
+    }
+
+
+def _ruta_vecino_mas_cercano(distancias, ciudad_inicio):
+    """
+    Ruta inicial (incumbente) construida yendo siempre a la ciudad más cercana.
+    """
+    n = len(distancias)
+    visitadas = [False] * n
+    visitadas[ciudad_inicio] = True
+    ruta = [ciudad_inicio]
+    actual = ciudad_inicio
+    costo = 0
+    for _ in range(n - 1):
+        siguiente = min(
+            (c for c in range(n) if not visitadas[c]),
+            key=lambda c: distancias[actual][c]
+        )
+        costo += distancias[actual][siguiente]
+        visitadas[siguiente] = True
+        ruta.append(siguiente)
+        actual = siguiente
+    costo += distancias[actual][ciudad_inicio]
+    ruta.append(ciudad_inicio)
+    return ruta, costo
+
+
+def _explorar(datos, prefijo, cota_superior, incumbente=None):
+    """
+    Búsqueda en profundidad con poda desde una ruta parcial 'prefijo'.
+    Poda un nodo cuando costo_actual + cota_inferior >= mejor costo conocido.
+    Si 'incumbente' es un multiprocessing.Value, se comparte el mejor costo
+    con los otros procesos.
+    Devuelve (mejor_ruta, mejor_costo, nodos_expandidos, nodos_podados);
+    mejor_ruta es None si no se encontró nada mejor que cota_superior.
+    """
+    distancias = datos["distancias"]
+    ciudad_inicio = datos["ciudad_inicio"]
+    simetrica = datos["simetrica"]
+    aporte = datos["aporte"]
+    salida = datos["salida"]
+    orden = datos["orden"]
+    n = len(distancias)
+
+    visitadas = [False] * n
+    for c in prefijo:
+        visitadas[c] = True
+    ruta_actual = list(prefijo)
+
+    costo_prefijo = 0
+    for i in range(len(prefijo) - 1):
+        costo_prefijo += distancias[prefijo[i]][prefijo[i + 1]]
+    suma_aportes = sum(aporte[v] for v in range(n) if not visitadas[v])
+
+    mejor_ruta = None
+    mejor_costo = cota_superior
+    # mejor_costo puede bajar con el incumbente de otro proceso; el costo
+    # que se devuelve es siempre el de mejor_ruta
+    costo_mejor_ruta = cota_superior
+    nodos_expandidos = 0
+    nodos_podados = 0
+
+    def cota_inferior(ciudad_actual, costo_actual, suma):
+        if simetrica:
+            return costo_actual + (suma + salida[ciudad_actual] + salida[ciudad_inicio]) / 2
+        return costo_actual + suma + salida[ciudad_actual]
+
+    def backtrack(ciudad_actual, costo_actual, suma):
+        nonlocal mejor_ruta, mejor_costo, costo_mejor_ruta, nodos_expandidos, nodos_podados
+        nodos_expandidos += 1
+
+        # Cada cierto número de nodos traemos el mejor costo de los otros procesos
+        if incumbente is not None and nodos_expandidos % INTERVALO_SINCRONIZACION == 0:
+            compartido = incumbente.value
+            if compartido < mejor_costo:
+                mejor_costo = compartido
+
+        # Ruta completa: cerramos el ciclo
+        if len(ruta_actual) == n:
+            costo_total = costo_actual + distancias[ciudad_actual][ciudad_inicio]
+            if costo_total < mejor_costo:
+                mejor_costo = costo_total
+                costo_mejor_ruta = costo_total
+                mejor_ruta = ruta_actual[:] + [ciudad_inicio]
+                if incumbente is not None:
+                    with incumbente.get_lock():
+                        if costo_total < incumbente.value:
+                            incumbente.value = costo_total
+            return
+
+        # Hijos del más cercano al más lejano
+        for siguiente in orden[ciudad_actual]:
+            if visitadas[siguiente]:
+                continue
+            nuevo_costo = costo_actual + distancias[ciudad_actual][siguiente]
+            nueva_suma = suma - aporte[siguiente]
+            if cota_inferior(siguiente, nuevo_costo, nueva_suma) >= mejor_costo:
+                nodos_podados += 1
+                continue
+
+            visitadas[siguiente] = True
+            ruta_actual.append(siguiente)
+            backtrack(siguiente, nuevo_costo, nueva_suma)
+            ruta_actual.pop()
+            visitadas[siguiente] = False
+
+    ultima = prefijo[-1]
+    if len(prefijo) < n and cota_inferior(ultima, costo_prefijo, suma_aportes) >= mejor_costo:
+        nodos_podados += 1
+    else:
+        backtrack(ultima, costo_prefijo, suma_aportes)
+
+    return mejor_ruta, costo_mejor_ruta, nodos_expandidos, nodos_podados
+
+
+def _inicializar_trabajador(distancias, ciudad_inicio, incumbente):
+    global _DATOS
+    _DATOS = _preparar(distancias, ciudad_inicio)
+    _DATOS["incumbente"] = incumbente
+
+
+def _explorar_en_trabajador(prefijo):
+    incumbente = _DATOS["incumbente"]
+    return _explorar(_DATOS, prefijo, incumbente.value, incumbente)
+
+
+def _reducir_con_held_karp(distancias, ciudad_inicio):
+    """
+    Prepara la búsqueda con cota="lagrangiana": ruta heurística como
+    incumbente y penalizaciones de Held-Karp (COTAS) para la matriz.
+    Devuelve (ruta, costo, cota_held_karp, distancias_reducidas, desplazamiento).
+    """
+    from HEURISTICAS import tsp_heuristico
+
+    ruta, _, costo, _ = tsp_heuristico(distancias, None, ciudad_inicio)
+    cota = CotaHeldKarp(distancias)
+    cota.mejorar(costo)
+    reducidas, desplazamiento = cota.distancias_reducidas(distancias)
+    return ruta, costo, cota.valor, reducidas, desplazamiento
+
+
+def tsp_ramificacion_y_poda(distancias, nombres_ciudades=None, ciudad_inicio=0, num_procesos=None,
+                            cota="simple"):
+    """
+    TSP exacto por Ramificación y Poda (branch and bound).
+    - Incumbente inicial: ruta del vecino más cercano.
+    - Cota inferior: dos aristas más baratas de cada ciudad no visitada
+      (o la arista de salida más barata si la matriz no es simétrica).
+    - Con cota="lagrangiana" (requiere numpy) la incumbente es la ruta de
+      tsp_heuristico y se busca sobre los costos d[a][b] + pi[a] + pi[b]
+      con las penalizaciones de Held-Karp (COTAS): toda ruta sube lo mismo,
+      así que la óptima no cambia, pero la cota de cada nodo queda mucho
+      más cerca del óptimo y se poda antes. Si la cota de Held-Karp ya
+      alcanza al costo heurístico, no hace falta buscar.
+    - Los hijos se exploran del más cercano al más lejano.
+    - Los dos primeros niveles del árbol se reparten entre procesos
+      (ProcessPoolExecutor) que comparten el mejor costo encontrado.
+    Con num_procesos=1 (o pocas ciudades) todo corre en el proceso actual.
+    Devuelve (mejor_ruta, mejor_ruta_nombres, mejor_costo, nodos_expandidos, nodos_podados).
+    """
+    n = len(distancias)
+
+    if num_procesos is None:
+        num_procesos = os.cpu_count() or 1
+
+    medicion = INSTRUMENTACION.iniciar("ramificacion_y_poda")
+    distancias_busqueda = distancias
+    if cota == "lagrangiana" and n > 3:
+        mejor_ruta, costo_heuristico, cota_held_karp, distancias_busqueda, desplazamiento = (
+            _reducir_con_held_karp(distancias, ciudad_inicio)
+        )
+        # Costo de la incumbente medido con las distancias reducidas
+        mejor_costo = costo_heuristico + desplazamiento
+    elif cota in ("simple", "lagrangiana"):
+        mejor_ruta, mejor_costo = _ruta_vecino_mas_cercano(distancias, ciudad_inicio)
+        cota_held_karp = None
+    else:
+        raise ValueError(f"Cota desconocida: {cota!r}")
+    datos = _preparar(distancias_busqueda, ciudad_inicio)
+    medicion.fase("preparacion")
+
+    if cota_held_karp is not None and cota_held_karp >= costo_heuristico:
+        # La ruta heurística ya alcanza la cota: es óptima
+        nodos_expandidos = 0
+        nodos_podados = 0
+    elif num_procesos <= 1 or n < max(MIN_CIUDADES_PARALELO, 4):
+        ruta, costo, nodos_expandidos, nodos_podados = _explorar(
+            datos, [ciudad_inicio], mejor_costo
+        )
+        if ruta is not None:
+            mejor_ruta, mejor_costo = ruta, costo
+    else:
+        # Niveles 0 y 1 se expanden aquí; cada nodo del nivel 2 es una tarea
+        prefijos = []
+        for c1 in datos["orden"][ciudad_inicio]:
+            for c2 in datos["orden"][c1]:
+                if c2 != c1:
+                    prefijos.append([ciudad_inicio, c1, c2])
+        nodos_expandidos = 1 + (n - 1)
+        nodos_podados = 0
+
+        incumbente = multiprocessing.Value('d', float(mejor_costo))
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_procesos,
+            initializer=_inicializar_trabajador,
+            initargs=(distancias_busqueda, ciudad_inicio, incumbente),
+        ) as executor:
+            for ruta, costo, expandidos, podados in executor.map(_explorar_en_trabajador, prefijos):
+                nodos_expandidos += expandidos
+                nodos_podados += podados
+                if ruta is not None and costo < mejor_costo:
+                    mejor_ruta, mejor_costo = ruta, costo
+    if distancias_busqueda is not distancias:
+        # El costo se vuelve a medir con las distancias originales
+        mejor_costo = 0
+        for i in range(len(mejor_ruta) - 1):
+            mejor_costo += distancias[mejor_ruta[i]][mejor_ruta[i + 1]]
+    medicion.fase("busqueda")
+
+    # Convertimos índices a nombres si corresponde
+    if nombres_ciudades is not None:
+        mejor_ruta_nombres = [nombres_ciudades[i] for i in mejor_ruta]
+    else:
+        mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=nodos_expandidos, podas=nodos_podados)
+
+    return mejor_ruta, mejor_ruta_nombres, mejor_costo, nodos_expandidos, nodos_podados
+
+
+if __name__ == "__main__":
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    ciudad_inicio = 0
+
+    mejor_ruta_idx, mejor_ruta_nombres, mejor_costo, expandidos, podados = tsp_ramificacion_y_poda(
+        distancias,
+        nombres_ciudades,
+        ciudad_inicio
+    )
+
+    print("=== TSP por Ramificación y Poda ===")
+    print("Mejor ruta (índices):", mejor_ruta_idx)
+    print("Mejor ruta (nombres):", " -> ".join(mejor_ruta_nombres))
+    print("Costo total:", mejor_costo, "km")
+    print("Nodos expandidos:", expandidos)
+    print("Nodos podados:", podados)
@@ -1,18 +1,10 @@
-nombres_ciudades = [
-    "Lima",      # 0
-    "Arequipa",  # 1
-    "Cusco",     # 2
-    "Trujillo",  # 3
-    "Piura"      # 4
-]
-
-distancias = [
-    [   0, 1000, 1100,  560,  980],  # Lima
-    [1000,    0,  510, 1600, 1850],  # Arequipa
-    [1100,  510,    0, 1300, 1500],  # Cusco
-    [ 560, 1600, 1300,    0,  410],  # Trujillo
-    [ 980, 1850, 1500,  410,    0]   # Piura
-]
+import math
+
+import INSTRUMENTACION
+from MATRIZ import CIUDADES_PERU, DISTANCIAS_PERU, ejemplo_peru
+
+nombres_ciudades = list(CIUDADES_PERU)
+distancias = [list(fila) for fila in DISTANCIAS_PERU]
 
 ciudad_inicio = 0  # Lima
 
@@ -24,6 +16,7 @@ def tsp_recursivo_sin_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
     Explora todas las posibles rutas recursivamente y se queda con la mejor.
     """
     n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("recursivo_sin_memo")
 
     # Arreglo booleano para saber qué ciudades ya se visitaron
     visitadas = [False] * n
@@ -62,32 +55,26 @@ def tsp_recursivo_sin_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
 
     # Llamada inicial
     backtrack(ciudad_inicio, 0)
+    medicion.fase("busqueda")
 
     # Convertimos índices a nombres si corresponde
     if nombres_ciudades is not None:
         mejor_ruta_nombres = [nombres_ciudades[i] for i in mejor_ruta]
     else:
         mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+
+    if medicion.activa:
+        # Sin contador dentro de backtrack: un recorrido completo hace
+        # 1 + (n-1) + (n-1)(n-2) + ... + (n-1)! llamadas
+        llamadas = sum(math.perm(n - 1, k) for k in range(n))
+        medicion.terminar(estados_expandidos=llamadas)
 
     return mejor_ruta, mejor_ruta_nombres, mejor_costo
 
 
 if __name__ == "__main__":
-    nombres_ciudades = [
-        "Lima",
-        "Arequipa",
-        "Cusco",
-        "Trujillo",
-        "Piura"
-    ]
-
-    distancias = [
-        [   0, 1000, 1100,  560,  980],
-        [1000,    0,  510, 1600, 1850],
-        [1100,  510,    0, 1300, 1500],
-        [ 560, 1600, 1300,    0,  410],
-        [ 980, 1850, 1500,  410,    0]
-    ]
+    nombres_ciudades, distancias = ejemplo_peru()
 
     ciudad_inicio = 0
 
@@ -0,0 +1,332 @@
+import numbers
+import operator
+import struct
+import sys
+import weakref
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo lo usa como_numpy()
+    np = None
+
+# Cabecera del formato binario de un resultado: firma, versión, número de
+# valores (costo + extras) y número de índices de la ruta. Después van los
+# códigos de tipo de cada valor ('q' o 'd'), los valores y los índices (int32),
+# todo en little-endian
+_CABECERA = struct.Struct("<4sHHI")
+_FIRMA = b"TSPR"
+_VERSION = 1
+
+
+# ==========================
+# TABLA DE NOMBRES COMPARTIDA
+# ==========================
+
+class TablaCiudades:
+    """
+    Nombres de las ciudades de una instancia, guardados una sola vez y
+    compartidos por todos los resultados que los usan (los nombres de texto
+    se internan). TablaCiudades.compartida(nombres) devuelve siempre la misma
+    tabla para los mismos nombres mientras alguien la tenga en uso.
+    """
+
+    __slots__ = ("nombres", "__weakref__")
+
+    _compartidas = weakref.WeakValueDictionary()
+
+    def __init__(self, nombres):
+        self.nombres = tuple(sys.intern(x) if type(x) is str else x for x in nombres)
+
+    @classmethod
+    def compartida(cls, nombres):
+        if isinstance(nombres, cls):
+            return nombres
+        clave = tuple(nombres)
+        tabla = cls._compartidas.get(clave)
+        if tabla is None:
+            tabla = cls(clave)
+            cls._compartidas[clave] = tabla
+        return tabla
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __getitem__(self, i):
+        return self.nombres[i]
+
+    def ruta(self, indices):
+        """
+        Nombres de la ruta 'indices' (una lista nueva).
+        """
+        return list(map(self.nombres.__getitem__, indices))
+
+
+# ==========================
+# RESULTADO COMPACTO
+# ==========================
+
+class ResultadoRuta:
+    """
+    Resultado de un solver sin listas por ruta: los índices en un arreglo
+    int32, el costo, los contadores extra del solver y una referencia a la
+    TablaCiudades compartida (o None). Los nombres no se arman hasta que se
+    piden (nombres, texto()): crear un resultado solo copia los índices a un
+    array('i') (ninguna copia si ya vienen así, como al leer de bytes) y no
+    arma una lista de nombres por ruta.
+    Se comporta como la tupla de los solvers para el código existente:
+        ruta_indices, ruta_nombres, costo, *extras = resultado
+    y se exporta sin copiar con vista() / como_numpy(), o a bytes con a_bytes()
+    (y serializar() para muchos resultados a la vez).
+    """
+
+    __slots__ = ("indices", "costo", "extras", "tabla")
+
+    def __init__(self, indices, costo, extras=(), tabla=None):
+        if not (isinstance(indices, array) and indices.typecode == 'i'):
+            indices = array('i', indices)
+        self.indices = indices
+        self.costo = costo
+        self.extras = tuple(extras)
+        self.tabla = tabla
+
+    @classmethod
+    def desde_tupla(cls, resultado, nombres_ciudades=None):
+        """
+        A partir de la tupla (ruta_indices, ruta_nombres, costo, extras...)
+        de cualquier solver. 'nombres_ciudades' puede ser una lista de
+        nombres o una TablaCiudades ya armada; al crear muchos resultados
+        conviene pasar la tabla (buscarla por la lista recorre los nombres).
+        """
+        ruta_indices, _, costo, *extras = resultado
+        tabla = None if nombres_ciudades is None else TablaCiudades.compartida(nombres_ciudades)
+        return cls(ruta_indices, costo, extras, tabla)
+
+    def con_tabla(self, nombres_ciudades):
+        """
+        El mismo resultado con otra tabla de nombres (comparte el arreglo de índices).
+        """
+        tabla = None if nombres_ciudades is None else TablaCiudades.compartida(nombres_ciudades)
+        return ResultadoRuta(self.indices, self.costo, self.extras, tabla)
+
+    # ---------- nombres ----------
+
+    @property
+    def nombres(self):
+        """
+        Nombres de la ruta (o los índices si no hay tabla), armados al pedirlos.
+        """
+        if self.tabla is None:
+            return self.indices.tolist()
+        return self.tabla.ruta(self.indices)
+
+    def texto(self, separador=" -> "):
+        if self.tabla is None:
+            return separador.join(map(str, self.indices))
+        return separador.join(map(str, map(self.tabla.nombres.__getitem__, self.indices)))
+
+    # ---------- compatibilidad con la tupla de los solvers ----------
+
+    def como_tupla(self):
+        return (self.indices.tolist(), self.nombres, self.costo, *self.extras)
+
+    def __len__(self):
+        return 3 + len(self.extras)
+
+    def __getitem__(self, i):
+        # Solo se arma el campo pedido (resultado[2] no copia la ruta)
+        if isinstance(i, slice):
+            return tuple(self[j] for j in range(*i.indices(len(self))))
+        i = operator.index(i)
+        if i < 0:
+            i += len(self)
+        if i == 0:
+            return self.indices.tolist()
+        if i == 1:
+            return self.nombres
+        if i == 2:
+            return self.costo
+        if 3 <= i < len(self):
+            return self.extras[i - 3]
+        raise IndexError("Índice fuera del resultado")
+
+    def __iter__(self):
+        return iter(self.como_tupla())
+
+    def __eq__(self, otro):
+        if not isinstance(otro, ResultadoRuta):
+            return NotImplemented
+        return self.indices == otro.indices and self.costo == otro.costo and self.extras == otro.extras
+
+    def __repr__(self):
+        return f"ResultadoRuta({self.texto()!r}, costo={self.costo!r})"
+
+    # ---------- exportar sin copiar ----------
+
+    def vista(self):
+        """
+        memoryview int32 de los índices (sin copiar).
+        """
+        return memoryview(self.indices)
+
+    def como_numpy(self):
+        """
+        Arreglo numpy int32 que comparte memoria con los índices.
+        """
+        return np.frombuffer(self.indices, dtype=np.int32)
+
+    # ---------- formato binario ----------
+
+    def a_bytes(self):
+        """
+        Serializa el resultado (sin la tabla de nombres) en el formato binario
+        de _CABECERA. Los extras deben ser números (enteros o float).
+        """
+        valores = (self.costo, *self.extras)
+        tipos = "".join(_tipo_de(v) for v in valores)
+        indices = self.indices
+        if sys.byteorder != "little":
+            indices = array('i', indices)
+            indices.byteswap()
+        return b"".join((
+            _CABECERA.pack(_FIRMA, _VERSION, len(valores), len(self.indices)),
+            tipos.encode("ascii"),
+            struct.pack("<" + tipos, *valores),
+            indices.tobytes(),
+        ))
+
+    @classmethod
+    def desde_bytes(cls, datos, nombres_ciudades=None):
+        resultado, fin = _leer(memoryview(datos), 0, nombres_ciudades)
+        if fin != len(datos):
+            raise ValueError("Sobran bytes después del resultado")
+        return resultado
+
+
+def _tipo_de(valor):
+    if isinstance(valor, numbers.Integral):
+        return 'q'
+    if isinstance(valor, numbers.Real):
+        return 'd'
+    raise ValueError(f"Solo se serializan valores numéricos, no {type(valor).__name__}")
+
+
+def _exigir(vista, posicion, tamano):
+    if posicion + tamano > len(vista):
+        raise ValueError(f"Resultado binario con datos truncados: faltan "
+                         f"{posicion + tamano - len(vista)} bytes")
+
+
+def _leer(vista, inicio, nombres_ciudades):
+    """
+    Lee un resultado que empieza en 'inicio'. Devuelve (resultado, posición siguiente).
+    Cada parte se comprueba contra el largo de 'vista' antes de leerla.
+    """
+    _exigir(vista, inicio, _CABECERA.size)
+    firma, version, num_valores, n = _CABECERA.unpack_from(vista, inicio)
+    if firma != _FIRMA or version != _VERSION or num_valores == 0:
+        raise ValueError("No es un resultado en formato binario válido")
+    posicion = inicio + _CABECERA.size
+    _exigir(vista, posicion, num_valores)
+    tipos = bytes(vista[posicion:posicion + num_valores]).decode("ascii", errors="replace")
+    if tipos.strip("qd"):
+        raise ValueError("No es un resultado en formato binario válido")
+    posicion += num_valores
+    formato = struct.Struct("<" + tipos)
+    _exigir(vista, posicion, formato.size)
+    costo, *extras = formato.unpack_from(vista, posicion)
+    posicion += formato.size
+    _exigir(vista, posicion, 4 * n)
+
+    indices = array('i')
+    indices.frombytes(vista[posicion:posicion + 4 * n])
+    if sys.byteorder != "little":
+        indices.byteswap()
+    posicion += 4 * n
+
+    tabla = None if nombres_ciudades is None else TablaCiudades.compartida(nombres_ciudades)
+    return ResultadoRuta(indices, costo, extras, tabla), posicion
+
+
+def serializar(resultados):
+    """
+    Muchos resultados en un solo bloque de bytes (uno detrás de otro).
+    """
+    return b"".join(resultado.a_bytes() for resultado in resultados)
+
+
+def deserializar(datos, nombres_ciudades=None):
+    """
+    Inversa de serializar(): lista de ResultadoRuta, todos con la misma
+    tabla de nombres (si se pasa).
+    """
+    tabla = None if nombres_ciudades is None else TablaCiudades.compartida(nombres_ciudades)
+    vista = memoryview(datos)
+    resultados = []
+    posicion = 0
+    while posicion < len(vista):
+        resultado, posicion = _leer(vista, posicion, tabla)
+        resultados.append(resultado)
+    return resultados
+
+
+if __name__ == "__main__":
+    import pickle
+    import time
+    import tracemalloc
+
+    from BENCHMARK import instancia_euclidiana
+    from HEURISTICAS import tsp_heuristico
+    from MATRIZ import ejemplo_peru
+
+    nombres_ciudades, distancias = ejemplo_peru()
+    resultado = ResultadoRuta.desde_tupla(tsp_heuristico(distancias), nombres_ciudades)
+    print("=== Resultado compacto (Perú) ===")
+    print(resultado)
+    print("Ruta:", resultado.texto())
+    ruta_indices, ruta_nombres, costo, mejoras = resultado
+    print("Como tupla:", ruta_indices, ruta_nombres, costo, mejoras)
+    print("Bytes:", len(resultado.a_bytes()), " pickle de la tupla:", len(pickle.dumps(resultado.como_tupla())))
+    print()
+
+    # Miles de rutas por segundo: armar, serializar y leer resultados
+    n = 200
+    nombres = [f"Parada {i}" for i in range(n)]
+    tupla = tsp_heuristico(instancia_euclidiana(n, semilla=1), nombres)
+    tabla = TablaCiudades.compartida(nombres)
+    repeticiones = 20000
+    print(f"=== {repeticiones} resultados de {n} ciudades ===")
+    print(f"{'':24s} {'Tiempo (s)':>11s} {'Memoria (MB)':>13s} {'Bytes/resultado':>16s}")
+
+    def medir(titulo, funcion):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        salida = funcion()
+        tiempo = time.perf_counter() - inicio
+        memoria = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+        return titulo, salida, tiempo, memoria
+
+    filas = [
+        medir("tuplas con nombres", lambda: [(list(tupla[0]), [nombres[i] for i in tupla[0]], tupla[2], tupla[3])
+                                             for _ in range(repeticiones)]),
+        medir("ResultadoRuta", lambda: [ResultadoRuta.desde_tupla(tupla, tabla) for _ in range(repeticiones)]),
+    ]
+    for titulo, salida, tiempo, memoria in filas:
+        print(f"{titulo:24s} {tiempo:11.3f} {memoria:13.1f} {'-':>16s}")
+
+    resultados = filas[1][1]
+    inicio = time.perf_counter()
+    bloque = pickle.dumps([r.como_tupla() for r in resultados])
+    tiempo_pickle = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    pickle.loads(bloque)
+    tiempo_pickle += time.perf_counter() - inicio
+    print(f"{'pickle de tuplas (ida+vuelta)':24s} {tiempo_pickle:11.3f} {'-':>13s} {len(bloque) / repeticiones:16.0f}")
+
+    inicio = time.perf_counter()
+    datos = serializar(resultados)
+    leidos = deserializar(datos, tabla)
+    tiempo_binario = time.perf_counter() - inicio
+    assert leidos == resultados
+    print(f"{'binario (ida+vuelta)':24s} {tiempo_binario:11.3f} {'-':>13s} {len(datos) / repeticiones:16.0f}")
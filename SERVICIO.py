@@ -0,0 +1,545 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+
+import INSTRUMENTACION
+import LOTES
+from HELD_KARP import tsp_held_karp
+from HEURISTICAS import tsp_heuristico
+from MEMOIZACION import tsp_top_down_memo, tsp_top_down_memo_podado
+from PROGRAMACION_ENTERA import tsp_programacion_entera
+from RESULTADO import ResultadoRuta
+from VECINOS import huella_matriz
+
+# Plazo de una solicitud si no trae 'plazo_ms'
+PLAZO_POR_DEFECTO_S = 5.0
+
+# Cuerpo máximo aceptado (bytes); una matriz de 1000 x 1000 enteros entra holgada
+MAX_CUERPO = 64 * 2 ** 20
+
+# Resultados exactos ya terminados que se recuerdan (por clave de instancia)
+MAX_RESULTADOS_EN_MEMORIA = 1024
+
+# Límites (segundos) de los buckets del histograma de latencias
+LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Solvers que se pueden pedir por nombre ("auto" elige según el tamaño, como LOTES)
+SOLVERS = dict(
+    LOTES.SOLVERS,
+    held_karp_python=tsp_held_karp,
+    top_down_memo=tsp_top_down_memo,
+    top_down_memo_podado=tsp_top_down_memo_podado,
+    programacion_entera=tsp_programacion_entera,
+)
+
+# Memoria máxima (bytes) de la tabla de una programación dinámica pedida por
+# nombre: con más, el proceso del pool se quedaría sin memoria antes de que
+# el plazo sirva de algo. Lo lento pero factible no se rechaza: si vence el
+# plazo se responde la ruta de respaldo
+MAX_MEMORIA_TABLA = 2 * 2 ** 30
+
+# Bytes por estado (ciudad, subconjunto) del diccionario de la memorización
+# top-down (clave, valor y entrada del diccionario, medido con tracemalloc)
+BYTES_POR_ESTADO_MEMO = 120
+
+# Desde este tamaño la huella de la matriz (O(n^2)) se calcula en un hilo
+# para no frenar el bucle de eventos; con matrices chicas el salto a otro
+# hilo cuesta más que el cálculo
+MIN_CIUDADES_HUELLA_EN_HILO = 64
+
+
+def memoria_tabla(solver, n):
+    """
+    Bytes aproximados de la tabla que guarda 'solver' con n ciudades (0 si
+    no guarda tablas), con m = n - 1:
+    - Held-Karp por capas: los padres de todas las capas (m * 2^(m-1)
+      bytes) y dos capas de costos del tamaño de la mayor (C(m, m/2) * m, de
+      hasta 8 bytes)
+    - memorización top-down: hasta m * 2^m estados en un diccionario
+    """
+    m = max(n - 1, 0)
+    if solver in ("held_karp", "held_karp_python"):
+        return (m << m) // 2 + 2 * math.comb(m, m // 2) * m * 8
+    if solver in ("top_down_memo", "top_down_memo_podado"):
+        return (m << m) * BYTES_POR_ESTADO_MEMO
+    return 0
+
+
+# ==========================
+# TRABAJO EN EL POOL DE PROCESOS
+# ==========================
+
+def _resolver_en_trabajador(nombre_solver, distancias, ciudad_inicio, medir):
+    """
+    Corre en un proceso del pool. Devuelve (bytes del ResultadoRuta, métricas
+    del trabajador o None).
+    """
+    if medir and not INSTRUMENTACION.esta_habilitado():
+        INSTRUMENTACION.habilitar()
+    resultado = ResultadoRuta.desde_tupla(SOLVERS[nombre_solver](distancias, None, ciudad_inicio)).a_bytes()
+    metricas = None
+    if medir:
+        metricas = INSTRUMENTACION.instantanea()
+        INSTRUMENTACION.reiniciar()
+    return resultado, metricas
+
+
+def _validar(distancias, nombres_ciudades, ciudad_inicio):
+    if not isinstance(distancias, list) or not distancias:
+        raise ValueError("'distancias' debe ser una matriz cuadrada no vacía")
+    n = len(distancias)
+    for fila in distancias:
+        if not isinstance(fila, list) or len(fila) != n:
+            raise ValueError("'distancias' debe ser una matriz cuadrada no vacía")
+    if not isinstance(ciudad_inicio, int) or not 0 <= ciudad_inicio < n:
+        raise ValueError(f"'ciudad_inicio' debe estar entre 0 y {n - 1}")
+    if nombres_ciudades is not None and len(nombres_ciudades) != n:
+        raise ValueError("'nombres_ciudades' debe tener un nombre por ciudad")
+
+
+# ==========================
+# HISTOGRAMA DE LATENCIAS
+# ==========================
+
+class HistogramaLatencias:
+    """
+    Histograma acumulado al estilo Prometheus, separado por etiqueta
+    (por ejemplo "optimo", "mejor_hasta_ahora" o "error").
+    """
+
+    def __init__(self, limites=LIMITES_LATENCIA):
+        self.limites = tuple(limites)
+        self.cuentas = {}
+        self.sumas = {}
+
+    def observar(self, segundos, etiqueta):
+        cuentas = self.cuentas.get(etiqueta)
+        if cuentas is None:
+            cuentas = self.cuentas[etiqueta] = [0] * (len(self.limites) + 1)
+            self.sumas[etiqueta] = 0.0
+        for i, limite in enumerate(self.limites):
+            if segundos <= limite:
+                cuentas[i] += 1
+        cuentas[-1] += 1
+        self.sumas[etiqueta] += segundos
+
+    def lineas_prometheus(self, nombre):
+        lineas = [
+            f"# HELP {nombre} Latencia de las solicitudes de resolución.",
+            f"# TYPE {nombre} histogram",
+        ]
+        for etiqueta in sorted(self.cuentas):
+            cuentas = self.cuentas[etiqueta]
+            for limite, cuenta in zip(self.limites, cuentas):
+                lineas.append(f'{nombre}_bucket{{resultado="{etiqueta}",le="{limite}"}} {cuenta}')
+            lineas.append(f'{nombre}_bucket{{resultado="{etiqueta}",le="+Inf"}} {cuentas[-1]}')
+            lineas.append(f'{nombre}_sum{{resultado="{etiqueta}"}} {self.sumas[etiqueta]:.9f}')
+            lineas.append(f'{nombre}_count{{resultado="{etiqueta}"}} {cuentas[-1]}')
+        return lineas
+
+
+# ==========================
+# SERVICIO
+# ==========================
+
+class _Trabajo:
+    """
+    Una resolución en curso, compartida por todas las solicitudes con la
+    misma clave. 'principal' es la tarea del solver pedido; 'respaldo' (si
+    hay) es el heurístico que corre a la par para tener una ruta a tiempo.
+    """
+
+    __slots__ = ("principal", "respaldo", "es_exacto")
+
+    def __init__(self, principal, respaldo, es_exacto):
+        self.principal = principal
+        self.respaldo = respaldo
+        self.es_exacto = es_exacto
+
+
+class Servicio:
+    """
+    Servicio asyncio que resuelve TSP en un pool de procesos.
+    - Solicitudes iguales (misma huella de matriz, inicio y solver) que llegan
+      mientras la primera se resuelve esperan ese mismo cálculo.
+    - Cada solicitud tiene un plazo: si vence antes que el solver exacto, se
+      responde con la mejor ruta disponible (el heurístico que corre a la
+      par) marcada con es_optimo=False. El cálculo exacto sigue y queda en
+      memoria para las siguientes solicitudes.
+    - Un solver pedido por nombre cuya tabla (memoria_tabla) pasaría de
+      MAX_MEMORIA_TABLA se rechaza (400 por HTTP); si solo es lento, el
+      plazo se encarga.
+    Se puede usar sin red con await servicio.resolver(...) o por HTTP con
+    iniciar(host, puerto):
+        POST /resolver   {"distancias": [[...]], "nombres_ciudades": [...],
+                          "ciudad_inicio": 0, "solver": "auto", "plazo_ms": 1000}
+                         con "formato": "binario" responde la ruta en el formato de
+                         ResultadoRuta.a_bytes() y es_optimo, solver, origen y
+                         segundos en cabeceras X-...
+        GET  /metricas   histograma de latencias y métricas de los solvers (Prometheus)
+        GET  /salud
+    """
+
+    def __init__(self, num_procesos=None, plazo_por_defecto_s=PLAZO_POR_DEFECTO_S):
+        if num_procesos is None:
+            num_procesos = os.cpu_count() or 1
+        self.num_procesos = num_procesos
+        self.plazo_por_defecto_s = plazo_por_defecto_s
+        self.latencias = HistogramaLatencias()
+        self.solicitudes = {}
+        self._en_curso = {}
+        self._resueltos = OrderedDict()
+        self._servidor = None
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_procesos,
+            initializer=LOTES._calentar_trabajador,
+        )
+        # Levantamos los procesos ya: si se crearan con la primera solicitud,
+        # heredarían (fork) el socket de esa conexión y cerrarla no le
+        # llegaría al cliente
+        self._executor.submit(os.getpid).result()
+
+    # ---------- resolución ----------
+
+    async def _en_pool(self, nombre_solver, distancias, ciudad_inicio):
+        loop = asyncio.get_running_loop()
+        resultado, metricas = await loop.run_in_executor(
+            self._executor, _resolver_en_trabajador,
+            nombre_solver, distancias, ciudad_inicio, INSTRUMENTACION.esta_habilitado(),
+        )
+        if metricas is not None:
+            INSTRUMENTACION.fusionar(metricas)
+        return ResultadoRuta.desde_bytes(resultado)
+
+    def _lanzar(self, clave, nombre_solver, distancias, ciudad_inicio):
+        es_exacto = nombre_solver != "heuristico"
+        # El respaldo se encola primero: es rápido y así está listo aunque el pool esté ocupado
+        respaldo = None
+        if es_exacto and len(distancias) > LOTES.MAX_N_FUERZA_BRUTA:
+            respaldo = asyncio.ensure_future(self._en_pool("heuristico", distancias, ciudad_inicio))
+            respaldo.add_done_callback(_descartar_error)
+        principal = asyncio.ensure_future(self._en_pool(nombre_solver, distancias, ciudad_inicio))
+        trabajo = _Trabajo(principal, respaldo, es_exacto)
+        self._en_curso[clave] = trabajo
+
+        def al_terminar(tarea):
+            self._en_curso.pop(clave, None)
+            if not tarea.cancelled() and tarea.exception() is None:
+                self._resueltos[clave] = (tarea.result(), es_exacto)
+                while len(self._resueltos) > MAX_RESULTADOS_EN_MEMORIA:
+                    self._resueltos.popitem(last=False)
+
+        principal.add_done_callback(al_terminar)
+        return trabajo
+
+    async def resolver(self, distancias, nombres_ciudades=None, ciudad_inicio=0,
+                       solver="auto", plazo_s=None):
+        """
+        Devuelve un diccionario con ruta, ruta_nombres, costo, es_optimo,
+        solver, origen ("calculada", "compartida" o "memoria") y segundos.
+        """
+        resultado, es_optimo, solver, origen, segundos = await self.resolver_compacto(
+            distancias, nombres_ciudades, ciudad_inicio, solver, plazo_s
+        )
+        return {
+            "ruta": resultado.indices.tolist(),
+            "ruta_nombres": resultado.nombres,
+            "costo": resultado.costo,
+            "es_optimo": es_optimo,
+            "solver": solver,
+            "origen": origen,
+            "segundos": segundos,
+        }
+
+    async def resolver_compacto(self, distancias, nombres_ciudades=None, ciudad_inicio=0,
+                                solver="auto", plazo_s=None):
+        """
+        Como resolver(), pero sin armar listas: devuelve
+        (ResultadoRuta, es_optimo, solver, origen, segundos). Los resultados
+        guardados en memoria también son ResultadoRuta, así que responder
+        desde memoria no copia la ruta.
+        """
+        inicio = time.perf_counter()
+        try:
+            _validar(distancias, nombres_ciudades, ciudad_inicio)
+            if solver == "auto":
+                solver = LOTES.elegir_solver(len(distancias))
+            elif solver not in SOLVERS:
+                raise ValueError(f"Solver desconocido: {solver!r}")
+            elif memoria_tabla(solver, len(distancias)) > MAX_MEMORIA_TABLA:
+                raise ValueError(
+                    f"El solver {solver!r} necesitaría unos "
+                    f"{memoria_tabla(solver, len(distancias)) / 2 ** 30:.1f} GB de tabla para "
+                    f"{len(distancias)} ciudades (máximo {MAX_MEMORIA_TABLA / 2 ** 30:.0f} GB)"
+                )
+            if plazo_s is None:
+                plazo_s = self.plazo_por_defecto_s
+
+            if len(distancias) >= MIN_CIUDADES_HUELLA_EN_HILO:
+                huella = await asyncio.to_thread(huella_matriz, distancias)
+            else:
+                huella = huella_matriz(distancias)
+            clave = f"{solver}|{ciudad_inicio}|{huella.hex()}"
+            guardado = self._resueltos.get(clave)
+            if guardado is not None:
+                self._resueltos.move_to_end(clave)
+                resultado, es_optimo = guardado
+                origen = "memoria"
+            else:
+                trabajo = self._en_curso.get(clave)
+                origen = "compartida" if trabajo is not None else "calculada"
+                if trabajo is None:
+                    trabajo = self._lanzar(clave, solver, distancias, ciudad_inicio)
+                restante = max(0.0, plazo_s - (time.perf_counter() - inicio))
+                try:
+                    resultado = await asyncio.wait_for(asyncio.shield(trabajo.principal), restante)
+                    es_optimo = trabajo.es_exacto
+                except asyncio.TimeoutError:
+                    resultado = await self._mejor_hasta_ahora(trabajo, distancias, ciudad_inicio)
+                    es_optimo = False
+        except Exception:
+            self.latencias.observar(time.perf_counter() - inicio, "error")
+            raise
+
+        if nombres_ciudades is not None:
+            resultado = resultado.con_tabla(nombres_ciudades)
+
+        segundos = time.perf_counter() - inicio
+        self.latencias.observar(segundos, "optimo" if es_optimo else "mejor_hasta_ahora")
+        self.solicitudes[origen] = self.solicitudes.get(origen, 0) + 1
+        return resultado, es_optimo, solver, origen, segundos
+
+    async def _mejor_hasta_ahora(self, trabajo, distancias, ciudad_inicio):
+        """
+        Plazo vencido: la ruta del heurístico de respaldo si ya terminó; si no,
+        una construcción de vecino más cercano (sin búsqueda local) en un hilo.
+        """
+        respaldo = trabajo.respaldo
+        if respaldo is not None and respaldo.done() and respaldo.exception() is None:
+            return respaldo.result()
+        resultado = await asyncio.to_thread(
+            tsp_heuristico, distancias, None, ciudad_inicio, busqueda_local=False
+        )
+        return ResultadoRuta.desde_tupla(resultado)
+
+    # ---------- métricas ----------
+
+    def metricas_prometheus(self):
+        lineas = self.latencias.lineas_prometheus("tsp_servicio_latencia_segundos")
+        lineas += [
+            "# HELP tsp_servicio_solicitudes_total Solicitudes respondidas según de dónde salió la ruta.",
+            "# TYPE tsp_servicio_solicitudes_total counter",
+        ]
+        for origen, cuenta in sorted(self.solicitudes.items()):
+            lineas.append(f'tsp_servicio_solicitudes_total{{origen="{origen}"}} {cuenta}')
+        lineas += [
+            "# HELP tsp_servicio_en_curso Resoluciones lanzadas que aún no terminan.",
+            "# TYPE tsp_servicio_en_curso gauge",
+            f"tsp_servicio_en_curso {len(self._en_curso)}",
+        ]
+        return "\n".join(lineas) + "\n" + INSTRUMENTACION.exportar_prometheus()
+
+    # ---------- HTTP ----------
+
+    async def iniciar(self, host="127.0.0.1", puerto=8080):
+        """
+        Empieza a escuchar HTTP. Con puerto=0 el sistema elige uno libre.
+        Devuelve el puerto en uso.
+        """
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def detener(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        for trabajo in list(self._en_curso.values()):
+            trabajo.principal.cancel()
+            if trabajo.respaldo is not None:
+                trabajo.respaldo.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.detener()
+
+    async def _atender(self, lector, escritor):
+        try:
+            cabeceras = ""
+            try:
+                metodo, ruta, cuerpo = await _leer_solicitud(lector)
+                if ruta == "/resolver" and metodo == "POST":
+                    datos = json.loads(cuerpo or b"{}")
+                    plazo_ms = datos.get("plazo_ms")
+                    argumentos = (
+                        datos.get("distancias"),
+                        datos.get("nombres_ciudades"),
+                        datos.get("ciudad_inicio", 0),
+                        datos.get("solver", "auto"),
+                        None if plazo_ms is None else plazo_ms / 1000,
+                    )
+                    if datos.get("formato") == "binario":
+                        # La ruta en el formato de ResultadoRuta.a_bytes(); el resto en cabeceras
+                        resultado, es_optimo, solver, origen, segundos = await self.resolver_compacto(*argumentos)
+                        estado, tipo, contenido = 200, "application/octet-stream", resultado.a_bytes()
+                        cabeceras = (f"X-Es-Optimo: {str(es_optimo).lower()}\r\nX-Solver: {solver}\r\n"
+                                     f"X-Origen: {origen}\r\nX-Segundos: {segundos:.6f}\r\n")
+                    else:
+                        respuesta = await self.resolver(*argumentos)
+                        estado, tipo, contenido = 200, "application/json", json.dumps(respuesta, ensure_ascii=False)
+                elif ruta == "/metricas" and metodo == "GET":
+                    estado, tipo, contenido = 200, "text/plain; version=0.0.4", self.metricas_prometheus()
+                elif ruta == "/salud" and metodo == "GET":
+                    estado, tipo, contenido = 200, "application/json", json.dumps({"estado": "ok"})
+                else:
+                    estado, tipo, contenido = 404, "application/json", json.dumps({"error": "no encontrado"})
+            except (ValueError, TypeError, AttributeError) as error:
+                estado, tipo, contenido = 400, "application/json", json.dumps({"error": str(error)}, ensure_ascii=False)
+            except Exception as error:
+                estado, tipo, contenido = 500, "application/json", json.dumps({"error": repr(error)}, ensure_ascii=False)
+
+            if isinstance(contenido, bytes):
+                datos = contenido
+            else:
+                datos = contenido.encode("utf-8")
+                tipo += "; charset=utf-8"
+            escritor.write(
+                f"HTTP/1.1 {estado} {_RAZONES[estado]}\r\n"
+                f"Content-Type: {tipo}\r\n"
+                f"Content-Length: {len(datos)}\r\n{cabeceras}"
+                "Connection: close\r\n\r\n".encode("latin-1") + datos
+            )
+            await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+
+_RAZONES = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+def _descartar_error(tarea):
+    # El respaldo puede fallar sin que nadie lo espere; se marca como leído
+    if not tarea.cancelled():
+        tarea.exception()
+
+
+async def _leer_solicitud(lector):
+    """
+    Lee una solicitud HTTP/1.1 mínima: línea inicial, cabeceras y cuerpo por Content-Length.
+    """
+    linea = await lector.readline()
+    partes = linea.decode("latin-1").split()
+    if len(partes) != 3:
+        raise ValueError("Solicitud HTTP mal formada")
+    metodo, ruta, _ = partes
+    largo = 0
+    while True:
+        linea = await lector.readline()
+        if linea in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.strip().lower() == "content-length":
+            largo = int(valor.strip())
+    if largo > MAX_CUERPO:
+        raise ValueError("Cuerpo demasiado grande")
+    cuerpo = await lector.readexactly(largo) if largo else b""
+    return metodo, ruta.split("?", 1)[0], cuerpo
+
+
+async def solicitar(host, puerto, metodo, ruta, datos=None):
+    """
+    Cliente HTTP mínimo para probar el servicio en local.
+    Devuelve (estado, cuerpo): el cuerpo ya decodificado si es JSON y en
+    bytes si es binario.
+    """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    cuerpo = b"" if datos is None else json.dumps(datos).encode("utf-8")
+    escritor.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo
+    )
+    await escritor.drain()
+    respuesta = await lector.read()
+    escritor.close()
+    cabecera, _, contenido = respuesta.partition(b"\r\n\r\n")
+    estado = int(cabecera.split(None, 2)[1])
+    if b"application/octet-stream" in cabecera:
+        return estado, contenido
+    texto = contenido.decode("utf-8")
+    if b"application/json" in cabecera:
+        return estado, json.loads(texto)
+    return estado, texto
+
+
+# ==========================
+# EJECUCIÓN
+# ==========================
+
+async def _demo(num_procesos):
+    from BENCHMARK import instancia_euclidiana
+
+    async with Servicio(num_procesos) as servicio:
+        puerto = await servicio.iniciar("127.0.0.1", 0)
+        print(f"=== Servicio TSP de prueba en 127.0.0.1:{puerto} ===")
+
+        # Cinco solicitudes iguales a la vez: se calculan una sola vez
+        distancias = instancia_euclidiana(14, semilla=1)
+        respuestas = await asyncio.gather(*(
+            solicitar("127.0.0.1", puerto, "POST", "/resolver", {"distancias": distancias})
+            for _ in range(5)
+        ))
+        for estado, cuerpo in respuestas:
+            print(estado, cuerpo["origen"], cuerpo["costo"], "óptimo" if cuerpo["es_optimo"] else "no óptimo")
+
+        # Plazo muy corto con Held-Karp grande: devuelve la mejor ruta disponible
+        distancias = instancia_euclidiana(18, semilla=2)
+        estado, cuerpo = await solicitar("127.0.0.1", puerto, "POST", "/resolver",
+                                         {"distancias": distancias, "solver": "held_karp", "plazo_ms": 50})
+        print(estado, cuerpo["origen"], cuerpo["costo"], "óptimo" if cuerpo["es_optimo"] else "no óptimo",
+              f"{cuerpo['segundos'] * 1000:.1f} ms")
+
+        # Respuesta binaria: la misma ruta en bytes, sin listas ni JSON
+        estado, datos = await solicitar("127.0.0.1", puerto, "POST", "/resolver",
+                                        {"distancias": distancias, "formato": "binario"})
+        resultado = ResultadoRuta.desde_bytes(datos)
+        print(estado, "binario:", len(datos), "bytes,", resultado)
+
+        _, texto = await solicitar("127.0.0.1", puerto, "GET", "/metricas")
+        print(texto)
+
+
+async def _servir(host, puerto, num_procesos):
+    async with Servicio(num_procesos) as servicio:
+        puerto = await servicio.iniciar(host, puerto)
+        print(f"Servicio TSP escuchando en http://{host}:{puerto}")
+        await asyncio.Event().wait()
+
+
+def principal(argumentos=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP de resolución de TSP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--demo", action="store_true", help="levanta el servicio, le envía solicitudes y termina")
+    args = parser.parse_args(argumentos)
+    try:
+        if args.demo:
+            asyncio.run(_demo(args.procesos))
+        else:
+            asyncio.run(_servir(args.host, args.puerto, args.procesos))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    principal()
@@ -0,0 +1,333 @@
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo lo usan las versiones vectorizadas
+    np = None
+
+
+# ==========================
+# MÁSCARAS Y BITS (ENTEROS DE PYTHON)
+# ==========================
+
+def mascaras_de_tamano(m, k):
+    """
+    Todas las máscaras de m bits con exactamente k bits encendidos, de menor
+    a mayor (truco de Gosper: cada máscara sale de la anterior con unas
+    pocas operaciones de bits, sin combinations() ni armar la máscara).
+    """
+    if k == 0:
+        yield 0
+        return
+    if k > m:
+        return
+    mask = (1 << k) - 1
+    limite = 1 << m
+    while mask < limite:
+        yield mask
+        bajo = mask & -mask             # bit encendido más bajo
+        subida = mask + bajo            # sube ese bloque de unos un lugar
+        mask = subida | (((mask ^ subida) >> 2) // bajo)
+
+
+def bits(mask):
+    """
+    Posiciones de los bits encendidos de 'mask', de menor a mayor: se extrae
+    el bit más bajo (mask & -mask) en lugar de probar las n posiciones.
+    """
+    while mask:
+        bajo = mask & -mask
+        yield bajo.bit_length() - 1
+        mask ^= bajo
+
+
+def bits_apagados(mask, m):
+    """
+    Posiciones (menores que m) de los bits apagados de 'mask'.
+    """
+    return bits(~mask & ((1 << m) - 1))
+
+
+# ==========================
+# RANGO EN EL SISTEMA COMBINATORIO
+# ==========================
+
+def tabla_binomial(m):
+    """
+    binom[b][i] = C(b, i) para 0 <= b <= m y 0 <= i <= m + 1.
+    """
+    binom = [[0] * (m + 2) for _ in range(m + 1)]
+    for b in range(m + 1):
+        binom[b][0] = 1
+        for i in range(1, b + 1):
+            binom[b][i] = binom[b - 1][i - 1] + binom[b - 1][i]
+    return binom
+
+
+def rango(mask, binom):
+    """
+    Posición de 'mask' entre las máscaras con su mismo número de bits, en
+    orden numérico (el orden de mascaras_de_tamano): suma de C(b_i, i) sobre
+    los bits encendidos b_1 < b_2 < ...
+    """
+    r = 0
+    i = 1
+    while mask:
+        bajo = mask & -mask
+        r += binom[bajo.bit_length() - 1][i]
+        i += 1
+        mask ^= bajo
+    return r
+
+
+def desrango(r, k, binom):
+    """
+    Inversa de rango(): la máscara de k bits que ocupa la posición r.
+    """
+    mask = 0
+    b = len(binom) - 2
+    for i in range(k, 0, -1):
+        # Mayor b con C(b, i) <= r; los bits salen de mayor a menor, así que
+        # la búsqueda sigue bajando desde el bit anterior (O(m) en total)
+        while binom[b][i] > r:
+            b -= 1
+        r -= binom[b][i]
+        mask |= 1 << b
+        b -= 1
+    return mask
+
+
+class IndiceCapas:
+    """
+    Índice de la tabla de una DP sobre subconjuntos de m ciudades, guardada
+    por capas: la capa k tiene una fila por máscara de k bits (C(m, k) filas
+    en lugar de 2^m) y, dentro de la fila, una posición por cada ciudad de
+    la máscara (k en lugar de m). La fila de una máscara es su rango.
+        indice = IndiceCapas(m)
+        for r, mask in enumerate(indice.mascaras(k)):   # r == indice.rango(mask)
+            fila = r * k
+    """
+
+    __slots__ = ("m", "binom")
+
+    def __init__(self, m):
+        self.m = m
+        self.binom = tabla_binomial(m)
+
+    def tamano(self, k):
+        """
+        Número de máscaras de la capa k, C(m, k).
+        """
+        return self.binom[self.m][k]
+
+    def mascaras(self, k):
+        return mascaras_de_tamano(self.m, k)
+
+    def rango(self, mask):
+        return rango(mask, self.binom)
+
+    def desrango(self, r, k):
+        return desrango(r, k, self.binom)
+
+    @staticmethod
+    def posicion(mask, j):
+        """
+        Posición de la ciudad j dentro de su máscara (bits encendidos debajo de j).
+        """
+        return (mask & ((1 << j) - 1)).bit_count()
+
+    def rangos_sin_cada_bit(self, posiciones):
+        """
+        Para la máscara con bits 'posiciones' (lista creciente), el rango de la
+        máscara sin el bit posiciones[p], para cada p, en O(k) en total: los
+        bits por debajo de p conservan su índice en la suma y los de arriba
+        bajan uno (prefijos y sufijos de la suma del rango).
+        """
+        binom = self.binom
+        k = len(posiciones)
+        sufijo = [0] * (k + 1)
+        for t in range(k - 1, -1, -1):
+            sufijo[t] = sufijo[t + 1] + binom[posiciones[t]][t]
+        rangos = []
+        prefijo = 0
+        for t in range(k):
+            rangos.append(prefijo + sufijo[t + 1])
+            prefijo += binom[posiciones[t]][t + 1]
+        return rangos
+
+
+# ==========================
+# VERSIONES VECTORIZADAS (NUMPY)
+# ==========================
+
+def mascaras_por_capa(m):
+    """
+    Devuelve una lista donde capas[k] es un arreglo numpy (ordenado) con todas
+    las máscaras de m bits que tienen exactamente k bits encendidos.
+    """
+    mascaras = np.arange(1 << m, dtype=np.int64)
+    cuenta_bits = np.zeros(1 << m, dtype=np.int8)
+    for b in range(m):
+        cuenta_bits += ((mascaras >> b) & 1).astype(np.int8)
+    orden = np.argsort(cuenta_bits, kind='stable')
+    cortes = np.cumsum(np.bincount(cuenta_bits, minlength=m + 1))[:-1]
+    return np.split(mascaras[orden], cortes)
+
+
+def binomiales(m):
+    """
+    binom[b, i] = C(b, i) para 0 <= b <= m y 0 <= i <= m + 1 (arreglo numpy).
+    """
+    binom = np.zeros((m + 1, m + 2), dtype=np.int64)
+    binom[:, 0] = 1
+    for b in range(1, m + 1):
+        binom[b, 1:] = binom[b - 1, 1:] + binom[b - 1, :-1]
+    return binom
+
+
+def rango_mascaras(mascaras, binom, m):
+    """
+    rango() aplicado a un arreglo de máscaras.
+    """
+    rangos = np.zeros(len(mascaras), dtype=np.int64)
+    cuenta = np.zeros(len(mascaras), dtype=np.int64)
+    for b in range(m):
+        bit = (mascaras >> b) & 1
+        cuenta += bit
+        rangos += bit * binom[b, cuenta]
+    return rangos
+
+
+def mascaras_por_rango(desde, hasta, k, binom, m):
+    """
+    desrango() vectorizado: las máscaras de k bits con rango en [desde, hasta).
+    """
+    resto = np.arange(desde, hasta, dtype=np.int64)
+    mascaras = np.zeros_like(resto)
+    for i in range(k, 0, -1):
+        columna = binom[:m, i]
+        b = np.searchsorted(columna, resto, side='right') - 1
+        resto -= columna[b]
+        mascaras |= np.left_shift(1, b)
+    return mascaras
+
+
+def rangos_sin_cada_bit_mascaras(mascaras, binom, m):
+    """
+    IndiceCapas.rangos_sin_cada_bit para un arreglo de máscaras (todas con
+    el mismo número de bits). Devuelve (rangos, posiciones), arreglos de
+    forma (len(mascaras), m): rangos[r, j] es el rango de mascaras[r] sin el
+    bit j y posiciones[r, j] la posición de j dentro de la máscara (solo
+    tienen sentido si j está en la máscara). Los bits por debajo de j
+    conservan su término C(b, i) de la suma y los de arriba pasan a C(b, i - 1).
+    """
+    cantidad = len(mascaras)
+    con_indice = np.zeros((cantidad, m), dtype=np.int64)
+    sin_indice = np.zeros((cantidad, m), dtype=np.int64)
+    posiciones = np.zeros((cantidad, m), dtype=np.int64)
+    cuenta = np.zeros(cantidad, dtype=np.int64)
+    for b in range(m):
+        bit = (mascaras >> b) & 1
+        posiciones[:, b] = cuenta
+        cuenta += bit
+        con_indice[:, b] = bit * binom[b, cuenta]
+        sin_indice[:, b] = bit * binom[b, cuenta - bit]
+    # Suma de los términos de los bits por debajo de j (sin incluir j) más
+    # la de los bits por encima de j con el índice bajado en uno
+    debajo = np.cumsum(con_indice, axis=1) - con_indice
+    encima = sin_indice.sum(axis=1)[:, None] - np.cumsum(sin_indice, axis=1)
+    return debajo + encima, posiciones
+
+
+def bits_debajo(mascaras, j):
+    """
+    Cuántos bits encendidos tiene cada máscara por debajo del bit j
+    (es la posición de j dentro de la máscara).
+    """
+    cuenta = np.zeros(len(mascaras), dtype=np.int64)
+    for b in range(j):
+        cuenta += (mascaras >> b) & 1
+    return cuenta
+
+
+if __name__ == "__main__":
+    import time
+    from itertools import combinations
+
+    def medir(funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        return resultado, time.perf_counter() - inicio
+
+    print("=== Enumerar todas las máscaras de k bits (m bits, todas las capas) ===")
+    print(f"{'m':>3s} {'Máscaras':>10s} {'combinations (s)':>17s} {'Gosper (s)':>11s} {'numpy (s)':>10s}")
+    for m in (16, 18, 20):
+        def con_combinations():
+            total = 0
+            for k in range(m + 1):
+                for combo in combinations(range(m), k):
+                    mask = 0
+                    for b in combo:
+                        mask |= 1 << b
+                    total += 1
+            return total
+
+        def con_gosper():
+            total = 0
+            for k in range(m + 1):
+                for _ in mascaras_de_tamano(m, k):
+                    total += 1
+            return total
+
+        total, t_combinations = medir(con_combinations)
+        total_gosper, t_gosper = medir(con_gosper)
+        assert total == total_gosper == 1 << m
+        texto_numpy = "-"
+        if np is not None:
+            _, t_numpy = medir(lambda: mascaras_por_capa(m))
+            texto_numpy = f"{t_numpy:.4f}"
+        print(f"{m:3d} {total:10d} {t_combinations:17.4f} {t_gosper:11.4f} {texto_numpy:>10s}")
+
+    print("\n=== Recorrer los bits libres de cada máscara (m = 20) ===")
+    m = 20
+    todas = (1 << m) - 1
+    muestra = list(range(0, 1 << m, 7))
+
+    def probando_posiciones():
+        total = 0
+        for mask in muestra:
+            for b in range(m):
+                if (mask & (1 << b)) == 0:
+                    total += b
+        return total
+
+    def bit_mas_bajo():
+        total = 0
+        for mask in muestra:
+            libres = todas ^ mask
+            while libres:
+                bajo = libres & -libres
+                total += bajo.bit_length() - 1
+                libres ^= bajo
+        return total
+
+    a, t_posiciones = medir(probando_posiciones)
+    b, t_bajo = medir(bit_mas_bajo)
+    assert a == b
+    print(f"range(m) + prueba de bit: {t_posiciones:.4f} s   extracción del bit más bajo: {t_bajo:.4f} s")
+
+    print("\n=== Rango y desrango (m = 20, k = 10) ===")
+    indice = IndiceCapas(20)
+    mascaras = list(indice.mascaras(10))
+    rangos, t_rango = medir(lambda: [indice.rango(x) for x in mascaras])
+    assert rangos == list(range(len(mascaras)))
+    vuelta, t_desrango = medir(lambda: [indice.desrango(r, 10) for r in range(0, len(mascaras), 16)])
+    assert vuelta == mascaras[::16]
+    print(f"{len(mascaras)} máscaras: rango {len(mascaras) / t_rango:,.0f}/s   "
+          f"desrango {len(vuelta) / t_desrango:,.0f}/s")
+
+    print("\n=== Tamaño de la tabla de Held-Karp (posiciones) ===")
+    print(f"{'m':>3s} {'Tabla plana m*2^m':>18s} {'Mayor capa C(m,k)*k':>20s} {'Dos capas':>10s}")
+    for m in (16, 20, 24):
+        indice = IndiceCapas(m)
+        capas = [indice.tamano(k) * k for k in range(m + 1)]
+        dos = max(capas[k] + capas[k - 1] for k in range(1, m + 1))
+        print(f"{m:3d} {m << m:18d} {max(capas):20d} {dos:10d}")
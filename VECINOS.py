@@ -0,0 +1,196 @@
+import hashlib
+import heapq
+import struct
+import sys
+from array import array
+
+# Cabecera del archivo del índice: firma, versión, n, k y huella SHA-256 de la matriz
+_CABECERA = struct.Struct("<4sHII32s")
+_FIRMA = b"TSPV"
+_VERSION = 1
+
+
+def huella_matriz(distancias):
+    """
+    Huella SHA-256 de la matriz de distancias (cambia si cambia cualquier valor).
+    """
+    h = hashlib.sha256()
+    h.update(str(len(distancias)).encode())
+    for fila in distancias:
+        h.update(repr([fila[b] for b in range(len(distancias))]).encode())
+    return h.digest()
+
+
+def es_simetrica(distancias):
+    """
+    True si d[a][b] == d[b][a] para todo par. Las matrices que ya lo saben
+    (atributo 'simetrica' distinto de None, como las calculadas desde
+    coordenadas) responden sin recorrer los n^2 valores.
+    """
+    simetrica = getattr(distancias, "simetrica", None)
+    if simetrica is not None:
+        return simetrica
+    n = len(distancias)
+    for a in range(n):
+        fila = distancias[a]
+        for b in range(a + 1, n):
+            if fila[b] != distancias[b][a]:
+                return False
+    return True
+
+
+# ==========================
+# ÍNDICE DE VECINOS CANDIDATOS
+# ==========================
+
+class IndiceVecinos:
+    """
+    Las k ciudades más cercanas a cada ciudad, guardadas en un solo arreglo
+    int32 de n * k posiciones (fila a = vecinos de a, del más cercano al más
+    lejano). Se construye una vez por matriz y se puede guardar en disco para
+    reutilizarlo cuando se vuelve a optimizar el mismo conjunto de paradas.
+    """
+
+    __slots__ = ("n", "k", "huella", "_datos", "_filas")
+
+    def __init__(self, n, k, datos, huella=None):
+        self.n = n
+        self.k = k
+        self.huella = huella
+        self._datos = datos
+        vista = memoryview(datos)
+        self._filas = [vista[a * k:(a + 1) * k] for a in range(n)]
+
+    @classmethod
+    def desde_distancias(cls, distancias, k=10):
+        n = len(distancias)
+        k = max(0, min(k, n - 1))
+        datos = array('i')
+        for a in range(n):
+            fila = distancias[a]
+            cercanas = heapq.nsmallest(k + 1, range(n), key=fila.__getitem__)
+            datos.extend([b for b in cercanas if b != a][:k])
+        return cls(n, k, datos, huella_matriz(distancias))
+
+    def __getitem__(self, a):
+        return self._filas[a]
+
+    def __len__(self):
+        return self.n
+
+    def corresponde_a(self, distancias):
+        """
+        True si el índice se construyó con esta misma matriz.
+        """
+        return self.huella == huella_matriz(distancias)
+
+    def guardar(self, ruta_archivo):
+        datos = self._datos
+        if sys.byteorder != "little":
+            datos = array('i', datos)
+            datos.byteswap()
+        with open(ruta_archivo, "wb") as f:
+            f.write(_CABECERA.pack(_FIRMA, _VERSION, self.n, self.k, self.huella or bytes(32)))
+            datos.tofile(f)
+
+    @classmethod
+    def cargar(cls, ruta_archivo, distancias=None):
+        """
+        Lee un índice guardado con guardar(). Si se pasa 'distancias', verifica
+        que el índice corresponda a esa matriz y si no lanza ValueError.
+        """
+        with open(ruta_archivo, "rb") as f:
+            firma, version, n, k, huella = _CABECERA.unpack(f.read(_CABECERA.size))
+            if firma != _FIRMA or version != _VERSION:
+                raise ValueError(f"{ruta_archivo} no es un índice de vecinos válido")
+            datos = array('i')
+            datos.fromfile(f, n * k)
+        if sys.byteorder != "little":
+            datos.byteswap()
+        indice = cls(n, k, datos, huella)
+        if distancias is not None and not indice.corresponde_a(distancias):
+            raise ValueError("El índice de vecinos no corresponde a esta matriz de distancias")
+        return indice
+
+
+# ==========================
+# TOUR EN ARREGLO CON POSICIONES
+# ==========================
+
+class Tour:
+    """
+    Tour cíclico guardado como arreglo de ciudades más la posición de cada
+    ciudad, para saber en O(1) quién va antes o después de una ciudad.
+    """
+
+    __slots__ = ("ciudades", "pos", "n")
+
+    def __init__(self, ciudades):
+        self.n = len(ciudades)
+        self.ciudades = array('i', ciudades)
+        # Las ciudades no tienen por qué ser 0..n-1 (p. ej. si se quitaron paradas)
+        self.pos = array('i', [0]) * (max(self.ciudades) + 1 if self.n else 0)
+        for i, c in enumerate(self.ciudades):
+            self.pos[c] = i
+
+    def siguiente(self, c):
+        return self.ciudades[(self.pos[c] + 1) % self.n]
+
+    def anterior(self, c):
+        return self.ciudades[(self.pos[c] - 1) % self.n]
+
+    def en_tramo(self, c, i, largo):
+        """
+        True si la ciudad c está en el tramo de 'largo' ciudades que empieza en la posición i.
+        """
+        return (self.pos[c] - i) % self.n < largo
+
+    def invertir(self, i, j):
+        """
+        Invierte el tramo cíclico de la posición i a la j (avanzando desde i).
+        Si el tramo es más de la mitad del tour, se invierte el complemento,
+        que produce el mismo ciclo recorrido en sentido contrario.
+        """
+        ciudades, pos, n = self.ciudades, self.pos, self.n
+        largo = (j - i) % n + 1
+        if 2 * largo > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            largo = n - largo
+        for _ in range(largo // 2):
+            ci, cj = ciudades[i], ciudades[j]
+            ciudades[i], ciudades[j] = cj, ci
+            pos[cj], pos[ci] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def mover_tramo(self, i, largo, despues_de, invertido=False):
+        """
+        Saca el tramo de 'largo' ciudades que empieza en la posición i y lo
+        inserta después de la ciudad 'despues_de' (que no debe estar en el tramo).
+        """
+        ciudades, n = self.ciudades, self.n
+        tramo = array('i', (ciudades[(i + t) % n] for t in range(largo)))
+        if invertido:
+            tramo.reverse()
+        # Rotamos para que el tramo quede al final y lo quitamos
+        fin = (i + largo) % n
+        resto = ciudades[fin:] + ciudades[:fin]
+        del resto[n - largo:]
+        k = resto.index(despues_de) + 1
+        self.ciudades = resto[:k] + tramo + resto[k:]
+        for idx, c in enumerate(self.ciudades):
+            self.pos[c] = idx
+
+    def ruta_desde(self, ciudad_inicio):
+        """
+        Lista de ciudades del ciclo empezando y terminando en ciudad_inicio.
+        """
+        k = self.pos[ciudad_inicio]
+        return list(self.ciudades[k:]) + list(self.ciudades[:k]) + [ciudad_inicio]
+
+    def costo(self, distancias):
+        ciudades = self.ciudades
+        total = distancias[ciudades[-1]][ciudades[0]]
+        for i in range(self.n - 1):
+            total += distancias[ciudades[i]][ciudades[i + 1]]
+        return total
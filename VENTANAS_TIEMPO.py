@@ -0,0 +1,237 @@
+import random
+from array import array
+
+import INSTRUMENTACION
+from MATRIZ import ejemplo_peru
+
+INF = float('inf')
+
+
+def _tiempos_minimos(tiempos, servicio):
+    """
+    alcance[a][b] = servicio en a + tiempo mínimo para ir de a a b pasando
+    por cualquier ciudad (Floyd-Warshall). Sirve para saber si una ciudad
+    pendiente todavía se puede alcanzar antes de que cierre su ventana,
+    aunque la matriz de tiempos no cumpla la desigualdad triangular.
+    """
+    n = len(tiempos)
+    minimo = [[tiempos[a][b] for b in range(n)] for a in range(n)]
+    for k in range(n):
+        fila_k = minimo[k]
+        for a in range(n):
+            fila_a = minimo[a]
+            a_k = fila_a[k]
+            for b in range(n):
+                if a_k + fila_k[b] < fila_a[b]:
+                    fila_a[b] = a_k + fila_k[b]
+    return [[servicio[a] + minimo[a][b] for b in range(n)] for a in range(n)]
+
+
+def _agregar_etiqueta(frente, costo, llegada, costos, llegadas):
+    """
+    Frente de Pareto de un estado (mask, j): etiquetas (costo, llegada) donde
+    ninguna es a la vez más cara y más tardía que otra. Llegar antes puede
+    permitir ventanas que con la etiqueta más barata ya cerraron, así que no
+    basta con guardar el menor costo.
+    Devuelve False si la nueva etiqueta está dominada; si no, quita del
+    frente las que ella domina (el llamador la agrega después).
+    """
+    for e in frente:
+        if costos[e] <= costo and llegadas[e] <= llegada:
+            return False
+    frente[:] = [e for e in frente if not (costo <= costos[e] and llegada <= llegadas[e])]
+    return True
+
+
+def tsp_ventanas_tiempo(distancias, ventanas=None, nombres_ciudades=None, ciudad_inicio=0,
+                        tiempos=None, servicio=None):
+    """
+    TSP con ventanas de tiempo (y matriz asimétrica, calles de un solo sentido).
+    - ventanas[c] = (más_temprano, más_tarde): se puede llegar a c antes de
+      más_temprano (se espera hasta que abra) pero nunca después de más_tarde.
+      La ventana de ciudad_inicio da la hora de salida y el límite de regreso.
+      Sin ventanas se resuelve el TSP normal (sirve de referencia).
+    - tiempos[a][b]: tiempo de viaje (por defecto, las mismas distancias).
+    - servicio[c]: tiempo que se queda en c antes de seguir (por defecto 0).
+    Se minimiza la distancia total. La DP avanza por capas de estados
+    (visited_mask, j) guardados de forma dispersa: solo existen los estados
+    alcanzables dentro de las ventanas. Cada estado tiene un frente de
+    etiquetas (costo, llegada) en arreglos planos, y se descarta un estado
+    si alguna ciudad pendiente (o el regreso) ya no se alcanza a tiempo.
+    Con ventanas estrechas quedan muchos menos estados que en la DP completa.
+    Devuelve (ruta_indices, ruta_nombres, costo, llegadas, num_estados, num_etiquetas),
+    donde llegadas[i] es la hora de llegada a ruta_indices[i] (la primera es
+    la hora de salida). Lanza ValueError si ninguna ruta respeta las ventanas.
+    """
+    n = len(distancias)
+    if tiempos is None:
+        tiempos = distancias
+    if servicio is None:
+        servicio = [0] * n
+
+    con_ventanas = ventanas is not None
+    if con_ventanas:
+        if len(ventanas) != n:
+            raise ValueError("Se necesita una ventana por ciudad")
+        temprano = [v[0] for v in ventanas]
+        tarde = [v[1] for v in ventanas]
+        if any(a > b for a, b in zip(temprano, tarde)):
+            raise ValueError("Ventana con inicio posterior a su fin")
+    else:
+        temprano = [0] * n
+        tarde = [INF] * n
+
+    medicion = INSTRUMENTACION.iniciar("ventanas_tiempo")
+    alcance = _tiempos_minimos(tiempos, servicio) if con_ventanas else None
+    medicion.fase("preparacion")
+
+    # Etiquetas en arreglos planos; capa[visited_mask * n + j] = [ids de etiquetas]
+    costos = array('d', [0.0])
+    llegadas = array('d', [temprano[ciudad_inicio]])
+    anteriores = array('q', [-1])
+    ciudades = array('i', [ciudad_inicio])
+
+    capa = {(1 << ciudad_inicio) * n + ciudad_inicio: [0]}
+    num_estados = 1
+    num_etiquetas = 1
+    num_descartes = 0
+
+    for _ in range(n - 1):
+        siguiente_capa = {}
+        for clave, frente in capa.items():
+            visited_mask, j = divmod(clave, n)
+            fila_distancias = distancias[j]
+            fila_tiempos = tiempos[j]
+            pendientes = [k for k in range(n) if not visited_mask >> k & 1]
+            for e in frente:
+                costo_e = costos[e]
+                salida = llegadas[e] + servicio[j]
+                for k in pendientes:
+                    llegada = salida + fila_tiempos[k]
+                    if llegada > tarde[k]:
+                        num_descartes += 1
+                        continue
+                    if llegada < temprano[k]:
+                        llegada = temprano[k]
+
+                    if con_ventanas:
+                        # Desde k: ¿se alcanza todavía cada ciudad pendiente y el regreso?
+                        fila_alcance = alcance[k]
+                        if llegada + fila_alcance[ciudad_inicio] > tarde[ciudad_inicio]:
+                            num_descartes += 1
+                            continue
+                        factible = True
+                        for u in pendientes:
+                            if u != k and llegada + fila_alcance[u] > tarde[u]:
+                                factible = False
+                                break
+                        if not factible:
+                            num_descartes += 1
+                            continue
+
+                    costo = costo_e + fila_distancias[k]
+                    nueva_clave = (visited_mask | (1 << k)) * n + k
+                    nuevo_frente = siguiente_capa.get(nueva_clave)
+                    if nuevo_frente is None:
+                        nuevo_frente = siguiente_capa[nueva_clave] = []
+                    elif not _agregar_etiqueta(nuevo_frente, costo, llegada, costos, llegadas):
+                        continue
+                    nuevo_frente.append(len(costos))
+                    costos.append(costo)
+                    llegadas.append(llegada)
+                    anteriores.append(e)
+                    ciudades.append(k)
+        capa = siguiente_capa
+        num_estados += len(capa)
+        num_etiquetas += sum(len(frente) for frente in capa.values())
+    medicion.fase("busqueda")
+
+    # Cierre: volver al inicio antes de que cierre su ventana
+    mejor_costo = INF
+    mejor_etiqueta = None
+    for clave, frente in capa.items():
+        j = clave % n
+        for e in frente:
+            if llegadas[e] + servicio[j] + tiempos[j][ciudad_inicio] > tarde[ciudad_inicio]:
+                continue
+            costo = costos[e] + distancias[j][ciudad_inicio]
+            if costo < mejor_costo:
+                mejor_costo = costo
+                mejor_etiqueta = e
+    if mejor_etiqueta is None:
+        raise ValueError("Ninguna ruta respeta las ventanas de tiempo")
+
+    # Reconstrucción siguiendo las etiquetas anteriores
+    camino = []
+    e = mejor_etiqueta
+    while e != -1:
+        camino.append(ciudades[e])
+        e = anteriores[e]
+    camino.reverse()
+    ruta_indices = camino + [ciudad_inicio]
+
+    # Costo y horas de llegada recalculados sobre la ruta (con los tipos originales)
+    costo_total = 0
+    llegadas_ruta = [temprano[ciudad_inicio]]
+    for i in range(len(ruta_indices) - 1):
+        a, b = ruta_indices[i], ruta_indices[i + 1]
+        costo_total += distancias[a][b]
+        llegada = llegadas_ruta[-1] + servicio[a] + tiempos[a][b]
+        if i < len(ruta_indices) - 2 and llegada < temprano[b]:
+            llegada = temprano[b]
+        llegadas_ruta.append(llegada)
+    medicion.fase("reconstruccion")
+
+    if nombres_ciudades is not None:
+        ruta_nombres = [nombres_ciudades[i] for i in ruta_indices]
+    else:
+        ruta_nombres = ruta_indices
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_estados, etiquetas=num_etiquetas, podas=num_descartes)
+
+    return ruta_indices, ruta_nombres, costo_total, llegadas_ruta, num_estados, num_etiquetas
+
+
+def generar_ventanas(distancias, ancho, semilla=0, ciudad_inicio=0, tiempos=None):
+    """
+    Ventanas de 'ancho' unidades de tiempo alrededor de las horas de llegada
+    de una ruta al azar, así que siempre existe al menos una ruta factible.
+    El inicio sale a la hora 0 y no tiene límite de regreso.
+    """
+    if tiempos is None:
+        tiempos = distancias
+    rng = random.Random(semilla)
+    n = len(distancias)
+    orden = [c for c in range(n) if c != ciudad_inicio]
+    rng.shuffle(orden)
+
+    ventanas = [None] * n
+    ventanas[ciudad_inicio] = (0, INF)
+    hora = 0
+    anterior = ciudad_inicio
+    for c in orden:
+        hora += tiempos[anterior][c]
+        desde = max(0, hora - rng.uniform(0, ancho))
+        ventanas[c] = (desde, desde + ancho)
+        anterior = c
+    return ventanas
+
+
+if __name__ == "__main__":
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    # Camión a 60 km/h que sale de Lima a las 6:00; horas de atención de cada cliente
+    tiempos = [[d / 60 for d in fila] for fila in distancias]
+    ventanas = [(6, 90), (20, 30), (30, 45), (50, 65), (60, 75)]
+    servicio = [0, 1, 1, 1, 1]
+
+    for titulo, ventanas_usadas in (("sin ventanas", None), ("con ventanas", ventanas)):
+        ruta_idx, ruta_nombres, costo, llegadas, estados, etiquetas = tsp_ventanas_tiempo(
+            distancias, ventanas_usadas, nombres_ciudades, 0, tiempos, servicio
+        )
+        print(f"=== TSP {titulo} (Perú, 60 km/h) ===")
+        for ciudad, hora in zip(ruta_nombres, llegadas):
+            print(f"  {ciudad:10s} llega a las {hora:6.1f} h")
+        print("Costo total:", costo, "km")
+        print("Estados:", estados, " etiquetas:", etiquetas)
+        print()
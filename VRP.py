@@ -0,0 +1,404 @@
+import math
+import random
+
+import INSTRUMENTACION
+import LOTES
+from MATRIZ import COORDENADAS_PERU, ejemplo_peru
+from VECINOS import IndiceVecinos
+
+# Tolerancia para aceptar una mejora (evita ciclos infinitos con distancias float)
+EPS = 1e-9
+
+# Tamaño de las listas de vecinos candidatos para los movimientos entre rutas
+K_VECINOS = 10
+
+# Rondas de (movimientos entre rutas + volver a resolver las rutas que cambiaron)
+MAX_RONDAS = 10
+
+
+# ==========================
+# REPARTO DE PARADAS ENTRE VEHÍCULOS
+# ==========================
+
+def _barrido(paradas, deposito, coordenadas, demandas, limite, objetivo):
+    """
+    Algoritmo de barrido (sweep): ordena las paradas por ángulo alrededor del
+    depósito y las corta en grupos consecutivos. Se empieza después del mayor
+    hueco angular, para no partir un grupo natural de paradas en dos.
+    Un grupo se cierra si la siguiente parada no entra en 'limite' o si la
+    carga acumulada pasa la parte que le toca (objetivo * grupos), así que
+    sin límite de capacidad salen a lo sumo total / objetivo grupos parejos.
+    """
+    a0, b0 = coordenadas[deposito]
+    angulo = {c: math.atan2(coordenadas[c][1] - b0, coordenadas[c][0] - a0) for c in paradas}
+    orden = sorted(paradas, key=angulo.__getitem__)
+    if len(orden) > 1:
+        huecos = [(angulo[orden[i]] - angulo[orden[i - 1]]) % (2 * math.pi) for i in range(len(orden))]
+        corte = max(range(len(orden)), key=huecos.__getitem__)
+        orden = orden[corte:] + orden[:corte]
+
+    grupos = [[]]
+    carga = 0
+    acumulada = 0
+    for c in orden:
+        d = demandas[c]
+        if grupos[-1] and (carga + d > limite or acumulada + d / 2 > objetivo * len(grupos)):
+            grupos.append([])
+            carga = 0
+        grupos[-1].append(c)
+        carga += d
+        acumulada += d
+    return grupos
+
+
+def _semillas(paradas, deposito, distancias, demandas, limite, objetivo, num_grupos):
+    """
+    Reparto solo con la matriz (sin coordenadas): elige num_grupos paradas
+    semilla alejadas entre sí (la más lejana al depósito y luego la más
+    lejana a las semillas ya elegidas) y asigna cada parada a la semilla más
+    cercana que todavía tenga lugar. Primero se asignan las paradas con más
+    "arrepentimiento" (diferencia entre su mejor y su segunda mejor semilla),
+    que son las que más pierden si su grupo preferido se llena.
+    """
+    num_grupos = min(num_grupos, len(paradas))
+    semillas = [max(paradas, key=lambda c: distancias[deposito][c] + distancias[c][deposito])]
+    cercania = {c: distancias[semillas[0]][c] + distancias[c][semillas[0]] for c in paradas}
+    while len(semillas) < num_grupos:
+        s = max(paradas, key=cercania.__getitem__)
+        semillas.append(s)
+        for c in paradas:
+            d = distancias[s][c] + distancias[c][s]
+            if d < cercania[c]:
+                cercania[c] = d
+
+    # Un grupo se llena al pasar el límite o (para repartir parejo) la parte que le toca
+    tope = min(limite, max(objetivo, max(demandas[c] for c in paradas)))
+    preferencias = {}
+    arrepentimiento = {}
+    for c in paradas:
+        orden = sorted(range(num_grupos), key=lambda g: distancias[semillas[g]][c] + distancias[c][semillas[g]])
+        preferencias[c] = orden
+        d = [distancias[semillas[g]][c] + distancias[c][semillas[g]] for g in orden[:2]]
+        arrepentimiento[c] = d[1] - d[0] if len(d) > 1 else 0
+
+    grupos = [[] for _ in range(num_grupos)]
+    cargas = [0] * num_grupos
+    for c in sorted(paradas, key=arrepentimiento.__getitem__, reverse=True):
+        for g in preferencias[c]:
+            if cargas[g] + demandas[c] <= tope:
+                break
+        else:
+            # Ninguno tiene lugar dentro del reparto parejo: el que tenga capacidad
+            libres = [g for g in preferencias[c] if cargas[g] + demandas[c] <= limite]
+            if not libres:
+                grupos.append([])
+                cargas.append(0)
+                libres = [len(grupos) - 1]
+            g = libres[0]
+        grupos[g].append(c)
+        cargas[g] += demandas[c]
+    return [grupo for grupo in grupos if grupo]
+
+
+# ==========================
+# RESOLVER CADA RUTA (EN PARALELO CON LOTES)
+# ==========================
+
+def _resolver_rutas(grupos, deposito, distancias, resolvedor):
+    """
+    Resuelve el TSP de cada grupo (depósito + sus paradas) con el solver que
+    LOTES elige por tamaño, todos a la vez en el pool de procesos.
+    Devuelve una lista con el orden de visita de cada grupo (sin el depósito).
+    """
+    instancias = []
+    for r, grupo in enumerate(grupos):
+        nodos = [deposito] + grupo
+        submatriz = [[distancias[a][b] for b in nodos] for a in nodos]
+        instancias.append((r, submatriz))
+
+    if resolvedor is None:
+        resultados = LOTES.resolver_lote(instancias, compacto=True)
+    else:
+        resultados = resolvedor.resolver(instancias, compacto=True)
+
+    ordenes = [None] * len(grupos)
+    for r, _, resultado, error in resultados:
+        if error is not None:
+            raise error
+        nodos = [deposito] + grupos[r]
+        ordenes[r] = [nodos[i] for i in resultado.indices[1:-1]]
+    return ordenes
+
+
+def _costo_ruta(ruta, deposito, distancias):
+    """
+    Costo de salir del depósito, visitar 'ruta' en orden y volver.
+    """
+    if not ruta:
+        return 0
+    costo = distancias[deposito][ruta[0]] + distancias[ruta[-1]][deposito]
+    for i in range(len(ruta) - 1):
+        costo += distancias[ruta[i]][ruta[i + 1]]
+    return costo
+
+
+# ==========================
+# MOVIMIENTOS ENTRE RUTAS
+# ==========================
+
+class _Rutas:
+    """
+    Estado de la mejora entre rutas: el orden de cada ruta (sin el depósito)
+    con su costo y su carga guardados, y la ruta de cada parada. Cada
+    movimiento se evalúa con el cambio de costo de las aristas que toca y se
+    actualizan los costos guardados sin recorrer las rutas de nuevo.
+    """
+
+    __slots__ = ("rutas", "costos", "cargas", "ruta_de", "deposito", "distancias",
+                 "demandas", "capacidad", "cambiadas")
+
+    def __init__(self, rutas, deposito, distancias, demandas, capacidad):
+        self.rutas = rutas
+        self.deposito = deposito
+        self.distancias = distancias
+        self.demandas = demandas
+        self.capacidad = capacidad
+        self.costos = [_costo_ruta(ruta, deposito, distancias) for ruta in rutas]
+        self.cargas = [sum(demandas[c] for c in ruta) for ruta in rutas]
+        self.ruta_de = [-1] * len(distancias)
+        for r, ruta in enumerate(rutas):
+            for c in ruta:
+                self.ruta_de[c] = r
+        self.cambiadas = set()
+
+    def _vecinas(self, r, i):
+        """
+        Ciudades antes y después de la posición i de la ruta r (el depósito en los extremos).
+        """
+        ruta = self.rutas[r]
+        anterior = ruta[i - 1] if i > 0 else self.deposito
+        siguiente = ruta[i + 1] if i + 1 < len(ruta) else self.deposito
+        return anterior, siguiente
+
+    def reubicar(self, u, v):
+        """
+        Relocate: saca u de su ruta y lo inserta justo antes o justo después
+        de v (en otra ruta), si eso baja el costo total y v tiene lugar.
+        """
+        a, b = self.ruta_de[u], self.ruta_de[v]
+        if self.cargas[b] + self.demandas[u] > self.capacidad:
+            return False
+        d = self.distancias
+        i = self.rutas[a].index(u)
+        p, s = self._vecinas(a, i)
+        quitar = d[p][s] - d[p][u] - d[u][s]
+
+        j = self.rutas[b].index(v)
+        pv, sv = self._vecinas(b, j)
+        antes = d[pv][u] + d[u][v] - d[pv][v]
+        despues = d[v][u] + d[u][sv] - d[v][sv]
+        if antes <= despues:
+            poner, posicion = antes, j
+        else:
+            poner, posicion = despues, j + 1
+        if quitar + poner >= -EPS:
+            return False
+
+        del self.rutas[a][i]
+        self.rutas[b].insert(posicion, u)
+        self.costos[a] += quitar
+        self.costos[b] += poner
+        self.cargas[a] -= self.demandas[u]
+        self.cargas[b] += self.demandas[u]
+        self.ruta_de[u] = b
+        self.cambiadas.update((a, b))
+        return True
+
+    def intercambiar(self, u, v):
+        """
+        Exchange: u y v (de rutas distintas) intercambian sus lugares.
+        """
+        a, b = self.ruta_de[u], self.ruta_de[v]
+        diferencia = self.demandas[v] - self.demandas[u]
+        if self.cargas[a] + diferencia > self.capacidad or self.cargas[b] - diferencia > self.capacidad:
+            return False
+        d = self.distancias
+        i = self.rutas[a].index(u)
+        j = self.rutas[b].index(v)
+        pu, su = self._vecinas(a, i)
+        pv, sv = self._vecinas(b, j)
+        cambio_a = d[pu][v] + d[v][su] - d[pu][u] - d[u][su]
+        cambio_b = d[pv][u] + d[u][sv] - d[pv][v] - d[v][sv]
+        if cambio_a + cambio_b >= -EPS:
+            return False
+
+        self.rutas[a][i] = v
+        self.rutas[b][j] = u
+        self.costos[a] += cambio_a
+        self.costos[b] += cambio_b
+        self.cargas[a] += diferencia
+        self.cargas[b] -= diferencia
+        self.ruta_de[u], self.ruta_de[v] = b, a
+        self.cambiadas.update((a, b))
+        return True
+
+    def mejorar(self, vecinos):
+        """
+        Aplica relocate y exchange entre cada parada y sus vecinos candidatos
+        de otras rutas (primera mejora) hasta que ninguno mejore.
+        Devuelve el número de movimientos aplicados.
+        """
+        movimientos = 0
+        pendientes = [c for ruta in self.rutas for c in ruta]
+        en_cola = set(pendientes)
+        while pendientes:
+            u = pendientes.pop()
+            en_cola.discard(u)
+            for v in vecinos[u]:
+                if self.ruta_de[v] < 0 or self.ruta_de[v] == self.ruta_de[u]:
+                    continue
+                if self.reubicar(u, v) or self.intercambiar(u, v):
+                    movimientos += 1
+                    # Las paradas cercanas a u y a v pueden tener mejoras nuevas
+                    for c in (u, v, *vecinos[u], *vecinos[v]):
+                        if self.ruta_de[c] >= 0 and c not in en_cola:
+                            pendientes.append(c)
+                            en_cola.add(c)
+                    break
+        return movimientos
+
+
+# ==========================
+# SOLVER VRP
+# ==========================
+
+def tsp_vrp(distancias, num_vehiculos, nombres_ciudades=None, ciudad_inicio=0,
+            demandas=None, capacidad=None, coordenadas=None, agrupamiento=None,
+            mejora=True, k_vecinos=K_VECINOS, resolvedor=None):
+    """
+    Varias rutas (una por vehículo) que salen de ciudad_inicio (el depósito)
+    y vuelven a él, visitando entre todas cada parada una vez.
+    - demandas[c]: carga que se entrega en c (por defecto 1 por parada).
+    - capacidad: carga máxima por vehículo (por defecto sin límite).
+    1. Reparto: "barrido" (por ángulo alrededor del depósito, necesita
+       coordenadas (x, y) o (lat, lon)) o "semillas" (solo con la matriz).
+       Por defecto, barrido si hay coordenadas. Las paradas se reparten
+       parejo entre los vehículos, sin pasar la capacidad.
+    2. Cada ruta se resuelve con el solver que elige LOTES según su tamaño
+       (fuerza bruta, Held-Karp o heurístico), todas en paralelo en el pool
+       de 'resolvedor' (un LOTES.ResolvedorLotes; por defecto el compartido).
+    3. Mejora: movimientos relocate y exchange entre rutas sobre los vecinos
+       candidatos de cada parada, con el costo y la carga de cada ruta
+       guardados; luego se vuelven a resolver las rutas que cambiaron, y se
+       repite hasta que no haya movimientos (a lo sumo MAX_RONDAS veces).
+    La mejora minimiza la distancia total, así que sin capacidad puede dejar
+    vehículos sin usar. Lanza ValueError si la flota no alcanza.
+    Devuelve (rutas_indices, rutas_nombres, costo_total, costos_rutas, cargas, num_movimientos),
+    con una ruta [inicio, ..., inicio] por vehículo usado.
+    """
+    n = len(distancias)
+    deposito = ciudad_inicio
+    paradas = [c for c in range(n) if c != deposito]
+    if demandas is None:
+        demandas = [1] * n
+    limite = math.inf if capacidad is None else capacidad
+    if num_vehiculos < 1:
+        raise ValueError("Se necesita al menos un vehículo")
+    total = sum(demandas[c] for c in paradas)
+    if any(demandas[c] > limite for c in paradas) or total > limite * num_vehiculos:
+        raise ValueError("La capacidad de la flota no alcanza para todas las paradas")
+
+    if agrupamiento is None:
+        agrupamiento = "barrido" if coordenadas is not None else "semillas"
+
+    medicion = INSTRUMENTACION.iniciar("vrp")
+    if not paradas:
+        grupos = []
+    elif agrupamiento == "barrido":
+        if coordenadas is None:
+            raise ValueError("El barrido necesita las coordenadas de las ciudades")
+        grupos = _barrido(paradas, deposito, coordenadas, demandas, limite, total / num_vehiculos)
+    elif agrupamiento == "semillas":
+        grupos = _semillas(paradas, deposito, distancias, demandas, limite, total / num_vehiculos,
+                           num_vehiculos)
+    else:
+        raise ValueError(f"Agrupamiento desconocido: {agrupamiento!r}")
+    if len(grupos) > num_vehiculos:
+        raise ValueError(f"El reparto necesitó {len(grupos)} vehículos y hay {num_vehiculos}")
+    medicion.fase("agrupamiento")
+
+    estado = _Rutas(_resolver_rutas(grupos, deposito, distancias, resolvedor),
+                    deposito, distancias, demandas, limite)
+    medicion.fase("rutas")
+
+    num_movimientos = 0
+    if mejora and len(grupos) > 1:
+        vecinos = IndiceVecinos.desde_distancias(distancias, k_vecinos)
+        for _ in range(MAX_RONDAS):
+            estado.cambiadas.clear()
+            movimientos = estado.mejorar(vecinos)
+            num_movimientos += movimientos
+            if movimientos == 0:
+                break
+            cambiadas = sorted(r for r in estado.cambiadas if estado.rutas[r])
+            ordenes = _resolver_rutas([estado.rutas[r] for r in cambiadas], deposito, distancias, resolvedor)
+            for r, orden in zip(cambiadas, ordenes):
+                costo = _costo_ruta(orden, deposito, distancias)
+                if costo < estado.costos[r] - EPS:
+                    estado.rutas[r] = orden
+                    estado.costos[r] = costo
+    medicion.fase("mejora")
+
+    # Costos recalculados sobre las rutas (con los tipos originales)
+    rutas_indices = []
+    costos_rutas = []
+    cargas = []
+    for r, ruta in enumerate(estado.rutas):
+        if ruta:
+            rutas_indices.append([deposito] + ruta + [deposito])
+            costos_rutas.append(_costo_ruta(ruta, deposito, distancias))
+            cargas.append(estado.cargas[r])
+    costo_total = sum(costos_rutas)
+
+    if nombres_ciudades is not None:
+        rutas_nombres = [[nombres_ciudades[i] for i in ruta] for ruta in rutas_indices]
+    else:
+        rutas_nombres = rutas_indices
+    medicion.fase("nombres")
+    medicion.terminar(rutas=len(rutas_indices), mejoras=num_movimientos)
+
+    return rutas_indices, rutas_nombres, costo_total, costos_rutas, cargas, num_movimientos
+
+
+if __name__ == "__main__":
+    import time
+
+    nombres_ciudades, distancias = ejemplo_peru()
+
+    # Dos camiones desde Lima; cada uno lleva a lo sumo 30 toneladas
+    demandas = [0, 12, 10, 8, 14]
+    rutas_idx, rutas_nombres, costo, costos_rutas, cargas, movimientos = tsp_vrp(
+        distancias, 2, nombres_ciudades, 0, demandas, 30, COORDENADAS_PERU
+    )
+    print("=== VRP (Perú, 2 camiones de 30 t) ===")
+    for ruta, costo_ruta, carga in zip(rutas_nombres, costos_rutas, cargas):
+        print(f"  {' -> '.join(ruta)}   {costo_ruta} km, {carga} t")
+    print("Costo total:", costo, "km")
+    print()
+
+    print("=== VRP grande (paradas al azar, depósito al centro) ===")
+    print(f"{'Paradas':>8s} {'Vehículos':>10s} {'Reparto':>9s} {'Tiempo (s)':>11s} {'Costo':>9s} {'Movimientos':>12s}")
+    with LOTES.ResolvedorLotes() as resolvedor:
+        for num_paradas, num_vehiculos in ((100, 5), (250, 10), (500, 20)):
+            rng = random.Random(num_paradas)
+            puntos = [(1000, 1000)] + [(rng.uniform(0, 2000), rng.uniform(0, 2000)) for _ in range(num_paradas)]
+            matriz = [[round(math.dist(p, q)) for q in puntos] for p in puntos]
+            capacidad = math.ceil(1.1 * num_paradas / num_vehiculos)
+            for agrupamiento in ("barrido", "semillas"):
+                inicio = time.perf_counter()
+                _, _, costo, _, _, movimientos = tsp_vrp(
+                    matriz, num_vehiculos, capacidad=capacidad, coordenadas=puntos,
+                    agrupamiento=agrupamiento, resolvedor=resolvedor
+                )
+                tiempo = time.perf_counter() - inicio
+                print(f"{num_paradas:8d} {num_vehiculos:10d} {agrupamiento:>9s} {tiempo:11.3f} {costo:9d} {movimientos:12d}")
@@ -1,5 +1,25 @@
 import itertools
+import math
+import random
+import sys
 import time
+import tracemalloc
+
+import BENCHMARK
+import INSTRUMENTACION
+from BENCHMARK import instancia_euclidiana as generar_distancias_aleatorias
+from COORDENADAS import DistanciasCoordenadas, tsp_heuristico_coordenadas, vecinos_desde_coordenadas
+from FUERZA_BRUTA import tsp_fuerza_bruta_incremental
+from HELD_KARP import np, tsp_held_karp, tsp_held_karp_paralelo, tsp_held_karp_vectorizado
+from HEURISTICAS import tsp_heuristico
+from MATRIZ import CIUDADES_PERU, DISTANCIAS_PERU
+from MEMOIZACION import tsp_top_down_memo_podado
+from PROGRAMACION_ENTERA import tsp_programacion_entera
+from PROGRESIVO import tsp_progresivo
+from RAMIFICACION_Y_PODA import tsp_ramificacion_y_poda
+from VECINOS import IndiceVecinos
+from VENTANAS_TIEMPO import generar_ventanas, tsp_ventanas_tiempo
+from VRP import tsp_vrp
 
 # ==========================
 
@@ -9,21 +29,8 @@ import time
 # DATOS DEL PROBLEMA (EMPRESA DE ENVÍOS)
 # ==========================
 
-nombres_ciudades = [
-    "Lima",      # 0
-    "Arequipa",  # 1
-    "Cusco",     # 2
-    "Trujillo",  # 3
-    "Piura"      # 4
-]
-
-distancias = [
-    [   0, 1000, 1100,  560,  980],  # Lima
-    [1000,    0,  510, 1600, 1850],  # Arequipa
-    [1100,  510,    0, 1300, 1500],  # Cusco
-    [ 560, 1600, 1300,    0,  410],  # Trujillo
-    [ 980, 1850, 1500,  410,    0]   # Piura
-]
+nombres_ciudades = list(CIUDADES_PERU)
+distancias = [list(fila) for fila in DISTANCIAS_PERU]
 
 ciudad_inicio = 0  # Lima
 
@@ -55,6 +62,7 @@ def tsp_fuerza_bruta(distancias, nombres_ciudades=None, ciudad_inicio=0):
     que comienzan y terminan en ciudad_inicio.
     """
     n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("fuerza_bruta")
 
     # Lista de todas las ciudades excepto la de inicio
     otras_ciudades = []
@@ -77,6 +85,7 @@ def tsp_fuerza_bruta(distancias, nombres_ciudades=None, ciudad_inicio=0):
         if costo < mejor_costo:
             mejor_costo = costo
             mejor_ruta = ruta
+    medicion.fase("busqueda")
 
     # Convertimos índices a nombres si los tenemos
     if nombres_ciudades is not None:
@@ -85,6 +94,8 @@ def tsp_fuerza_bruta(distancias, nombres_ciudades=None, ciudad_inicio=0):
             mejor_ruta_nombres.append(nombres_ciudades[idx])
     else:
         mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=num_rutas_evaluadas)
 
     return mejor_ruta, mejor_ruta_nombres, mejor_costo, num_rutas_evaluadas
 
@@ -99,6 +110,7 @@ def tsp_recursivo_sin_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
     Explora todas las posibles rutas y se queda con la mejor.
     """
     n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("recursivo_sin_memo")
 
     # Arreglo booleano para saber qué ciudades ya se visitaron
     visitadas = [False] * n
@@ -141,12 +153,15 @@ def tsp_recursivo_sin_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
 
     # Llamada inicial
     backtrack(ciudad_inicio, 0)
+    medicion.fase("busqueda")
 
     # Convertimos índices a nombres si corresponde
     if nombres_ciudades is not None:
         mejor_ruta_nombres = [nombres_ciudades[i] for i in mejor_ruta]
     else:
         mejor_ruta_nombres = mejor_ruta
+    medicion.fase("nombres")
+    medicion.terminar(estados_expandidos=llamadas_recursivas)
 
     return mejor_ruta, mejor_ruta_nombres, mejor_costo, llamadas_recursivas
 
@@ -162,6 +177,7 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
     visited_mask es un entero donde cada bit indica si una ciudad ya fue visitada.
     """
     n = len(distancias)
+    medicion = INSTRUMENTACION.iniciar("top_down_memo")
     ALL_VISITED = (1 << n) - 1  # ejemplo: n=4 -> 1111 (binario)
 
     # memo[(ciudad_actual, visited_mask)] = mejor costo para completar el viaje
@@ -212,6 +228,7 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
     # Llamada inicial: solo la ciudad de inicio está visitada
     visited_mask_inicial = (1 << ciudad_inicio)
     mejor_costo = dp(ciudad_inicio, visited_mask_inicial)
+    medicion.fase("busqueda")
 
     # Reconstrucción de la ruta óptima usando 'decision'
     ruta_indices = [ciudad_inicio]
@@ -227,6 +244,7 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
 
     # Volvemos al origen
     ruta_indices.append(ciudad_inicio)
+    medicion.fase("reconstruccion")
 
     # Convertimos a nombres
     if nombres_ciudades is not None:
@@ -236,25 +254,405 @@ def tsp_top_down_memo(distancias, nombres_ciudades=None, ciudad_inicio=0):
 
     # Tamaño de la tabla memo (número de estados distintos)
     num_estados_memo = len(memo)
+    medicion.fase("nombres")
+    medicion.terminar(
+        estados_expandidos=num_estados_memo,
+        aciertos_cache=llamadas_dp - num_estados_memo,
+        fallos_cache=num_estados_memo,
+    )
 
     return ruta_indices, ruta_nombres, mejor_costo, llamadas_dp, num_estados_memo
 
 
+# ==========================
+# BENCHMARK: DP CON DICCIONARIOS VS HELD-KARP VECTORIZADO
+# ==========================
+
+def benchmark_vectorizado(tamanos=range(10, 23), max_n_diccionario=16, semilla=0):
+    """
+    Compara tsp_top_down_memo (diccionarios + recursión) con
+    tsp_held_karp_vectorizado (numpy) sobre instancias aleatorias.
+    La versión con diccionarios solo se ejecuta hasta max_n_diccionario,
+    porque más allá se queda sin memoria o tarda minutos.
+    """
+    if np is None:
+        print("Benchmark vectorizado omitido: numpy no está instalado.")
+        return
+
+    print("===== BENCHMARK: DP DICCIONARIOS VS HELD-KARP VECTORIZADO =====")
+    print(f"{'n':>3s} {'Dict (s)':>12s} {'Vectorizado (s)':>16s} {'Aceleración':>12s} {'Costo':>10s}")
+    print("-" * 58)
+    for n in tamanos:
+        matriz = generar_distancias_aleatorias(n, semilla + n)
+
+        inicio = time.perf_counter()
+        _, _, costo_vec, _, _ = tsp_held_karp_vectorizado(matriz)
+        tiempo_vec = time.perf_counter() - inicio
+
+        if n <= max_n_diccionario:
+            inicio = time.perf_counter()
+            _, _, costo_dict, _, _ = tsp_top_down_memo(matriz)
+            tiempo_dict = time.perf_counter() - inicio
+            if costo_dict != costo_vec:
+                raise AssertionError(f"Costos distintos en n={n}: {costo_dict} vs {costo_vec}")
+            texto_dict = f"{tiempo_dict:12.4f}"
+            texto_acel = f"{tiempo_dict / tiempo_vec:11.1f}x"
+        else:
+            texto_dict = f"{'-':>12s}"
+            texto_acel = f"{'-':>12s}"
+
+        print(f"{n:3d} {texto_dict} {tiempo_vec:16.4f} {texto_acel} {str(costo_vec):>10s}")
+
+
+# ==========================
+# BENCHMARK: DP COMPLETA VS DP CON PODA
+# ==========================
+
+def benchmark_dp_podada(tamanos=range(8, 16), generadores=("euclidiana", "asimetrica"), semilla=0):
+    """
+    Estados que materializa tsp_top_down_memo_podado frente a los
+    num_estados_memo de tsp_top_down_memo (que los visita todos), y tiempos.
+    En instancias simétricas la poda se suma al encuentro a la mitad.
+    """
+    print("===== BENCHMARK: DP COMPLETA VS DP CON PODA =====")
+    print(f"{'Instancia':>11s} {'n':>3s} {'Estados memo':>13s} {'Estados poda':>13s} {'%':>7s} "
+          f"{'Memo (s)':>10s} {'Poda (s)':>10s}")
+    print("-" * 74)
+    for nombre in generadores:
+        generador = BENCHMARK.GENERADORES[nombre]
+        for n in tamanos:
+            matriz = generador(n, semilla + n)
+
+            inicio = time.perf_counter()
+            _, _, costo_memo, _, num_estados_memo = tsp_top_down_memo(matriz)
+            tiempo_memo = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            _, _, costo_poda, estados_poda, _ = tsp_top_down_memo_podado(matriz)
+            tiempo_poda = time.perf_counter() - inicio
+
+            if costo_memo != costo_poda:
+                raise AssertionError(f"Costos distintos en {nombre} n={n}: {costo_memo} vs {costo_poda}")
+            print(f"{nombre:>11s} {n:3d} {num_estados_memo:13d} {estados_poda:13d} "
+                  f"{100 * estados_poda / num_estados_memo:6.1f}% {tiempo_memo:10.4f} {tiempo_poda:10.4f}")
+
+
+# ==========================
+# BENCHMARK: DP CON Y SIN VENTANAS DE TIEMPO
+# ==========================
+
+def benchmark_ventanas(tamanos=(10, 12, 14), anchos=(None, 16000, 8000, 4000, 2000), semilla=0):
+    """
+    Estados (visited_mask, j) y etiquetas que guarda tsp_ventanas_tiempo en
+    matrices asimétricas, sin ventanas y con ventanas cada vez más estrechas
+    (generadas alrededor de una ruta al azar, así que siempre hay solución).
+    Con ventanas muy anchas casi no se descartan estados y cada uno guarda
+    varias etiquetas; al estrecharlas quedan muy pocos estados alcanzables.
+    """
+    print("===== BENCHMARK: DP CON Y SIN VENTANAS DE TIEMPO =====")
+    print(f"{'n':>3s} {'Ancho':>7s} {'Estados':>9s} {'Etiquetas':>10s} {'Tiempo (s)':>11s} {'Costo':>8s}")
+    print("-" * 53)
+    for n in tamanos:
+        matriz = BENCHMARK.instancia_asimetrica(n, semilla + n)
+        for ancho in anchos:
+            ventanas = None if ancho is None else generar_ventanas(matriz, ancho, semilla + n)
+            inicio = time.perf_counter()
+            _, _, costo, _, estados, etiquetas = tsp_ventanas_tiempo(matriz, ventanas)
+            tiempo = time.perf_counter() - inicio
+            texto_ancho = "-" if ancho is None else str(ancho)
+            print(f"{n:3d} {texto_ancho:>7s} {estados:9d} {etiquetas:10d} {tiempo:11.4f} {costo:8d}")
+
+
+# ==========================
+# BENCHMARK: VARIOS VEHÍCULOS (VRP)
+# ==========================
+
+def benchmark_vrp(casos=((100, 5), (250, 10), (500, 20)), semilla=0):
+    """
+    Costo y tiempo de tsp_vrp con paradas al azar alrededor de un depósito
+    central (capacidad con 10% de holgura), solo con el reparto por barrido y
+    con la mejora entre rutas (relocate/exchange + volver a resolver).
+    """
+    print("===== BENCHMARK: VRP (BARRIDO + RUTAS EN PARALELO) =====")
+    print(f"{'Paradas':>8s} {'Vehículos':>10s} {'Sin mejora':>11s} {'Tiempo (s)':>11s} "
+          f"{'Con mejora':>11s} {'Tiempo (s)':>11s} {'Movimientos':>12s}")
+    print("-" * 79)
+    for num_paradas, num_vehiculos in casos:
+        rng = random.Random(semilla + num_paradas)
+        lado = BENCHMARK.LADO_KM
+        puntos = [(lado / 2, lado / 2)] + [(rng.uniform(0, lado), rng.uniform(0, lado)) for _ in range(num_paradas)]
+        matriz = [[round(math.dist(p, q)) for q in puntos] for p in puntos]
+        capacidad = math.ceil(1.1 * num_paradas / num_vehiculos)
+        fila = []
+        for mejora in (False, True):
+            inicio = time.perf_counter()
+            _, _, costo, _, _, movimientos = tsp_vrp(matriz, num_vehiculos, capacidad=capacidad,
+                                                     coordenadas=puntos, mejora=mejora)
+            fila.append((costo, time.perf_counter() - inicio))
+        (costo_base, tiempo_base), (costo_mejora, tiempo_mejora) = fila
+        print(f"{num_paradas:8d} {num_vehiculos:10d} {costo_base:11d} {tiempo_base:11.3f} "
+              f"{costo_mejora:11d} {tiempo_mejora:11.3f} {movimientos:12d}")
+
+
+# ==========================
+# BENCHMARK: BÚSQUEDA PROGRESIVA (ANYTIME)
+# ==========================
+
+def benchmark_progresivo(tamanos=(9, 10, 11, 12, 13, 14), tiempo_limite=10.0, semilla=0):
+    """
+    Cuándo entrega tsp_progresivo su primera ruta, cuándo llega al óptimo
+    (según Held-Karp) y cuándo termina de recorrer el espacio (o se corta a
+    los tiempo_limite segundos), frente a tsp_recursivo_sin_memo, que no
+    entrega nada hasta el final (solo se mide hasta n=10).
+    """
+    print("===== BENCHMARK: BÚSQUEDA PROGRESIVA (ANYTIME) =====")
+    print(f"{'n':>3s} {'1ª ruta (s)':>12s} {'Brecha 1ª':>10s} {'Óptimo (s)':>11s} {'Mejoras':>8s} "
+          f"{'Fin (s)':>9s} {'Recursivo (s)':>14s}")
+    print("-" * 73)
+    for n in tamanos:
+        matriz = generar_distancias_aleatorias(n, semilla + n)
+        optimo = tsp_held_karp(matriz)[2]
+
+        inicio = time.perf_counter()
+        mejoras = []
+        generador = tsp_progresivo(matriz, tiempo_limite=tiempo_limite)
+        while True:
+            try:
+                mejoras.append(next(generador))
+            except StopIteration as fin:
+                completa = fin.value
+                break
+        tiempo_fin = time.perf_counter() - inicio
+
+        primera = mejoras[0]
+        al_optimo = next((m[3] for m in mejoras if m[2] == optimo), None)
+        texto_optimo = "-" if al_optimo is None else f"{al_optimo:.4f}"
+        texto_fin = f"{tiempo_fin:.3f}" if completa else f">{tiempo_limite:.0f}"
+
+        texto_recursivo = "-"
+        if n <= 10:
+            inicio = time.perf_counter()
+            tsp_recursivo_sin_memo(matriz)
+            texto_recursivo = f"{time.perf_counter() - inicio:.3f}"
+        print(f"{n:3d} {primera[3]:12.5f} {100 * (primera[2] - optimo) / optimo:9.2f}% {texto_optimo:>11s} "
+              f"{len(mejoras):8d} {texto_fin:>9s} {texto_recursivo:>14s}")
+
+
+# ==========================
+# BENCHMARK: MATRIZ COMPLETA VS COORDENADAS (MODO DISPERSO)
+# ==========================
+
+def benchmark_coordenadas(tamanos=(1000, 5000, 20000), max_n_densa=5000, semilla=0):
+    """
+    Heurística para miles de ciudades con la matriz completa (lista de listas
+    + IndiceVecinos.desde_distancias) frente a tsp_heuristico_coordenadas
+    (índice espacial + distancias calculadas al pedirlas). Los tiempos son de
+    punta a punta; la memoria es el pico al armar las estructuras (matriz e
+    índice de vecinos), medido aparte con tracemalloc. Por encima de
+    max_n_densa la matriz completa no se arma: se informa lo que ocuparía
+    (n^2 valores de 8 bytes, sin contar las listas). Los costos pueden
+    diferir un poco: con la matriz redondeada los empates ordenan distinto
+    a los vecinos.
+    """
+    def estructuras_densas(puntos):
+        matriz = [[round(math.dist(p, q)) for q in puntos] for p in puntos]
+        return matriz, IndiceVecinos.desde_distancias(matriz, 10)
+
+    def estructuras_dispersas(puntos):
+        return DistanciasCoordenadas(puntos, tipo='i'), vecinos_desde_coordenadas(puntos, 10)
+
+    def pico_memoria(funcion, puntos):
+        tracemalloc.start()
+        funcion(puntos)
+        pico = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+        return pico
+
+    print("===== BENCHMARK: MATRIZ COMPLETA VS COORDENADAS (k = 10) =====")
+    print(f"{'n':>6s} {'Densa (MB)':>11s} {'Densa (s)':>10s} {'Costo':>9s} "
+          f"{'Dispersa (MB)':>14s} {'Dispersa (s)':>13s} {'Costo':>9s}")
+    print("-" * 78)
+    for n in tamanos:
+        rng = random.Random(semilla + n)
+        puntos = [(rng.uniform(0, BENCHMARK.LADO_KM), rng.uniform(0, BENCHMARK.LADO_KM)) for _ in range(n)]
+
+        inicio = time.perf_counter()
+        costo_disperso = tsp_heuristico_coordenadas(puntos, tipo='i')[2]
+        tiempo_disperso = time.perf_counter() - inicio
+        memoria_dispersa = pico_memoria(estructuras_dispersas, puntos)
+
+        if n <= max_n_densa:
+            inicio = time.perf_counter()
+            matriz, indice = estructuras_densas(puntos)
+            costo_denso = tsp_heuristico(matriz, None, 0, "voraz", 10, True, indice)[2]
+            tiempo_denso = time.perf_counter() - inicio
+            del matriz, indice
+            memoria_densa = pico_memoria(estructuras_densas, puntos)
+            texto_densa = f"{memoria_densa:11.1f} {tiempo_denso:10.2f} {costo_denso:9d}"
+        else:
+            texto_densa = f"{'~' + format(8 * n * n / 2 ** 20, '.0f'):>11s} {'-':>10s} {'-':>9s}"
+        print(f"{n:6d} {texto_densa} {memoria_dispersa:14.1f} {tiempo_disperso:13.2f} {costo_disperso:9d}")
+
+
+# ==========================
+# BENCHMARK: PROGRAMACIÓN ENTERA (DFJ + CORTES)
+# ==========================
+
+def benchmark_programacion_entera(tamanos_chicos=range(8, 15), tamanos_grandes=(50, 100, 150),
+                                  generadores_chicos=("euclidiana", "asimetrica"),
+                                  generadores_grandes=("euclidiana", "agrupada"), semilla=0):
+    """
+    tsp_programacion_entera frente a tsp_top_down_memo en instancias chicas
+    (los costos deben coincidir) y, en instancias de 50-150 ciudades (fuera
+    del alcance de Held-Karp), iteraciones, cortes, tiempo y cuánto mejora
+    el óptimo a la ruta heurística con la que arranca. Las asimétricas al
+    azar no van entre las grandes por defecto: la relajación DFJ queda más
+    lejos del óptimo y con 150 ciudades tardan minutos.
+    """
+    print("===== BENCHMARK: PROGRAMACIÓN ENTERA (DFJ + CORTES) =====")
+    print(f"{'Instancia':>11s} {'n':>4s} {'Memo (s)':>10s} {'Entera (s)':>11s} {'Iter':>5s} {'Cortes':>7s} "
+          f"{'Costo':>9s} {'Brecha heur.':>13s}")
+    print("-" * 77)
+    casos = [(nombre, n) for nombre in generadores_chicos for n in tamanos_chicos]
+    casos += [(nombre, n) for nombre in generadores_grandes for n in tamanos_grandes]
+    for nombre, n in casos:
+        matriz = BENCHMARK.GENERADORES[nombre](n, semilla + n)
+        incumbentes = []
+
+        inicio = time.perf_counter()
+        _, _, costo, iteraciones, cortes = tsp_programacion_entera(
+            matriz, al_iterar=lambda *progreso: incumbentes.append(progreso[3])
+        )
+        tiempo_entera = time.perf_counter() - inicio
+
+        texto_memo = "-"
+        if n <= max(tamanos_chicos, default=0):
+            inicio = time.perf_counter()
+            costo_memo = tsp_top_down_memo(matriz)[2]
+            texto_memo = f"{time.perf_counter() - inicio:.4f}"
+            if costo != costo_memo:
+                raise AssertionError(f"Costos distintos en {nombre} n={n}: {costo} vs {costo_memo}")
+        brecha = 100 * (incumbentes[0] - costo) / costo if incumbentes and costo else 0.0
+        print(f"{nombre:>11s} {n:4d} {texto_memo:>10s} {tiempo_entera:11.3f} {iteraciones:5d} {cortes:7d} "
+              f"{str(costo):>9s} {brecha:12.2f}%")
+
+
+# ==========================
+# BENCHMARK: FUERZA BRUTA CLÁSICA VS COSTO INCREMENTAL
+# ==========================
+
+def benchmark_rutas_por_segundo(tamanos=range(7, 11), semilla=0):
+    """
+    Mide cuántas rutas por segundo evalúan tsp_fuerza_bruta y
+    tsp_fuerza_bruta_incremental, y verifica que den exactamente lo mismo.
+    """
+    print("===== BENCHMARK: RUTAS POR SEGUNDO EN FUERZA BRUTA =====")
+    print(f"{'n':>3s} {'Rutas':>10s} {'Clásica (rutas/s)':>18s} {'Incremental (rutas/s)':>22s}")
+    print("-" * 56)
+    for n in tamanos:
+        matriz = generar_distancias_aleatorias(n, semilla + n)
+
+        inicio = time.perf_counter()
+        resultado_clasico = tsp_fuerza_bruta(matriz)
+        tiempo_clasico = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultado_incremental = tsp_fuerza_bruta_incremental(matriz)
+        tiempo_incremental = time.perf_counter() - inicio
+
+        if resultado_clasico != resultado_incremental:
+            raise AssertionError(f"Resultados distintos en n={n}")
+
+        rutas = resultado_clasico[3]
+        print(f"{n:3d} {rutas:10d} {rutas / tiempo_clasico:18.0f} {rutas / tiempo_incremental:22.0f}")
+
+
+# ==========================
+# BENCHMARK: BRECHA DE LAS HEURÍSTICAS
+# ==========================
+
+def benchmark_heuristicas(tamanos_exactos=range(8, 16), tamanos_grandes=(200, 500, 1000), semilla=0):
+    """
+    Brecha (gap) de tsp_heuristico frente al óptimo de Held-Karp en
+    instancias pequeñas, y tiempo de la heurística en instancias grandes.
+    """
+    print("===== BENCHMARK: HEURÍSTICAS VS HELD-KARP =====")
+    print(f"{'n':>5s} {'Óptimo':>10s} {'Vecino':>10s} {'Voraz':>10s} {'Brecha vec.':>12s} {'Brecha vor.':>12s}")
+    print("-" * 64)
+    for n in tamanos_exactos:
+        matriz = generar_distancias_aleatorias(n, semilla + n)
+        if np is not None:
+            optimo = tsp_held_karp_vectorizado(matriz)[2]
+        else:
+            optimo = tsp_held_karp(matriz)[2]
+        vecino = tsp_heuristico(matriz, construccion="vecino")[2]
+        voraz = tsp_heuristico(matriz, construccion="voraz")[2]
+        print(f"{n:5d} {optimo:10d} {vecino:10d} {voraz:10d} "
+              f"{100 * (vecino - optimo) / optimo:11.2f}% {100 * (voraz - optimo) / optimo:11.2f}%")
+
+    print()
+    print(f"{'n':>5s} {'Vecino (s)':>12s} {'Costo':>10s} {'Voraz (s)':>12s} {'Costo':>10s}")
+    print("-" * 53)
+    for n in tamanos_grandes:
+        matriz = generar_distancias_aleatorias(n, semilla + n)
+        inicio = time.perf_counter()
+        vecino = tsp_heuristico(matriz, construccion="vecino")[2]
+        tiempo_vecino = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        voraz = tsp_heuristico(matriz, construccion="voraz")[2]
+        tiempo_voraz = time.perf_counter() - inicio
+        print(f"{n:5d} {tiempo_vecino:12.3f} {vecino:10d} {tiempo_voraz:12.3f} {voraz:10d}")
+
+
+# ==========================
+# BENCHMARK: ESCALAMIENTO DE HELD-KARP EN VARIOS PROCESOS
+# ==========================
+
+def benchmark_escalamiento(tamanos=range(18, 25), procesos=(1, 2, 4, 8), semilla=0):
+    """
+    Tiempo de tsp_held_karp_paralelo con 1, 2, 4 y 8 procesos, y su
+    aceleración respecto a un solo proceso.
+    """
+    if np is None:
+        print("Benchmark de escalamiento omitido: numpy no está instalado.")
+        return
+
+    print("===== BENCHMARK: HELD-KARP PARALELO (ESCALAMIENTO) =====")
+    print(f"{'n':>3s} " + " ".join(f"{str(p) + ' proc (s)':>14s}" for p in procesos) + f" {'Aceleración':>12s}")
+    print("-" * (4 + 15 * len(procesos) + 13))
+    for n in tamanos:
+        matriz = generar_distancias_aleatorias(n, semilla + n)
+        tiempos = []
+        costos = set()
+        for num_procesos in procesos:
+            inicio = time.perf_counter()
+            costos.add(tsp_held_karp_paralelo(matriz, num_procesos=num_procesos)[2])
+            tiempos.append(time.perf_counter() - inicio)
+        if len(costos) != 1:
+            raise AssertionError(f"Costos distintos en n={n}: {costos}")
+        print(f"{n:3d} " + " ".join(f"{t:14.3f}" for t in tiempos) + f" {tiempos[0] / tiempos[-1]:11.2f}x")
+
+
 # ==========================
 # PROGRAMA PRINCIPAL: COMPARAR LOS 3 MÉTODOS
 # ==========================
 
 if __name__ == "__main__":
+    if "--suite" in sys.argv[1:]:
+        argumentos = [a for a in sys.argv[1:] if a != "--suite"]
+        BENCHMARK.principal(argumentos)
+        sys.exit()
+
     print("===== COMPARACIÓN DE MÉTODOS PARA TSP (EMPRESA DE ENVÍOS) =====\n")
     print("Ciudades:", nombres_ciudades)
     print()
 
     # ---------- Método 1: Fuerza Bruta ----------
-    inicio = time.time()
+    inicio = time.perf_counter()
     ruta1_idx, ruta1_nombres, costo1, rutas_eval_1 = tsp_fuerza_bruta(
         distancias, nombres_ciudades, ciudad_inicio
     )
-    fin = time.time()
+    fin = time.perf_counter()
     tiempo1 = fin - inicio
 
     print("=== Método 1: Fuerza Bruta (permutaciones) ===")
@@ -264,11 +662,11 @@ if __name__ == "__main__":
     print(f"Tiempo aproximado de ejecución: {tiempo1:.6f} segundos\n")
 
     # ---------- Método 2: Recursivo sin memo ----------
-    inicio = time.time()
+    inicio = time.perf_counter()
     ruta2_idx, ruta2_nombres, costo2, llamadas2 = tsp_recursivo_sin_memo(
         distancias, nombres_ciudades, ciudad_inicio
     )
-    fin = time.time()
+    fin = time.perf_counter()
     tiempo2 = fin - inicio
 
     print("=== Método 2: Recursivo SIN memoización (backtracking) ===")
@@ -278,11 +676,11 @@ if __name__ == "__main__":
     print(f"Tiempo aproximado de ejecución: {tiempo2:.6f} segundos\n")
 
     # ---------- Método 3: Recursivo con memo ----------
-    inicio = time.time()
+    inicio = time.perf_counter()
     ruta3_idx, ruta3_nombres, costo3, llamadas3, estados_memo = tsp_top_down_memo(
         distancias, nombres_ciudades, ciudad_inicio
     )
-    fin = time.time()
+    fin = time.perf_counter()
     tiempo3 = fin - inicio
 
     print("=== Método 3: Recursivo CON memoización (DP Top-Down) ===")
@@ -292,6 +690,51 @@ if __name__ == "__main__":
     print("Número de estados distintos en memo:", estados_memo)
     print(f"Tiempo aproximado de ejecución: {tiempo3:.6f} segundos\n")
 
+    # ---------- Método 4: Held-Karp bottom-up ----------
+    inicio = time.perf_counter()
+    ruta4_idx, ruta4_nombres, costo4, transiciones4, estados4 = tsp_held_karp(
+        distancias, nombres_ciudades, ciudad_inicio
+    )
+    fin = time.perf_counter()
+    tiempo4 = fin - inicio
+
+    print("=== Método 4: Held-Karp Bottom-Up (tabla por capas) ===")
+    print("Mejor ruta:", " -> ".join(ruta4_nombres))
+    print("Costo total:", costo4, "km")
+    print("Número de transiciones evaluadas:", transiciones4)
+    print("Número de estados en la tabla:", estados4)
+    print(f"Tiempo aproximado de ejecución: {tiempo4:.6f} segundos\n")
+
+    # ---------- Método 5: Ramificación y poda ----------
+    inicio = time.perf_counter()
+    ruta5_idx, ruta5_nombres, costo5, expandidos5, podados5 = tsp_ramificacion_y_poda(
+        distancias, nombres_ciudades, ciudad_inicio
+    )
+    fin = time.perf_counter()
+    tiempo5 = fin - inicio
+
+    print("=== Método 5: Ramificación y Poda (branch and bound) ===")
+    print("Mejor ruta:", " -> ".join(ruta5_nombres))
+    print("Costo total:", costo5, "km")
+    print("Número de nodos expandidos:", expandidos5)
+    print("Número de nodos podados:", podados5)
+    print(f"Tiempo aproximado de ejecución: {tiempo5:.6f} segundos\n")
+
+    # ---------- Método 6: DP con poda ----------
+    inicio = time.perf_counter()
+    ruta6_idx, ruta6_nombres, costo6, estados6, podas6 = tsp_top_down_memo_podado(
+        distancias, nombres_ciudades, ciudad_inicio
+    )
+    fin = time.perf_counter()
+    tiempo6 = fin - inicio
+
+    print("=== Método 6: DP con poda (cota heurística + simetría) ===")
+    print("Mejor ruta:", " -> ".join(ruta6_nombres))
+    print("Costo total:", costo6, "km")
+    print("Número de estados materializados:", estados6, "(memo completa:", str(estados_memo) + ")")
+    print("Número de transiciones podadas:", podas6)
+    print(f"Tiempo aproximado de ejecución: {tiempo6:.6f} segundos\n")
+
     # ---------- Resumen comparativo ----------
     print("===== RESUMEN COMPARATIVO =====")
     print(f"{'Método':40s} {'Costo':>10s} {'Tiempo (s)':>12s} {'Medida de esfuerzo':>22s}")
@@ -299,3 +742,49 @@ if __name__ == "__main__":
     print(f"{'Fuerza Bruta (permutaciones)':40s} {str(costo1):>10s} {tiempo1:12.6f} {('Rutas: ' + str(rutas_eval_1)):>22s}")
     print(f"{'Recursivo sin memo (backtracking)':40s} {str(costo2):>10s} {tiempo2:12.6f} {('Llamadas: ' + str(llamadas2)):>22s}")
     print(f"{'Recursivo con memo (DP Top-Down)':40s} {str(costo3):>10s} {tiempo3:12.6f} {('Estados memo: ' + str(estados_memo)):>22s}")
+    print(f"{'Held-Karp bottom-up (por capas)':40s} {str(costo4):>10s} {tiempo4:12.6f} {('Estados tabla: ' + str(estados4)):>22s}")
+    print(f"{'Ramificación y poda':40s} {str(costo5):>10s} {tiempo5:12.6f} {('Nodos: ' + str(expandidos5) + '/' + str(podados5)):>22s}")
+    print(f"{'DP con poda (cota + simetría)':40s} {str(costo6):>10s} {tiempo6:12.6f} {('Estados: ' + str(estados6)):>22s}")
+
+    # ---------- Benchmarks opcionales (--rutas, --vectorizado, --poda, --ventanas, --vrp, --progresivo, --coordenadas, --entera, --heuristicas, --escalamiento) ----------
+    # La suite completa (varios generadores, repeticiones, memoria, JSON/CSV)
+    # está en BENCHMARK.py: python comparacion.py --suite [opciones de BENCHMARK.py]
+    if "--rutas" in sys.argv[1:]:
+        print()
+        benchmark_rutas_por_segundo()
+
+    if "--vectorizado" in sys.argv[1:]:
+        print()
+        benchmark_vectorizado()
+
+    if "--poda" in sys.argv[1:]:
+        print()
+        benchmark_dp_podada()
+
+    if "--ventanas" in sys.argv[1:]:
+        print()
+        benchmark_ventanas()
+
+    if "--vrp" in sys.argv[1:]:
+        print()
+        benchmark_vrp()
+
+    if "--progresivo" in sys.argv[1:]:
+        print()
+        benchmark_progresivo()
+
+    if "--coordenadas" in sys.argv[1:]:
+        print()
+        benchmark_coordenadas()
+
+    if "--entera" in sys.argv[1:]:
+        print()
+        benchmark_programacion_entera()
+
+    if "--heuristicas" in sys.argv[1:]:
+        print()
+        benchmark_heuristicas()
+
+    if "--escalamiento" in sys.argv[1:]:
+        print()
+        benchmark_escalamiento()